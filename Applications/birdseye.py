@@ -6,13 +6,32 @@ from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QPlainTextEdit, QAction, QMenuBar, QMessageBox,
     QSplitter, QTreeView, QFileSystemModel, QHBoxLayout, QInputDialog, QColorDialog,
     QDialog, QFormLayout, QPushButton, QDialogButtonBox, QLineEdit, QLabel, QCheckBox,
-    QTextEdit  
+    QTextEdit, QDockWidget, QComboBox, QTreeWidget, QTreeWidgetItem
 )
 from PyQt5.QtGui import (
     QFont, QSyntaxHighlighter, QTextCharFormat, QColor, QTextCursor, QPainter, QPalette, QIcon, QTextDocument
 )
-from PyQt5.QtCore import Qt, QTimer, QRegExp, QFileSystemWatcher, QSize
-import sys, os, subprocess, re, json, time
+from PyQt5.QtCore import Qt, QTimer, QRegExp, QFileSystemWatcher, QSize, QObject, QProcess, QThread, pyqtSignal
+import sys, os, re, json, time, hashlib, codecs, mmap, queue, shutil, threading, uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+BIRDSEYE_DIR = os.path.join(os.path.expanduser("~"), ".birdseye")
+BUILD_CACHE_DIR = os.path.join(BIRDSEYE_DIR, "build")
+# Java builds are only cached when the directory holds at most this many sources
+BUILD_CACHE_MAX_SOURCES = 500
+
+# Files above this size open read-only and are paged in from an mmap
+LARGE_FILE_THRESHOLD = 8 * 1024 * 1024
+LARGE_FILE_CHUNK = 2 * 1024 * 1024
+# Autosave journal location and how many edits a journal may hold before it is compacted
+JOURNAL_DIR = os.path.join(BIRDSEYE_DIR, "journal")
+JOURNAL_COMPACT_EDITS = 2000
+# Folder search skips these directories and anything that looks binary
+SEARCH_SKIP_DIRS = {'.git', '.hg', '.svn', '__pycache__', 'node_modules', '.venv', 'venv'}
+# Search and Replace lists at most this many matches per file; the rest follow the file's checkbox
+SEARCH_PREVIEW_LIMIT = 1000
+# Syntax highlighting is switched off once a document grows past this many characters
+HIGHLIGHT_CHAR_LIMIT = 2 * 1024 * 1024
 
 class CodeHighlighter(QSyntaxHighlighter):
     def __init__(self, document):
@@ -171,7 +190,45 @@ class LineNumberArea(QWidget):
             bottom = top + int(self.editor.blockBoundingRect(block).height())
             block_number += 1
 
+class ChunkedFileReader:
+    """Memory-mapped reader that hands out newline-aligned chunks of a file."""
+
+    def __init__(self, path, chunk_size=LARGE_FILE_CHUNK):
+        self.path = path
+        self.chunk_size = chunk_size
+        self._file = open(path, 'rb')
+        self.size = os.fstat(self._file.fileno()).st_size
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self.size else None
+        self.offset = 0
+        self._decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+
+    def at_end(self):
+        return self.offset >= self.size
+
+    def progress(self):
+        return self.offset / self.size if self.size else 1.0
+
+    def read_next(self):
+        if self.at_end():
+            return ''
+        end = min(self.offset + self.chunk_size, self.size)
+        if end < self.size:
+            newline = self._map.rfind(b'\n', self.offset, end)
+            if newline >= self.offset:
+                end = newline + 1
+        data = self._map[self.offset:end]
+        self.offset = end
+        return self._decoder.decode(data, final=self.at_end())
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
 class CodeEditor(QPlainTextEdit):
+    stats_changed = pyqtSignal()
+
     def __init__(self):
         super().__init__()
         self.line_number_area = LineNumberArea(self)
@@ -186,6 +243,44 @@ class CodeEditor(QPlainTextEdit):
         self._default_font_size = 13
         # Create a highlighter per editor document
         self.highlighter = CodeHighlighter(self.document())
+        # Line/word counts are kept up to date from edit deltas; lines are
+        # just the block count, words are tracked per block.
+        self._block_words = [0]
+        self.word_count = 0
+        self.document().contentsChange.connect(self._on_contents_change)
+
+    def highlighting_enabled(self):
+        return self.highlighter.document() is not None
+
+    def disable_highlighting(self):
+        if self.highlighting_enabled():
+            self.highlighter.setDocument(None)
+
+    def line_count(self):
+        return self.blockCount()
+
+    def _on_contents_change(self, position, chars_removed, chars_added):
+        doc = self.document()
+        first = doc.findBlock(position)
+        last = doc.findBlock(position + chars_added)
+        if not last.isValid():
+            last = doc.lastBlock()
+        first_no = first.blockNumber()
+        last_no = last.blockNumber()
+        # blocks [first_no, old_last_no] of the old document became
+        # [first_no, last_no] of the new one; everything else only shifted
+        old_last_no = last_no - (doc.blockCount() - len(self._block_words))
+        counts = []
+        block = first
+        for _ in range(last_no - first_no + 1):
+            counts.append(len(block.text().split()))
+            block = block.next()
+        old = self._block_words[first_no:old_last_no + 1]
+        self.word_count += sum(counts) - sum(old)
+        self._block_words[first_no:old_last_no + 1] = counts
+        if doc.characterCount() > HIGHLIGHT_CHAR_LIMIT:
+            self.disable_highlighting()
+        self.stats_changed.emit()
 
     def line_number_area_width(self):
         digits = len(str(self.blockCount()))
@@ -268,8 +363,63 @@ class EditorTab(QWidget):
         self.layout.addWidget(self.text_edit)
         self.setLayout(self.layout)
         self.file_path = None
+        self.large_file = None
+        self.loading = False
+        # autosave journal bookkeeping
+        self.journal_id = uuid.uuid4().hex
+        self.journal_started = False
+        self.journal_edits = 0
+        self.journal_revision = 0
+        self.search_revision = 0
         self.file_watcher = QFileSystemWatcher()
         self.file_watcher.fileChanged.connect(self.on_file_changed)
+        self.text_edit.verticalScrollBar().valueChanged.connect(self._maybe_load_more)
+
+    def load_file(self, path):
+        self.loading = True
+        try:
+            if os.path.getsize(path) > LARGE_FILE_THRESHOLD:
+                self.open_large_file(path)
+            else:
+                self.close_large_file()
+                with open(path, 'r', encoding='utf-8') as f:
+                    text = f.read()
+                # decide before setPlainText, which would otherwise highlight the whole file first
+                if len(text) > HIGHLIGHT_CHAR_LIMIT:
+                    self.text_edit.disable_highlighting()
+                self.text_edit.setPlainText(text)
+        finally:
+            self.loading = False
+        self.journal_revision = self.text_edit.document().revision()
+
+    def open_large_file(self, path):
+        # Large files are paged in from an mmap as the user scrolls and stay
+        # read-only, since saving a partially loaded buffer would truncate them.
+        self.close_large_file()
+        self.large_file = ChunkedFileReader(path)
+        self.text_edit.disable_highlighting()
+        self.text_edit.setReadOnly(True)
+        self.text_edit.setPlainText(self.large_file.read_next())
+
+    def close_large_file(self):
+        if self.large_file:
+            self.large_file.close()
+            self.large_file = None
+            self.text_edit.setReadOnly(False)
+
+    def _maybe_load_more(self, value):
+        if not self.large_file or self.large_file.at_end():
+            return
+        bar = self.text_edit.verticalScrollBar()
+        if value >= bar.maximum() - bar.pageStep():
+            cursor = QTextCursor(self.text_edit.document())
+            cursor.movePosition(QTextCursor.End)
+            self.loading = True
+            try:
+                cursor.insertText(self.large_file.read_next())
+            finally:
+                self.loading = False
+            self.text_edit.document().setModified(False)
 
     def set_file_path(self, path):
         if self.file_path:
@@ -290,8 +440,7 @@ class EditorTab(QWidget):
             QMessageBox.Yes | QMessageBox.No)
         if reply == QMessageBox.Yes:
             try:
-                with open(path, 'r', encoding='utf-8') as f:
-                    self.text_edit.setPlainText(f.read())
+                self.load_file(path)
             except Exception as e:
                 QMessageBox.warning(self, "Error", f"Could not reload file:\n{e}")
 
@@ -322,22 +471,204 @@ class ThemeEditorDialog(QDialog):
     def get_theme(self):
         return self.colors
 
+def compile_search(pattern, regex=False, case_sensitive=False):
+    flags = re.MULTILINE
+    if not case_sensitive:
+        flags |= re.IGNORECASE
+    if not regex:
+        pattern = re.escape(pattern)
+    return re.compile(pattern, flags)
+
+
+def search_text(rx, text, template=None):
+    """Return [(start, end, line number, line text, replacement)] for every match.
+
+    Replacements are expanded per match so capture groups (\\1, \\g<name>)
+    work exactly like re.sub.
+    """
+    matches = []
+    line_no = 1
+    last = 0
+    for m in rx.finditer(text):
+        start = m.start()
+        line_no += text.count('\n', last, start)
+        last = start
+        line_start = text.rfind('\n', 0, start) + 1
+        line_end = text.find('\n', start)
+        if line_end == -1:
+            line_end = len(text)
+        replacement = m.expand(template) if template is not None else None
+        matches.append((start, m.end(), line_no, text[line_start:line_end][:200], replacement))
+    return matches
+
+
+def apply_matches(text, matches):
+    """Splice the replacements of the given matches into text in one pass."""
+    parts = []
+    last = 0
+    for start, end, _, _, replacement in sorted(matches):
+        parts.append(text[last:start])
+        parts.append(replacement)
+        last = end
+    parts.append(text[last:])
+    return ''.join(parts)
+
+
+def utf16_offsets(text, positions):
+    """Map Python string offsets (sorted) to Qt's UTF-16 document offsets."""
+    if text.isascii():
+        return list(positions)
+    result = []
+    extra = 0
+    last = 0
+    for pos in positions:
+        extra += sum(1 for ch in text[last:pos] if ord(ch) > 0xFFFF)
+        last = pos
+        result.append(pos + extra)
+    return result
+
+
+def replace_in_file(path, mtime, matches):
+    """Write the matches' replacements into a file on disk; returns why it was skipped, or None."""
+    tmp_path = path + ".birdseye-tmp"
+    try:
+        if os.stat(path).st_mtime_ns != mtime:
+            return "changed since the search"
+        with open(path, 'rb') as f:
+            data = f.read()
+        try:
+            text = data.decode('utf-8')
+        except UnicodeDecodeError:
+            return "not UTF-8"
+        with open(tmp_path, 'wb') as f:
+            f.write(apply_matches(text, matches).encode('utf-8'))
+        shutil.copymode(path, tmp_path)  # keep +x on scripts
+        os.replace(tmp_path, path)
+    except OSError as e:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        return str(e)
+    return None
+
+
+class SearchWorker(QThread):
+    """Searches document snapshots and folder files off the UI thread.
+
+    Documents are scanned first, then folder files are read and searched in
+    parallel; matches are streamed back per source as soon as they are found.
+    """
+    matches_found = pyqtSignal(object, object, list)
+    file_skipped = pyqtSignal(str, str)
+    failed = pyqtSignal(str)
+
+    def __init__(self, rx, template, documents, folder=None, skip_paths=(), parent=None):
+        super().__init__(parent)
+        self.rx = rx
+        self.template = template
+        self.documents = documents
+        self.folder = folder
+        self.skip_paths = set(skip_paths)
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    def run(self):
+        try:
+            for editor_tab, text in self.documents:
+                if self._cancelled:
+                    return
+                matches = search_text(self.rx, text, self.template)
+                if matches:
+                    self.matches_found.emit("tab", editor_tab, matches)
+            if self.folder:
+                self._search_folder()
+        except (re.error, IndexError) as e:
+            self.failed.emit(str(e))
+
+    def _folder_files(self):
+        for dirpath, dirnames, filenames in os.walk(self.folder):
+            dirnames[:] = [d for d in dirnames if d not in SEARCH_SKIP_DIRS]
+            for name in filenames:
+                path = os.path.normpath(os.path.join(dirpath, name))
+                if path not in self.skip_paths:
+                    yield path
+
+    def _search_file(self, path):
+        if self._cancelled:
+            return path, None, [], None
+        try:
+            stat = os.stat(path)
+            if stat.st_size > LARGE_FILE_THRESHOLD:
+                return path, None, [], None
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return path, None, [], None
+        if b'\0' in data[:8192]:
+            return path, None, [], None
+        try:
+            # strict: a lossy decode would write U+FFFD over every non-UTF-8 byte on replace
+            text = data.decode('utf-8')
+        except UnicodeDecodeError:
+            return path, None, [], "not UTF-8"
+        return path, stat.st_mtime_ns, search_text(self.rx, text, self.template), None
+
+    def _search_folder(self):
+        with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 4)) as pool:
+            futures = [pool.submit(self._search_file, path) for path in self._folder_files()]
+            for future in as_completed(futures):
+                if self._cancelled:
+                    for pending in futures:
+                        pending.cancel()
+                    return
+                path, mtime, matches, reason = future.result()
+                if reason:
+                    self.file_skipped.emit(path, reason)
+                elif matches:
+                    self.matches_found.emit("file", (path, mtime), matches)
+
+
 class SearchReplaceDialog(QDialog):
+    SCOPES = ["Current document", "Open tabs", "Open tabs and folder"]
+
     def __init__(self, parent, editor):
         super().__init__(parent)
         self.setWindowTitle("Search and Replace")
+        self.resize(720, 520)
+        self.main_window = parent
         self.editor = editor
+        self.worker = None
+        self.results = []
+        self.skipped_files = []  # (path, reason) the folder search could not read
+        self.result_query = None
+        self.apply_when_done = False
         layout = QFormLayout(self)
         self.search_input = QLineEdit()
         self.replace_input = QLineEdit()
         self.case_checkbox = QCheckBox("Case sensitive")
+        self.regex_checkbox = QCheckBox("Regular expression (\\1 or \\g<name> for groups)")
+        self.scope_combo = QComboBox()
+        self.scope_combo.addItems(self.SCOPES)
         layout.addRow("Find:", self.search_input)
         layout.addRow("Replace with:", self.replace_input)
         layout.addRow(self.case_checkbox)
+        layout.addRow(self.regex_checkbox)
+        layout.addRow("Scope:", self.scope_combo)
+        self.preview = QTreeWidget()
+        self.preview.setHeaderLabels(["Match", "Preview"])
+        self.preview.itemDoubleClicked.connect(self.jump_to_result)
+        layout.addRow(self.preview)
+        self.status_label = QLabel("")
+        layout.addRow(self.status_label)
         btns = QDialogButtonBox(QDialogButtonBox.Find | QDialogButtonBox.Replace | QDialogButtonBox.ReplaceAll | QDialogButtonBox.Close)
         btns.button(QDialogButtonBox.Find).clicked.connect(self.find_next)
         btns.button(QDialogButtonBox.Replace).clicked.connect(self.replace_one)
         btns.button(QDialogButtonBox.ReplaceAll).clicked.connect(self.replace_all)
+        find_all = btns.addButton("Find All", QDialogButtonBox.ActionRole)
+        find_all.clicked.connect(lambda: self.find_all())
         btns.rejected.connect(self.reject)
         layout.addRow(btns)
 
@@ -346,32 +677,861 @@ class SearchReplaceDialog(QDialog):
         flags = QTextDocument.FindFlags()
         if self.case_checkbox.isChecked():
             flags |= QTextDocument.FindCaseSensitively
-        found = self.editor.find(text, flags)
+        if self.regex_checkbox.isChecked():
+            sensitivity = Qt.CaseSensitive if self.case_checkbox.isChecked() else Qt.CaseInsensitive
+            found = self.editor.find(QRegExp(text, sensitivity), flags)
+        else:
+            found = self.editor.find(text, flags)
         if not found:
             QMessageBox.information(self, "Search", "No more matches found.")
 
     def replace_one(self):
         cursor = self.editor.textCursor()
         if cursor.hasSelection():
-            cursor.insertText(self.replace_input.text())
+            replacement = self.replace_input.text()
+            if self.regex_checkbox.isChecked():
+                try:
+                    rx = compile_search(self.search_input.text(), True, self.case_checkbox.isChecked())
+                    match = rx.fullmatch(cursor.selectedText())
+                    if match:
+                        replacement = match.expand(replacement)
+                except (re.error, IndexError) as e:
+                    QMessageBox.warning(self, "Replace", f"Invalid pattern:\n{e}")
+                    return
+            cursor.insertText(replacement)
             self.find_next()
         else:
             self.find_next()
 
-    def replace_all(self):
+    def current_query(self):
+        return (self.search_input.text(), self.replace_input.text(), self.regex_checkbox.isChecked(),
+                self.case_checkbox.isChecked(), self.scope_combo.currentIndex())
+
+    def find_all(self):
+        """Start a search into the preview; returns False if nothing was started."""
+        # a plain Find All never writes anything; replace_all re-arms this after we return
+        self.apply_when_done = False
         search = self.search_input.text()
-        replace = self.replace_input.text()
         if not search:
+            return False
+        try:
+            rx = compile_search(search, self.regex_checkbox.isChecked(), self.case_checkbox.isChecked())
+            # check the replacement template against the pattern's groups up front
+            template = self.replace_input.text()
+            if self.regex_checkbox.isChecked():
+                rx.sub(template, '')
+            else:
+                template = template.replace('\\', '\\\\')
+        except (re.error, IndexError) as e:
+            QMessageBox.warning(self, "Search", f"Invalid pattern:\n{e}")
+            return False
+        self.cancel_search()
+        self.preview.clear()
+        self.results = []
+        self.skipped_files = []
+        self.result_query = self.current_query()
+        scope = self.scope_combo.currentIndex()
+        tabs = self.main_window.tabs
+        if scope == 0:
+            editor_tabs = [tabs.currentWidget()]
+        else:
+            editor_tabs = [tabs.widget(i) for i in range(tabs.count())]
+        # large files are read-only and paged, so they are never part of a replace
+        editor_tabs = [t for t in editor_tabs if t is not None and not t.large_file]
+        documents = [(t, t.text_edit.toPlainText()) for t in editor_tabs]
+        for editor_tab, text in documents:
+            editor_tab.search_revision = editor_tab.text_edit.document().revision()
+        folder = self.main_window.project_root if scope == 2 else None
+        skip = [os.path.normpath(t.file_path) for t in editor_tabs if t.file_path]
+        worker = SearchWorker(rx, template, documents, folder, skip, self)
+        # signals still queued from a cancelled worker must not land in this search
+        worker.matches_found.connect(lambda *args: worker is self.worker and self.add_results(*args))
+        worker.file_skipped.connect(lambda *args: worker is self.worker and self.skipped_files.append(args))
+        worker.failed.connect(lambda msg: worker is self.worker and self.search_failed(msg))
+        worker.finished.connect(lambda: worker is self.worker and self.search_finished())
+        self.worker = worker
+        self.status_label.setText("Searching...")
+        worker.start()
+        return True
+
+    def add_results(self, kind, source, matches):
+        if kind == "tab":
+            label = source.file_path or self.main_window.tabs.tabText(self.main_window.tabs.indexOf(source))
+        else:
+            label = source[0]
+        unlisted = len(matches) - SEARCH_PREVIEW_LIMIT
+        count = f"{len(matches)}, first {SEARCH_PREVIEW_LIMIT} listed" if unlisted > 0 else f"{len(matches)}"
+        parent_item = QTreeWidgetItem(self.preview, [f"{label} ({count})", ""])
+        parent_item.setFlags(parent_item.flags() | Qt.ItemIsUserCheckable | Qt.ItemIsAutoTristate)
+        parent_item.setCheckState(0, Qt.Checked)
+        if unlisted > 0:
+            parent_item.setToolTip(0, f"The {unlisted} unlisted match(es) are replaced unless the whole file is unchecked.")
+        for i, match in enumerate(matches[:SEARCH_PREVIEW_LIMIT]):
+            start, end, line_no, line_text, replacement = match
+            item = QTreeWidgetItem(parent_item, [f"{line_no}: {line_text.strip()}", replacement])
+            item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
+            item.setCheckState(0, Qt.Checked)
+            item.setData(0, Qt.UserRole, i)
+        self.results.append((kind, source, matches, parent_item))
+        self.status_label.setText(f"{sum(len(r[2]) for r in self.results)} match(es) in {len(self.results)} source(s)...")
+
+    def search_failed(self, message):
+        self.apply_when_done = False  # never apply a search that stopped half way
+        QMessageBox.warning(self, "Search", message)
+
+    def search_finished(self):
+        total = sum(len(r[2]) for r in self.results)
+        status = f"{total} match(es) in {len(self.results)} source(s)"
+        if self.skipped_files:
+            status += f"; {len(self.skipped_files)} file(s) skipped"
+        self.status_label.setText(status)
+        self.status_label.setToolTip("\n".join(f"{path} ({reason})" for path, reason in self.skipped_files))
+        if self.apply_when_done:
+            self.apply_when_done = False
+            self.apply_results()
+
+    def cancel_search(self):
+        if self.worker is not None:
+            self.worker.cancel()
+            self.worker.wait()
+            self.worker = None
+
+    def replace_all(self):
+        if not self.search_input.text():
             return
-        text = self.editor.toPlainText()
-        if self.case_checkbox.isChecked():
-            count = text.count(search)
-            new_text = text.replace(search, replace)
+        if self.result_query == self.current_query() and self.worker is not None and self.worker.isFinished():
+            self.apply_results()
+        else:
+            # search first, then replace everything still checked in the preview
+            self.apply_when_done = self.find_all()
+
+    def selected_matches(self, matches, parent_item):
+        state = parent_item.checkState(0)
+        if state == Qt.Checked:
+            return list(matches)
+        if state == Qt.Unchecked:
+            return []
+        selected = []
+        for j in range(parent_item.childCount()):
+            child = parent_item.child(j)
+            if child.checkState(0) == Qt.Checked:
+                selected.append(matches[child.data(0, Qt.UserRole)])
+        # matches past the preview have no checkbox of their own; a partly checked file keeps them
+        return selected + list(matches[SEARCH_PREVIEW_LIMIT:])
+
+    def apply_results(self):
+        replaced = 0
+        skipped = []
+        for kind, source, matches, parent_item in self.results:
+            selected = self.selected_matches(matches, parent_item)
+            if not selected:
+                continue
+            if kind == "tab":
+                if self.main_window.tabs.indexOf(source) < 0 or \
+                        source.text_edit.document().revision() != source.search_revision:
+                    skipped.append(f"{source.file_path or 'Untitled'} (changed since the search)")
+                    continue
+                self.apply_to_document(source.text_edit, selected)
+            else:
+                path, mtime = source
+                reason = replace_in_file(path, mtime, selected)
+                if reason:
+                    skipped.append(f"{path} ({reason})")
+                    continue
+            replaced += len(selected)
+        self.results = []
+        self.result_query = None
+        self.preview.clear()
+        message = f"Replaced {replaced} occurrence(s)."
+        if skipped:
+            message += "\n\nSkipped (run Find All again for changed files):\n" + "\n".join(skipped)
+        QMessageBox.information(self, "Replace All", message)
+
+    def apply_to_document(self, editor, matches):
+        # one edit block per document keeps undo history and the cursor intact
+        text = editor.toPlainText()
+        matches = sorted(matches)
+        positions = utf16_offsets(text, [p for m in matches for p in (m[0], m[1])])
+        cursor = QTextCursor(editor.document())
+        cursor.beginEditBlock()
+        for i in range(len(matches) - 1, -1, -1):
+            cursor.setPosition(positions[2 * i])
+            cursor.setPosition(positions[2 * i + 1], QTextCursor.KeepAnchor)
+            cursor.insertText(matches[i][4])
+        cursor.endEditBlock()
+
+    def jump_to_result(self, item, column):
+        parent_item = item.parent()
+        if parent_item is None:
+            return
+        for kind, source, matches, result_item in self.results:
+            if result_item is not parent_item:
+                continue
+            start, end, line_no = matches[item.data(0, Qt.UserRole)][:3]
+            if kind == "tab":
+                self.main_window.tabs.setCurrentWidget(source)
+                editor = source.text_edit
+                offsets = utf16_offsets(editor.toPlainText(), [start, end])
+                cursor = editor.textCursor()
+                cursor.setPosition(offsets[0])
+                cursor.setPosition(offsets[1], QTextCursor.KeepAnchor)
+            else:
+                self.main_window.open_path(source[0])
+                editor = self.main_window.tabs.currentWidget().text_edit
+                cursor = QTextCursor(editor.document().findBlockByNumber(line_no - 1))
+            editor.setTextCursor(cursor)
+            editor.centerCursor()
+            return
+
+    def done(self, result):
+        self.cancel_search()
+        super().done(result)
+
+def file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def parse_depfile(text):
+    """Prerequisites listed in a make-style dependency file (as written by g++ -MMD)."""
+    text = text.replace('\\\r\n', ' ').replace('\\\n', ' ')
+    rule = re.search(r':(\s|$)', text)  # not the colon of a Windows drive letter
+    if rule is None:
+        return []
+    return [dep.replace('\\ ', ' ') for dep in re.findall(r'(?:\\ |\S)+', text[rule.end():])]
+
+
+def java_sources(root, limit=BUILD_CACHE_MAX_SOURCES):
+    """Every .java file javac may pull in from root, or None if there are too many to hash."""
+    sources = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d not in SEARCH_SKIP_DIRS]
+        sources += [os.path.join(dirpath, name) for name in filenames if name.endswith('.java')]
+        if len(sources) > limit:
+            return None
+    return sources
+
+
+class BuildCache:
+    """Content-addressed store for compiled C++/Java artifacts.
+
+    Entries are keyed by a hash of the compile command and the contents of
+    every source passed to key_for. Headers found by the compiler are
+    recorded at build time (mark_built with a depfile) and checked again by
+    is_built, so editing an included file forces a rebuild.
+    """
+
+    def __init__(self, root=BUILD_CACHE_DIR):
+        self.root = root
+
+    def key_for(self, source_path, toolchain, inputs=()):
+        digest = hashlib.sha256()
+        digest.update(" ".join(toolchain).encode("utf-8"))
+        base = os.path.dirname(source_path)
+        for path in [source_path] + sorted(set(inputs) - {source_path}):
+            digest.update(b"\0" + os.path.relpath(path, base).encode("utf-8") + b"\0")
+            digest.update(file_digest(path).encode("ascii"))
+        return digest.hexdigest()
+
+    def artifact_dir(self, key):
+        path = os.path.join(self.root, key[:2], key)
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def is_built(self, key):
+        entry = os.path.join(self.root, key[:2], key)
+        if not os.path.exists(os.path.join(entry, ".built")):
+            return False
+        try:
+            with open(os.path.join(entry, ".deps"), 'r', encoding='utf-8') as f:
+                deps = json.load(f)
+        except (OSError, ValueError):
+            return True  # nothing but the keyed sources went in
+        try:
+            return all(file_digest(path) == digest for path, digest in deps.items())
+        except OSError:
+            return False
+
+    def mark_built(self, key, depfile=None, cwd=None):
+        """Mark a build complete; depfile paths are relative to cwd, where the compiler ran."""
+        entry = self.artifact_dir(key)
+        if depfile:
+            try:
+                with open(depfile, 'r', encoding='utf-8', errors='surrogateescape') as f:
+                    paths = [os.path.join(cwd or "", path) for path in parse_depfile(f.read())]
+                deps = {os.path.abspath(path): file_digest(path) for path in paths}
+                with open(os.path.join(entry, ".deps"), 'w', encoding='utf-8') as f:
+                    json.dump(deps, f)
+            except OSError:
+                return  # without the header list the build can't be trusted later
+        with open(os.path.join(entry, ".built"), 'w') as f:
+            f.write(str(time.time()))
+
+
+class RunPipeline(QObject):
+    """Runs build/run phases one after another through QProcess.
+
+    Each phase is a (name, command, cwd, on_success) tuple. Output is streamed
+    as it arrives instead of being collected after the process exits, so the
+    event loop never blocks on a running program.
+    """
+    output = pyqtSignal(str)
+    phase_finished = pyqtSignal(str, int, float)
+    finished = pyqtSignal(bool)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.process = None
+        self.phases = []
+        self.timings = []
+        self.cancelled = False
+        self._phase = None
+        self._phase_start = 0.0
+        self._decoder = None
+
+    def is_running(self):
+        return self.process is not None
+
+    def start(self, phases):
+        if self.is_running():
+            return False
+        self.phases = list(phases)
+        self.timings = []
+        self.cancelled = False
+        self._next_phase()
+        return True
+
+    def cancel(self):
+        if self.process is not None:
+            self.cancelled = True
+            self.phases = []
+            self.process.kill()
+
+    def _next_phase(self):
+        if not self.phases:
+            self.finished.emit(not self.cancelled)
+            return
+        self._phase = self.phases.pop(0)
+        name, cmd, cwd, _ = self._phase
+        self.output.emit(f"[{name}] $ {' '.join(cmd)}\n")
+        self._decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        self.process = QProcess(self)
+        self.process.setProcessChannelMode(QProcess.MergedChannels)
+        if cwd:
+            self.process.setWorkingDirectory(cwd)
+        self.process.readyReadStandardOutput.connect(self._read_output)
+        self.process.finished.connect(self._on_finished)
+        self.process.errorOccurred.connect(self._on_error)
+        self._phase_start = time.perf_counter()
+        self.process.start(cmd[0], cmd[1:])
+
+    def _read_output(self):
+        data = bytes(self.process.readAllStandardOutput())
+        text = self._decoder.decode(data)
+        if text:
+            self.output.emit(text)
+
+    def _on_error(self, error):
+        if error == QProcess.FailedToStart:
+            name, cmd, _, _ = self._phase
+            self.output.emit(f"[{name}] could not start {cmd[0]}\n")
+            self._finish_phase(-1)
+
+    def _on_finished(self, exit_code, exit_status):
+        self._read_output()
+        tail = self._decoder.decode(b'', final=True)
+        if tail:
+            self.output.emit(tail)
+        if exit_status != QProcess.NormalExit and not self.cancelled:
+            exit_code = exit_code or -1
+        self._finish_phase(exit_code)
+
+    def _finish_phase(self, exit_code):
+        if self.process is None:
+            return
+        process, self.process = self.process, None
+        process.deleteLater()
+        name, _, _, on_success = self._phase
+        elapsed = time.perf_counter() - self._phase_start
+        self.timings.append((name, elapsed))
+        self.phase_finished.emit(name, exit_code, elapsed)
+        if self.cancelled:
+            self.output.emit(f"[{name}] cancelled after {elapsed:.2f}s\n")
+            self.finished.emit(False)
+            return
+        if exit_code != 0:
+            self.output.emit(f"[{name}] exited with code {exit_code} after {elapsed:.2f}s\n")
+            self.phases = []
+            self.finished.emit(False)
+            return
+        if on_success:
+            on_success()
+        self._next_phase()
+
+
+class RunConsole(QDockWidget):
+    def __init__(self, parent):
+        super().__init__("Run", parent)
+        self.setObjectName("RunConsole")
+        container = QWidget()
+        layout = QVBoxLayout(container)
+        layout.setContentsMargins(4, 4, 4, 4)
+        self.output = QPlainTextEdit()
+        self.output.setReadOnly(True)
+        self.output.setFont(QFont("JetBrains Mono", 11))
+        # keep long-running programs from growing the console without bound
+        self.output.setMaximumBlockCount(20000)
+        layout.addWidget(self.output)
+        buttons = QHBoxLayout()
+        self.status_label = QLabel("Idle")
+        self.stop_button = QPushButton("Stop")
+        self.stop_button.setEnabled(False)
+        clear_button = QPushButton("Clear")
+        clear_button.clicked.connect(self.output.clear)
+        buttons.addWidget(self.status_label, 1)
+        buttons.addWidget(self.stop_button)
+        buttons.addWidget(clear_button)
+        layout.addLayout(buttons)
+        self.setWidget(container)
+
+    def append(self, text):
+        cursor = self.output.textCursor()
+        cursor.movePosition(QTextCursor.End)
+        cursor.insertText(text)
+        self.output.setTextCursor(cursor)
+        self.output.ensureCursorVisible()
+
+    def set_running(self, running, status=""):
+        self.stop_button.setEnabled(running)
+        self.status_label.setText(status or ("Running..." if running else "Idle"))
+
+GIT_STATE_COLORS = {
+    "modified": "#e2c08d",
+    "added": "#73c991",
+    "renamed": "#73c991",
+    "deleted": "#c74e39",
+    "conflict": "#e4676b",
+    "untracked": "#73c991",
+}
+
+
+def parse_porcelain_v2(data, root):
+    """Parse `git status --porcelain=v2 -z` output into {abs path: state}."""
+    status = {}
+    fields = data.decode('utf-8', errors='replace').split('\0')
+    i = 0
+    while i < len(fields):
+        record = fields[i]
+        i += 1
+        if not record:
+            continue
+        kind = record[0]
+        if kind == '1':
+            parts = record.split(' ', 8)
+            xy, rel = parts[1], parts[8]
+        elif kind == '2':
+            parts = record.split(' ', 9)
+            xy, rel = parts[1], parts[9]
+            i += 1  # the original path of a rename follows as its own field
+        elif kind == 'u':
+            parts = record.split(' ', 10)
+            xy, rel = parts[1], parts[10]
+        elif kind == '?':
+            xy, rel = '??', record[2:]
+        else:
+            continue
+        if kind == '?':
+            state = "untracked"
+        elif kind == 'u':
+            state = "conflict"
+        elif 'D' in xy:
+            state = "deleted"
+        elif 'R' in xy:
+            state = "renamed"
+        elif 'A' in xy:
+            state = "added"
         else:
-            count = len(re.findall(re.escape(search), text, re.IGNORECASE))
-            new_text = re.sub(re.escape(search), replace, text, flags=re.IGNORECASE)
-        self.editor.setPlainText(new_text)
-        QMessageBox.information(self, "Replace All", f"Replaced {count} occurrence(s).")
+            state = "modified"
+        status[os.path.normpath(os.path.join(root, rel))] = state
+    return status
+
+
+class GitStatusService(QObject):
+    """Background `git status` runner with a per-repository cache.
+
+    Refresh requests are debounced and run through QProcess, so the UI thread
+    only ever reads the cached result. A cache entry stays valid while the
+    mtimes of .git/index and .git/HEAD are unchanged and nothing invalidated it.
+    """
+    status_changed = pyqtSignal(str)
+
+    def __init__(self, parent=None, debounce_ms=400):
+        super().__init__(parent)
+        self.repos = {}
+        self._roots = {}
+        self._pending = []
+        self._process = None
+        self._process_root = None
+        self._process_key = None
+        self._output = b''
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(debounce_ms)
+        self._timer.timeout.connect(self._run_next)
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.fileChanged.connect(self._on_git_file_changed)
+
+    def repo_root_for(self, path):
+        directory = path if os.path.isdir(path) else os.path.dirname(path)
+        directory = os.path.normpath(os.path.abspath(directory))
+        if directory in self._roots:
+            return self._roots[directory]
+        root = None
+        probe = directory
+        while True:
+            if os.path.exists(os.path.join(probe, '.git')):
+                root = probe
+                break
+            parent = os.path.dirname(probe)
+            if parent == probe:
+                break
+            probe = parent
+        self._roots[directory] = root
+        return root
+
+    def state_for(self, path):
+        if not path:
+            return None
+        root = self.repo_root_for(path)
+        entry = self.repos.get(root)
+        if not entry:
+            return None
+        path = os.path.normpath(os.path.abspath(path))
+        state = entry["status"].get(path)
+        if state is None and path in entry["dirs"]:
+            state = "modified"
+        return state
+
+    def cached_status(self, root):
+        entry = self.repos.get(root)
+        return entry["status"] if entry else None
+
+    def request_refresh(self, path, force=False):
+        root = self.repo_root_for(path) if path else None
+        if not root:
+            return None
+        if force and root in self.repos:
+            self.repos[root]["key"] = None
+        if root not in self._pending:
+            self._pending.append(root)
+        self._timer.start()
+        return root
+
+    def _git_dir(self, root):
+        git_dir = os.path.join(root, '.git')
+        if os.path.isfile(git_dir):
+            # worktrees and submodules point at their real git dir
+            try:
+                with open(git_dir, 'r', encoding='utf-8') as f:
+                    line = f.read().strip()
+                if line.startswith('gitdir:'):
+                    git_dir = os.path.normpath(os.path.join(root, line[7:].strip()))
+            except OSError:
+                pass
+        return git_dir
+
+    def _cache_key(self, root):
+        git_dir = self._git_dir(root)
+        key = []
+        for name in ('index', 'HEAD'):
+            try:
+                key.append(os.stat(os.path.join(git_dir, name)).st_mtime_ns)
+            except OSError:
+                key.append(None)
+        return tuple(key)
+
+    def _watch(self, root):
+        git_dir = self._git_dir(root)
+        for name in ('index', 'HEAD'):
+            path = os.path.join(git_dir, name)
+            if os.path.exists(path) and path not in self.watcher.files():
+                self.watcher.addPath(path)
+
+    def _on_git_file_changed(self, path):
+        git_dir = os.path.dirname(path)
+        for root in list(self.repos):
+            if self._git_dir(root) == git_dir:
+                self.request_refresh(root)
+        # git replaces index/HEAD atomically, which drops the watch
+        if os.path.exists(path) and path not in self.watcher.files():
+            self.watcher.addPath(path)
+
+    def _run_next(self):
+        if self._process is not None:
+            return
+        while self._pending:
+            root = self._pending.pop(0)
+            key = self._cache_key(root)
+            entry = self.repos.get(root)
+            if entry and entry["key"] == key:
+                continue
+            self._process_root = root
+            self._process_key = key
+            self._output = b''
+            self._process = QProcess(self)
+            self._process.setWorkingDirectory(root)
+            self._process.readyReadStandardOutput.connect(self._read_output)
+            self._process.finished.connect(self._on_finished)
+            self._process.errorOccurred.connect(self._on_error)
+            self._process.start("git", ["status", "--porcelain=v2", "-z", "--untracked-files=all"])
+            return
+
+    def _read_output(self):
+        self._output += bytes(self._process.readAllStandardOutput())
+
+    def _on_error(self, error):
+        if error == QProcess.FailedToStart:
+            self._finish(None)
+
+    def _on_finished(self, exit_code, exit_status):
+        self._read_output()
+        ok = exit_status == QProcess.NormalExit and exit_code == 0
+        self._finish(self._output if ok else None)
+
+    def _finish(self, output):
+        if self._process is None:
+            return
+        process, self._process = self._process, None
+        process.deleteLater()
+        root = self._process_root
+        if output is not None:
+            status = parse_porcelain_v2(output, root)
+            dirs = set()
+            for path in status:
+                parent = os.path.dirname(path)
+                while len(parent) > len(root):
+                    if parent in dirs:
+                        break
+                    dirs.add(parent)
+                    parent = os.path.dirname(parent)
+            self.repos[root] = {"key": self._process_key, "status": status, "dirs": dirs}
+            self._watch(root)
+            self.status_changed.emit(root)
+        if self._pending:
+            self._run_next()
+
+
+class GitFileSystemModel(QFileSystemModel):
+    """File model that colours entries by their cached git state."""
+
+    def __init__(self, git_service, parent=None):
+        super().__init__(parent)
+        self.git_service = git_service
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role == Qt.ForegroundRole and index.column() == 0:
+            state = self.git_service.state_for(self.filePath(index))
+            if state:
+                return QColor(GIT_STATE_COLORS[state])
+        return super().data(index, role)
+
+
+def replay_journal(journal_path):
+    """Rebuild a document from its journal; returns (path, text) or None.
+
+    Edit positions are Qt character offsets (UTF-16 code units), so the
+    replay works on UTF-16 data rather than Python code points. An edit
+    may carry half of a surrogate pair; it is kept as is so the pair joins
+    up again with the other half.
+    """
+    path = None
+    data = None
+    with open(journal_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                break  # torn write at the tail from a crash
+            if record["t"] == "snap":
+                path = record.get("path")
+                data = bytearray(record["text"].encode('utf-16-le', errors='surrogatepass'))
+            elif record["t"] == "edit" and data is not None:
+                start = record["p"] * 2
+                data[start:start + record["r"] * 2] = record["a"].encode('utf-16-le', errors='surrogatepass')
+    if data is None:
+        return None
+    return path, data.decode('utf-16-le', errors='replace')
+
+
+def lock_file(path):
+    """Take an exclusive, non-blocking lock on path; returns the open handle, or None if it is held."""
+    handle = open(path, 'a+')
+    try:
+        if os.name == 'nt':
+            import msvcrt
+            handle.seek(0)
+            msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        handle.close()
+        return None
+    return handle
+
+
+class AutosaveJournal:
+    """Append-only autosave journal, one file per document.
+
+    The UI thread only queues records; a writer thread appends them and
+    fsyncs at most once per flush interval. A snapshot record rewrites the
+    journal atomically, which is also how journals are compacted.
+
+    Each instance writes into its own session directory and holds a lock
+    file there while it runs. The OS drops the lock when the process dies,
+    so recover() can tell a crashed session from another live window.
+    """
+
+    def __init__(self, directory=JOURNAL_DIR, flush_interval=1.0):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.session_dir = os.path.join(directory, f"{os.getpid()}-{uuid.uuid4().hex[:8]}")
+        os.makedirs(self.session_dir, exist_ok=True)
+        self._lock = lock_file(os.path.join(self.session_dir, "owner.lock"))
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._writer, daemon=True)
+        self._thread.start()
+
+    def journal_path(self, doc_id):
+        return os.path.join(self.session_dir, doc_id + ".journal")
+
+    def snapshot(self, doc_id, path, text):
+        self._queue.put(("snap", doc_id, {"t": "snap", "path": path, "text": text}))
+
+    def record_edit(self, doc_id, position, removed, text):
+        self._queue.put(("edit", doc_id, {"t": "edit", "p": position, "r": removed, "a": text}))
+
+    def discard(self, doc_id):
+        self._queue.put(("discard", doc_id, None))
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join(timeout=5)
+        self._release(self.session_dir, self._lock)
+        self._lock = None
+
+    def recover(self):
+        """Return [(doc_id, path, text)] for journals left by sessions that are no longer running.
+
+        Their journals move into this session, so discard() and snapshot()
+        work on them like on any other document.
+        """
+        self.adopt(self.directory)  # journals from before sessions had their own directory
+        for name in sorted(os.listdir(self.directory)):
+            session_dir = os.path.join(self.directory, name)
+            if session_dir == self.session_dir or not os.path.isdir(session_dir):
+                continue
+            lock = lock_file(os.path.join(session_dir, "owner.lock"))
+            if lock is None:
+                continue  # another Birdseye window is still writing here
+            self.adopt(session_dir)
+            self._release(session_dir, lock)
+        documents = []
+        for name in sorted(os.listdir(self.session_dir)):
+            if not name.endswith(".journal"):
+                continue
+            try:
+                result = replay_journal(os.path.join(self.session_dir, name))
+            except (OSError, KeyError, TypeError, ValueError):
+                result = None  # unreadable journal; UnicodeError is a ValueError
+            if result is not None:
+                documents.append((name[:-len(".journal")], result[0], result[1]))
+        return documents
+
+    def adopt(self, directory):
+        for name in os.listdir(directory):
+            if name.endswith(".journal"):
+                try:
+                    os.replace(os.path.join(directory, name), os.path.join(self.session_dir, name))
+                except OSError:
+                    pass
+
+    @staticmethod
+    def _release(session_dir, lock):
+        """Unlock a session and remove its directory once it holds no journals."""
+        if lock is not None:
+            lock.close()
+        try:
+            os.remove(os.path.join(session_dir, "owner.lock"))
+            os.rmdir(session_dir)
+        except OSError:
+            pass  # journals left for the next session to recover, or another window took the lock
+
+    def _writer(self):
+        handles = {}
+        dirty = set()
+        last_sync = time.monotonic()
+        running = True
+        while running:
+            timeout = None
+            if dirty:
+                timeout = max(0.0, self.flush_interval - (time.monotonic() - last_sync))
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = ()
+            if item is None:
+                running = False
+            elif item:
+                kind, doc_id, record = item
+                try:
+                    self._apply(handles, dirty, kind, doc_id, record)
+                except OSError:
+                    pass
+            if dirty and (not running or time.monotonic() - last_sync >= self.flush_interval):
+                for doc_id in list(dirty):
+                    handle = handles.get(doc_id)
+                    if handle:
+                        try:
+                            handle.flush()
+                            os.fsync(handle.fileno())
+                        except OSError:
+                            pass
+                dirty.clear()
+                last_sync = time.monotonic()
+        for handle in handles.values():
+            handle.close()
+
+    def _apply(self, handles, dirty, kind, doc_id, record):
+        path = self.journal_path(doc_id)
+        if kind == "discard":
+            handle = handles.pop(doc_id, None)
+            if handle:
+                handle.close()
+            dirty.discard(doc_id)
+            if os.path.exists(path):
+                os.remove(path)
+        elif kind == "snap":
+            handle = handles.pop(doc_id, None)
+            if handle:
+                handle.close()
+            tmp_path = path + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(json.dumps(record) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+            handles[doc_id] = open(path, 'a', encoding='utf-8')
+        else:
+            handle = handles.get(doc_id)
+            if handle is None:
+                return  # edits are only meaningful on top of a snapshot
+            handle.write(json.dumps(record) + "\n")
+            dirty.add(doc_id)
+
 
 class Birdseye(QMainWindow):
     def __init__(self):
@@ -380,8 +1540,14 @@ class Birdseye(QMainWindow):
         self.setGeometry(100, 100, 1280, 800)
         self.setWindowIcon(QIcon()) 
 
+        # Git status is gathered in the background and only read from cache here
+        self.git_service = GitStatusService(self)
+        self.git_service.status_changed.connect(self.on_git_status_changed)
+        self._git_status_wanted = None
+        self.project_root = None
+
         # File tree
-        self.file_model = QFileSystemModel()
+        self.file_model = GitFileSystemModel(self.git_service)
         self.file_model.setRootPath('')
         self.file_tree = QTreeView()
         self.file_tree.setModel(self.file_model)
@@ -395,6 +1561,7 @@ class Birdseye(QMainWindow):
         self.tabs.setMovable(True)
         self.tabs.setTabsClosable(True)
         self.tabs.tabCloseRequested.connect(self.close_tab)
+        self.tabs.currentChanged.connect(lambda _: self.update_status_bar())
         self.tabs.setStyleSheet("QTabBar::tab { font-size: 14px; padding: 6px 20px; margin: 3px; }")
 
         # Splitter layout
@@ -414,6 +1581,19 @@ class Birdseye(QMainWindow):
         self.recent_files = []
         self.recent_limit = 10
 
+        # Run console and build pipeline
+        self.build_cache = BuildCache()
+        self.run_pipeline = RunPipeline(self)
+        self.run_console = RunConsole(self)
+        self.run_console.hide()
+        self.addDockWidget(Qt.BottomDockWidgetArea, self.run_console)
+        self.run_pipeline.output.connect(self.run_console.append)
+        self.run_pipeline.finished.connect(self.on_run_finished)
+        self.run_console.stop_button.clicked.connect(self.stop_run)
+
+        # Unsaved edits are journaled off the UI thread; the timer only compacts
+        self.journal = AutosaveJournal()
+
         self.init_menu()
         self.autosave_timer = QTimer()
         self.autosave_timer.timeout.connect(self.autosave_all)
@@ -433,6 +1613,7 @@ class Birdseye(QMainWindow):
 
         # create initial tab
         self.new_tab()
+        QTimer.singleShot(0, self.recover_journals)
 
     def init_menu(self):
         menu = self.menuBar()
@@ -467,9 +1648,15 @@ class Birdseye(QMainWindow):
         run_action.triggered.connect(self.run_current_file)
         file_menu.addAction(run_action)
 
+        stop_action = QAction("Stop Run", self)
+        stop_action.setShortcut("Shift+F5")
+        stop_action.triggered.connect(self.stop_run)
+        file_menu.addAction(stop_action)
+
         split_action = QAction("Toggle File Tree", self)
         split_action.triggered.connect(self.toggle_file_tree)
         view_menu.addAction(split_action)
+        view_menu.addAction(self.run_console.toggleViewAction())
 
         open_folder_action = QAction("Open Folder", self)
         open_folder_action.triggered.connect(self.open_folder)
@@ -663,6 +1850,9 @@ class Birdseye(QMainWindow):
         editor.highlighter.highlighting_rules.append((QRegExp(r'"[^"\\]*(\\.[^"\\]*)*"'), string_format))
         editor.highlighter.highlighting_rules.append((QRegExp(r"'[^'\\]*(\\.[^'\\]*)*'"), string_format))
 
+        if not editor.highlighting_enabled():
+            self.statusBar().showMessage(f"Language set to {lang} (highlighting off for large files)", 3000)
+            return
         editor.highlighter.rehighlight()
         self.statusBar().showMessage(f"Language set to {lang}", 3000)
 
@@ -674,10 +1864,11 @@ class Birdseye(QMainWindow):
 
     def new_tab(self, path=None):
         editor_tab = EditorTab()
+        editor_tab.file_watcher.fileChanged.connect(lambda p: self.git_service.request_refresh(p, force=True))
+        editor_tab.text_edit.stats_changed.connect(lambda t=editor_tab: self.on_stats_changed(t))
         if path:
             try:
-                with open(path, 'r', encoding='utf-8') as f:
-                    editor_tab.text_edit.setPlainText(f.read())
+                editor_tab.load_file(path)
                 editor_tab.set_file_path(path)
                 tab_label = f"📝 {os.path.basename(path)}"
             except Exception as e:
@@ -687,7 +1878,11 @@ class Birdseye(QMainWindow):
             tab_label = "📝 Untitled"
         self.tabs.addTab(editor_tab, tab_label)
         self.tabs.setCurrentWidget(editor_tab)
+        editor_tab.text_edit.document().contentsChange.connect(
+            lambda pos, removed, added, t=editor_tab: self.on_document_edit(t, pos, removed, added))
         if path:
+            self.git_service.request_refresh(path)
+            self.update_tab_decorations()
             if path not in self.recent_files:
                 self.recent_files.insert(0, path)
                 self.recent_files = self.recent_files[:self.recent_limit]
@@ -706,9 +1901,7 @@ class Birdseye(QMainWindow):
             self.new_tab(fname)
 
     def open_path(self, path):
-        # kept for compatibility with file tree open
-        self.open_file()  # this function now handled by open_file dialog; preserve but try to open path directly
-        # fallback: try to open directly like open_file would
+        # used by the recent files menu
         for i in range(self.tabs.count()):
             editor = self.tabs.widget(i)
             if editor.file_path == path:
@@ -731,12 +1924,17 @@ class Birdseye(QMainWindow):
         editor_tab = self.tabs.currentWidget()
         if not editor_tab:
             return
+        if editor_tab.large_file:
+            self.statusBar().showMessage("Large files are opened read-only", 3000)
+            return
         if editor_tab.file_path:
             try:
                 with open(editor_tab.file_path, 'w', encoding='utf-8') as f:
                     f.write(editor_tab.text_edit.toPlainText())
                 self.statusBar().showMessage(f"Saved {editor_tab.file_path}", 3000)
                 editor_tab.text_edit.document().setModified(False)
+                self.discard_journal(editor_tab)
+                self.git_service.request_refresh(editor_tab.file_path, force=True)
             except Exception as e:
                 QMessageBox.warning(self, "Error", f"Could not save file:\n{e}")
         else:
@@ -746,6 +1944,9 @@ class Birdseye(QMainWindow):
         editor_tab = self.tabs.currentWidget()
         if not editor_tab:
             return
+        if editor_tab.large_file:
+            self.statusBar().showMessage("Large files are opened read-only", 3000)
+            return
         fname, _ = QFileDialog.getSaveFileName(self, 'Save As', '', 'All Files (*)')
         if fname:
             try:
@@ -754,6 +1955,10 @@ class Birdseye(QMainWindow):
                 editor_tab.set_file_path(fname)
                 self.tabs.setTabText(self.tabs.currentIndex(), f"📝 {os.path.basename(fname)}")
                 self.statusBar().showMessage(f"Saved {fname}", 3000)
+                editor_tab.text_edit.document().setModified(False)
+                self.discard_journal(editor_tab)
+                self.git_service.request_refresh(fname, force=True)
+                self.update_tab_decorations()
                 # update recent files
                 if fname not in self.recent_files:
                     self.recent_files.insert(0, fname)
@@ -768,19 +1973,77 @@ class Birdseye(QMainWindow):
             self.file_model.setRootPath(dir_path)
             self.file_tree.setRootIndex(self.file_model.index(dir_path))
             self.file_tree.show()
+            self.git_service.request_refresh(dir_path)
+            self.project_root = dir_path
+
+    def on_document_edit(self, editor_tab, position, removed, added):
+        if editor_tab.loading or editor_tab.large_file:
+            return
+        doc = editor_tab.text_edit.document()
+        if removed == added and doc.revision() == editor_tab.journal_revision:
+            return  # highlighter re-layout, not an edit
+        editor_tab.journal_revision = doc.revision()
+        if not editor_tab.journal_started:
+            # first edit since the last save: start from a full snapshot
+            self.journal.snapshot(editor_tab.journal_id, editor_tab.file_path, editor_tab.text_edit.toPlainText())
+            editor_tab.journal_started = True
+            editor_tab.journal_edits = 0
+            return
+        cursor = QTextCursor(doc)
+        cursor.setPosition(position)
+        cursor.setPosition(position + added, QTextCursor.KeepAnchor)
+        text = cursor.selectedText().replace('\u2029', '\n')
+        self.journal.record_edit(editor_tab.journal_id, position, removed, text)
+        editor_tab.journal_edits += 1
+
+    def discard_journal(self, editor_tab):
+        if editor_tab.journal_started:
+            self.journal.discard(editor_tab.journal_id)
+            editor_tab.journal_started = False
+            editor_tab.journal_edits = 0
 
     def autosave_all(self):
-        # only autosave modified files to .autosave next to original
+        # edits are journaled as they happen; here we only compact long journals
         for i in range(self.tabs.count()):
             editor_tab = self.tabs.widget(i)
-            if editor_tab.file_path:
-                try:
-                    if editor_tab.text_edit.document().isModified():
-                        autosave_path = editor_tab.file_path + '.autosave'
-                        with open(autosave_path, 'w', encoding='utf-8') as f:
-                            f.write(editor_tab.text_edit.toPlainText())
-                except Exception:
-                    pass
+            if editor_tab.journal_started and editor_tab.journal_edits >= JOURNAL_COMPACT_EDITS:
+                self.journal.snapshot(editor_tab.journal_id, editor_tab.file_path, editor_tab.text_edit.toPlainText())
+                editor_tab.journal_edits = 0
+
+    def recover_journals(self):
+        documents = self.journal.recover()
+        if not documents:
+            return
+        reply = QMessageBox.question(self, "Restore unsaved work?",
+            f"Birdseye found {len(documents)} unsaved document(s) from a previous session. Restore them?",
+            QMessageBox.Yes | QMessageBox.No)
+        for doc_id, path, text in documents:
+            if reply != QMessageBox.Yes:
+                self.journal.discard(doc_id)
+                continue
+            editor_tab = self.new_tab(path if path and os.path.exists(path) else None)
+            if editor_tab.large_file:
+                self.journal.discard(doc_id)
+                continue
+            editor_tab.loading = True
+            try:
+                editor_tab.text_edit.setPlainText(text)
+            finally:
+                editor_tab.loading = False
+            editor_tab.text_edit.document().setModified(True)
+            editor_tab.journal_revision = editor_tab.text_edit.document().revision()
+            # keep journaling into the recovered file, compacted to one snapshot
+            editor_tab.journal_id = doc_id
+            editor_tab.journal_started = True
+            self.journal.snapshot(doc_id, path, text)
+            if path and not editor_tab.file_path:
+                editor_tab.set_file_path(path)
+        if reply == QMessageBox.Yes:
+            self.statusBar().showMessage(f"Restored {len(documents)} document(s)", 3000)
+
+    def closeEvent(self, event):
+        self.journal.close()
+        super().closeEvent(event)
 
     def close_tab(self, index):
         editor_tab = self.tabs.widget(index)
@@ -798,38 +2061,74 @@ class Birdseye(QMainWindow):
                 editor_tab.file_watcher.removePath(editor_tab.file_path)
         except Exception:
             pass
+        editor_tab.close_large_file()
+        self.discard_journal(editor_tab)
         self.tabs.removeTab(index)
 
+    def on_git_status_changed(self, root):
+        self.file_tree.viewport().update()
+        self.update_tab_decorations()
+        if self._git_status_wanted == root:
+            self._git_status_wanted = None
+            self.show_git_status()
+
+    def update_tab_decorations(self):
+        bar = self.tabs.tabBar()
+        for i in range(self.tabs.count()):
+            editor_tab = self.tabs.widget(i)
+            state = self.git_service.state_for(editor_tab.file_path)
+            if state:
+                bar.setTabTextColor(i, QColor(GIT_STATE_COLORS[state]))
+                self.tabs.setTabToolTip(i, f"{editor_tab.file_path} ({state})")
+            else:
+                bar.setTabTextColor(i, QColor())
+                self.tabs.setTabToolTip(i, editor_tab.file_path or "")
+
     def show_git_status(self):
-        # simple git status check
         editor_tab = self.tabs.currentWidget()
         if not editor_tab or not editor_tab.file_path:
             QMessageBox.information(self, "Git Status", "Open a file inside a git repo to check status.")
             return
-        repo_dir = os.path.dirname(editor_tab.file_path)
-        try:
-            output = subprocess.check_output(['git', '-C', repo_dir, 'status'], stderr=subprocess.STDOUT, universal_newlines=True)
-            dlg = QMessageBox(self)
-            dlg.setWindowTitle("Git Status")
-            dlg.setText(output)
-            dlg.exec_()
-        except Exception as e:
-            QMessageBox.warning(self, "Git Error", f"Git status failed:\n{e}")
+        root = self.git_service.repo_root_for(editor_tab.file_path)
+        if not root:
+            QMessageBox.information(self, "Git Status", "This file is not inside a git repository.")
+            return
+        status = self.git_service.cached_status(root)
+        if status is None:
+            # nothing cached yet; the dialog opens once the background run lands
+            self._git_status_wanted = root
+            self.git_service.request_refresh(root)
+            self.statusBar().showMessage("Reading git status...", 3000)
+            return
+        self.git_service.request_refresh(root)
+        if status:
+            lines = [f"{state:<10} {os.path.relpath(path, root)}" for path, state in sorted(status.items())]
+            text = "\n".join(lines)
+        else:
+            text = "Working tree clean."
+        dlg = QMessageBox(self)
+        dlg.setWindowTitle("Git Status")
+        dlg.setText(f"{root}\n\n{text}")
+        dlg.exec_()
 
     def git_commit(self):
         editor_tab = self.tabs.currentWidget()
         if not editor_tab or not editor_tab.file_path:
             QMessageBox.information(self, "Git Commit", "Open a file inside a git repo to commit.")
             return
+        if self.run_pipeline.is_running():
+            self.statusBar().showMessage("Wait for the current run to finish before committing", 3000)
+            return
         repo_dir = os.path.dirname(editor_tab.file_path)
         text, ok = QInputDialog.getText(self, "Git Commit", "Enter commit message:")
         if ok and text:
-            try:
-                subprocess.check_call(['git', '-C', repo_dir, 'add', '.'])
-                subprocess.check_call(['git', '-C', repo_dir, 'commit', '-m', text])
-                QMessageBox.information(self, "Git Commit", "Commit successful.")
-            except Exception as e:
-                QMessageBox.warning(self, "Git Error", f"Git commit failed:\n{e}")
+            refresh = lambda: self.git_service.request_refresh(repo_dir, force=True)
+            self.run_console.show()
+            self.run_console.set_running(True, "Committing...")
+            self.run_pipeline.start([
+                ("git add", ["git", "-C", repo_dir, "add", "."], repo_dir, None),
+                ("git commit", ["git", "-C", repo_dir, "commit", "-m", text], repo_dir, refresh),
+            ])
 
     def set_theme(self, theme_name):
         palette = QPalette()
@@ -936,7 +2235,7 @@ class Birdseye(QMainWindow):
                     background: #505357;
                 }
             """)
-        QApplication.instance().setPalette(palette)
+        self.setPalette(palette)
         self.statusBar().showMessage(f"Theme set to {theme_name}", 3000)
 
     def open_theme_editor(self):
@@ -1002,14 +2301,14 @@ class Birdseye(QMainWindow):
             }}
         """
         self.setStyleSheet(stylesheet)
-        pal = QApplication.instance().palette()
+        pal = self.palette()
         try:
             pal.setColor(QPalette.Window, QColor(bg))
             pal.setColor(QPalette.Base, QColor(bg))
             pal.setColor(QPalette.Text, QColor(text))
             pal.setColor(QPalette.Highlight, QColor(highlight))
             pal.setColor(QPalette.HighlightedText, QColor("#000000"))
-            QApplication.instance().setPalette(pal)
+            self.setPalette(pal)
         except Exception:
             pass
         self.statusBar().showMessage("Applied custom theme", 3000)
@@ -1019,6 +2318,9 @@ class Birdseye(QMainWindow):
         if not editor_tab or not editor_tab.file_path:
             QMessageBox.information(self, "Run", "Save the file before running.")
             return
+        if self.run_pipeline.is_running():
+            self.statusBar().showMessage("A program is already running (Shift+F5 to stop)", 3000)
+            return
         # ensure file saved
         if editor_tab.text_edit.document().isModified():
             # prompt or auto-save
@@ -1026,47 +2328,69 @@ class Birdseye(QMainWindow):
                 with open(editor_tab.file_path, 'w', encoding='utf-8') as f:
                     f.write(editor_tab.text_edit.toPlainText())
                 editor_tab.text_edit.document().setModified(False)
+                self.discard_journal(editor_tab)
             except Exception as e:
                 QMessageBox.warning(self, "Run", f"Could not save file:\n{e}")
                 return
 
-        ext = os.path.splitext(editor_tab.file_path)[1].lower()
-        cmd = None
+        path = editor_tab.file_path
+        dir_path = os.path.dirname(path)
+        base = os.path.splitext(os.path.basename(path))[0]
+        ext = os.path.splitext(path)[1].lower()
+        phases = []
         if ext == ".py":
-            cmd = ["python", editor_tab.file_path]
+            # -u so output streams into the console as it is printed
+            phases.append(("run", [sys.executable, "-u", path], dir_path, None))
         elif ext == ".js":
-            cmd = ["node", editor_tab.file_path]
+            phases.append(("run", ["node", path], dir_path, None))
         elif ext == ".sh":
-            cmd = ["bash", editor_tab.file_path]
+            phases.append(("run", ["bash", path], dir_path, None))
         elif ext == ".java":
-            # Compile then run
-            dir_path = os.path.dirname(editor_tab.file_path)
-            base = os.path.splitext(os.path.basename(editor_tab.file_path))[0]
-            compile_cmd = ["javac", editor_tab.file_path]
-            run_cmd = ["java", "-cp", dir_path, base]
-            try:
-                subprocess.check_call(compile_cmd)
-                cmd = run_cmd
-            except Exception as e:
-                QMessageBox.warning(self, "Run", f"Java compilation failed:\n{e}")
-                return
+            toolchain = ["javac"]
+            # javac compiles the sibling and package classes it finds from here, so they are inputs too
+            sources = java_sources(dir_path)
+            key = self.build_cache.key_for(path, toolchain, sources or ())
+            out_dir = self.build_cache.artifact_dir(key)
+            if sources is None or not self.build_cache.is_built(key):
+                phases.append(("build", toolchain + ["-d", out_dir, path], dir_path,
+                               lambda: sources is not None and self.build_cache.mark_built(key)))
+            else:
+                self.run_console.append(f"[build] {os.path.basename(path)} unchanged, using cached classes\n")
+            phases.append(("run", ["java", "-cp", out_dir, base], dir_path, None))
         elif ext in [".cpp", ".cxx", ".cc"]:
-            exe_path = os.path.splitext(editor_tab.file_path)[0] + ".exe"
-            compile_cmd = ["g++", editor_tab.file_path, "-o", exe_path]
-            try:
-                subprocess.check_call(compile_cmd)
-                cmd = [exe_path]
-            except Exception as e:
-                QMessageBox.warning(self, "Run", f"C++ compilation failed:\n{e}")
-                return
+            toolchain = ["g++"]
+            key = self.build_cache.key_for(path, toolchain)
+            out_dir = self.build_cache.artifact_dir(key)
+            exe_path = os.path.join(out_dir, base + (".exe" if os.name == "nt" else ""))
+            depfile = os.path.join(out_dir, "deps.d")
+            if not self.build_cache.is_built(key):
+                # -MMD lists the user headers that went in, so editing one invalidates the binary
+                phases.append(("build", toolchain + [path, "-o", exe_path, "-MMD", "-MF", depfile], dir_path,
+                               lambda: self.build_cache.mark_built(key, depfile, dir_path)))
+            else:
+                self.run_console.append(f"[build] {os.path.basename(path)} unchanged, using cached binary\n")
+            phases.append(("run", [exe_path], dir_path, None))
         else:
             QMessageBox.information(self, "Run", "Running is only supported for Python, JavaScript, Shell, Java, and C++ files.")
             return
-        try:
-            output = subprocess.check_output(cmd, stderr=subprocess.STDOUT, universal_newlines=True)
-            QMessageBox.information(self, "Run Output", output)
-        except Exception as e:
-            QMessageBox.warning(self, "Run", f"Run failed:\n{e}")
+
+        self.run_console.show()
+        self.run_console.set_running(True, f"Running {os.path.basename(path)}...")
+        self.run_pipeline.start(phases)
+
+    def stop_run(self):
+        if self.run_pipeline.is_running():
+            self.run_pipeline.cancel()
+
+    def on_run_finished(self, success):
+        timings = ", ".join(f"{name} {elapsed:.2f}s" for name, elapsed in self.run_pipeline.timings)
+        if self.run_pipeline.cancelled:
+            status = "Cancelled"
+        else:
+            status = "Finished" if success else "Failed"
+        self.run_console.append(f"[{status.lower()}] {timings}\n")
+        self.run_console.set_running(False, f"{status} ({timings})" if timings else status)
+        self.statusBar().showMessage(f"Run {status.lower()}", 3000)
 
     def update_recent_menu(self):
         self.recent_menu.clear()
@@ -1075,15 +2399,20 @@ class Birdseye(QMainWindow):
             action.triggered.connect(lambda _, p=path: self.open_path(p))
             self.recent_menu.addAction(action)
 
+    def on_stats_changed(self, editor_tab):
+        if editor_tab is self.tabs.currentWidget():
+            self.update_status_bar()
+
     def update_status_bar(self):
         editor_tab = self.tabs.currentWidget()
         if not editor_tab:
             self.statusBar().clearMessage()
             return
-        text = editor_tab.text_edit.toPlainText()
-        lines = text.count('\n') + 1
-        words = len(text.split())
-        self.statusBar().showMessage(f"Lines: {lines} | Words: {words}")
+        editor = editor_tab.text_edit
+        message = f"Lines: {editor.line_count()} | Words: {editor.word_count}"
+        if editor_tab.large_file:
+            message += f" | Large file, {editor_tab.large_file.progress():.0%} loaded (read-only)"
+        self.statusBar().showMessage(message)
 
     def open_search_replace(self):
         editor_tab = self.tabs.currentWidget()
@@ -3,9 +3,20 @@
 
 import tkinter as tk
 from tkinter import messagebox, ttk, colorchooser, simpledialog
+import math
+import os
+import sys
 import time
 import datetime
 
+# Also runnable as a script from the repo root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Applications.clock_engine import Deadlines, Stopwatch, ZoneClock, format_duration, next_alarm_time, resolve_city
+from core.scheduler import get_scheduler
+
+TICK_SLACK = 0.005  # land just after a boundary, not just before it
+FIXED_ROWS = 2  # Local and UTC head the world clock list
+
 class ClockApp(tk.Toplevel):
     def __init__(self, master=None):
         super().__init__(master)
@@ -14,6 +25,10 @@ class ClockApp(tk.Toplevel):
         self.resizable(False, False)
         self.configure(bg="#181818")
         self.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.scheduler = get_scheduler(self)
+        self.deadlines = Deadlines()
+        self.tick_job = None
+        self.deadline_job = None
 
         # Theme colors
         self.fg_color = "#ffffff"
@@ -31,6 +46,7 @@ class ClockApp(tk.Toplevel):
         # Tabs for Stopwatch, Timer, Alarm, World Clock
         self.tabs = ttk.Notebook(self)
         self.tabs.pack(expand=True, fill="both", padx=10, pady=10)
+        self.tabs.bind("<<NotebookTabChanged>>", lambda event: self.retick())
 
         # Stopwatch Tab
         self.stopwatch_tab = tk.Frame(self.tabs, bg=self.bg_color)
@@ -56,25 +72,73 @@ class ClockApp(tk.Toplevel):
         self.settings_btn = tk.Button(self, text="⚙️ Settings", command=self.open_settings, bg=self.bg_color, fg=self.fg_color, borderwidth=0, font=("Arial", 12))
         self.settings_btn.pack(pady=5, anchor="ne", padx=10)
 
-        self.update_clock()
+        self.tick()
 
     def on_close(self):
+        self.scheduler.cancel(self.tick_job)
+        self.scheduler.cancel(self.deadline_job)
         self.destroy()
 
-    # --- CLOCK & DATE ---
-    def update_clock(self):
-        now = datetime.datetime.now()
-        self.clock_label.config(text=now.strftime("%H:%M:%S"))
-        self.date_label.config(text=now.strftime("%A, %B %d, %Y"))
-        self.after(1000, self.update_clock)
+    # --- TICK ---
+    def tick(self):
+        """Redraw the clock and whichever tab is showing, then sleep until the next visible change."""
+        self.tick_job = None
+        if self.deadlines.resync():
+            self.arm_deadlines()  # the wall clock jumped; alarms moved
+        now = time.time()
+        local = datetime.datetime.fromtimestamp(now)
+        set_text(self.clock_label, local.strftime("%H:%M:%S"))
+        set_text(self.date_label, local.strftime("%A, %B %d, %Y"))
+        delay = 1 - now % 1  # next wall-clock second
+        if self.state() != "iconic":
+            tab = self.tabs.select()
+            if tab == str(self.stopwatch_tab):
+                elapsed = self.stopwatch.elapsed()
+                set_text(self.stopwatch_label, format_duration(elapsed, tenths=True))
+                if self.stopwatch.running:
+                    delay = min(delay, 0.1 - elapsed % 0.1)
+            elif tab == str(self.timer_tab) and self.timer is not None:
+                remaining = self.deadlines.remaining(self.timer)
+                # count down in whole seconds, rounded up like a kitchen timer
+                set_text(self.timer_label, format_duration(math.ceil(remaining)))
+                delay = min(delay, remaining % 1 or 1)
+            elif tab == str(self.world_tab):
+                self.update_world_clock()
+        self.tick_job = self.scheduler.call_later(delay + TICK_SLACK, self.tick, name="clock tick")
+
+    def retick(self):
+        self.scheduler.cancel(self.tick_job)
+        self.tick()
+
+    # --- ALARMS & TIMERS ---
+    def arm_deadlines(self):
+        """Sleep until the earliest alarm or timer."""
+        self.scheduler.cancel(self.deadline_job)
+        self.deadline_job = None
+        deadline = self.deadlines.next_deadline()
+        if deadline is not None:
+            self.deadline_job = self.scheduler.call_later(max(0.0, deadline - time.monotonic()),
+                                                          self.fire_deadlines, name="clock deadline")
+
+    def fire_deadlines(self):
+        self.deadline_job = None
+        for entry in self.deadlines.pop_due():
+            if entry is self.timer:
+                self.timer = None
+                self.timer_label.config(text="00:00:00")
+                self.after(0, lambda: messagebox.showinfo("Timer", "Time's up!", parent=self))
+            elif entry in self.alarms:
+                idx = self.alarms.index(entry)
+                del self.alarms[idx]
+                self.alarm_list.delete(idx)
+                self.after(0, lambda label=entry.label: messagebox.showinfo("Alarm", f"It's {label}!", parent=self))
+        self.arm_deadlines()
 
     # --- STOPWATCH ---
     def init_stopwatch_tab(self):
-        self.stopwatch_label = tk.Label(self.stopwatch_tab, text="00:00:00", font=("Consolas", 32), fg=self.fg_color, bg=self.bg_color)
+        self.stopwatch_label = tk.Label(self.stopwatch_tab, text="00:00:00.0", font=("Consolas", 32), fg=self.fg_color, bg=self.bg_color)
         self.stopwatch_label.pack(pady=20)
-        self.stopwatch_running = False
-        self.stopwatch_start_time = 0
-        self.stopwatch_elapsed = 0
+        self.stopwatch = Stopwatch()
 
         btn_frame = tk.Frame(self.stopwatch_tab, bg=self.bg_color)
         btn_frame.pack(pady=10)
@@ -89,37 +153,25 @@ class ClockApp(tk.Toplevel):
         self.lap_btn.pack(pady=2)
 
     def toggle_stopwatch(self):
-        if self.stopwatch_running:
-            self.stopwatch_running = False
+        if self.stopwatch.running:
+            self.stopwatch.stop()
             self.stop_btn.config(text="Start")
         else:
-            self.stopwatch_start_time = time.time() - self.stopwatch_elapsed
-            self.stopwatch_running = True
+            self.stopwatch.start()
             self.stop_btn.config(text="Stop")
-            self.update_stopwatch()
-
-    def update_stopwatch(self):
-        if self.stopwatch_running:
-            self.stopwatch_elapsed = time.time() - self.stopwatch_start_time
-            h = int(self.stopwatch_elapsed // 3600)
-            m = int((self.stopwatch_elapsed % 3600) // 60)
-            s = int(self.stopwatch_elapsed % 60)
-            self.stopwatch_label.config(text=f"{h:02}:{m:02}:{s:02}")
-            self.after(100, self.update_stopwatch)
+        self.retick()
 
     def reset_stopwatch(self):
-        self.stopwatch_running = False
-        self.stopwatch_elapsed = 0
+        self.stopwatch.reset()
         self.stop_btn.config(text="Start")
-        self.stopwatch_label.config(text="00:00:00")
+        self.stopwatch_label.config(text="00:00:00.0")
         self.lap_list.delete(0, tk.END)
 
     def add_lap(self):
-        if self.stopwatch_running:
-            h = int(self.stopwatch_elapsed // 3600)
-            m = int((self.stopwatch_elapsed % 3600) // 60)
-            s = int(self.stopwatch_elapsed % 60)
-            self.lap_list.insert(tk.END, f"{h:02}:{m:02}:{s:02}")
+        if self.stopwatch.running:
+            lap, total = self.stopwatch.lap()
+            number = len(self.stopwatch.laps)
+            self.lap_list.insert(tk.END, f"{number:>2}. {format_duration(lap, True)}  {format_duration(total, True)}")
 
     # --- TIMER ---
     def init_timer_tab(self):
@@ -128,8 +180,7 @@ class ClockApp(tk.Toplevel):
         self.timer_entry = tk.Entry(self.timer_tab, width=10, font=("Consolas", 16))
         self.timer_entry.pack(pady=5)
         self.timer_entry.insert(0, "5")  # default 5 minutes
-        self.timer_running = False
-        self.timer_seconds = 0
+        self.timer = None  # the running timer's Deadline
 
         btn_frame = tk.Frame(self.timer_tab, bg=self.bg_color)
         btn_frame.pack(pady=10)
@@ -141,27 +192,20 @@ class ClockApp(tk.Toplevel):
     def set_timer(self):
         try:
             mins = int(self.timer_entry.get())
-            self.timer_seconds = mins * 60
-            self.timer_running = True
-            self.update_timer()
         except ValueError:
             messagebox.showerror("Error", "Please enter a valid number.")
-
-    def update_timer(self):
-        if self.timer_running and self.timer_seconds > 0:
-            h = self.timer_seconds // 3600
-            m = (self.timer_seconds % 3600) // 60
-            s = self.timer_seconds % 60
-            self.timer_label.config(text=f"{h:02}:{m:02}:{s:02}")
-            self.timer_seconds -= 1
-            self.after(1000, self.update_timer)
-        elif self.timer_running and self.timer_seconds == 0:
-            self.timer_label.config(text="00:00:00")
-            self.timer_running = False
-            messagebox.showinfo("Timer", "Time's up!")
+            return
+        if self.timer is not None:
+            self.deadlines.cancel(self.timer)
+        self.timer = self.deadlines.add_timer(mins * 60)
+        self.arm_deadlines()
+        self.retick()
 
     def cancel_timer(self):
-        self.timer_running = False
+        if self.timer is not None:
+            self.deadlines.cancel(self.timer)
+            self.timer = None
+            self.arm_deadlines()
         self.timer_label.config(text="00:00:00")
 
     # --- ALARM ---
@@ -174,8 +218,7 @@ class ClockApp(tk.Toplevel):
         self.add_alarm_btn.grid(row=0, column=0, padx=5)
         self.remove_alarm_btn = tk.Button(btn_frame, text="Remove", command=self.remove_alarm, width=10, bg="#444", fg="white")
         self.remove_alarm_btn.grid(row=0, column=1, padx=5)
-        self.alarms = []
-        self.check_alarms()
+        self.alarms = []  # Deadline per listbox row
 
     def add_alarm(self):
         alarm_time = simpledialog.askstring("Set Alarm", "Enter time (HH:MM):", parent=self)
@@ -183,8 +226,10 @@ class ClockApp(tk.Toplevel):
             try:
                 h, m = map(int, alarm_time.split(":"))
                 if 0 <= h < 24 and 0 <= m < 60:
-                    self.alarms.append(alarm_time)
-                    self.alarm_list.insert(tk.END, alarm_time)
+                    label = f"{h:02}:{m:02}"
+                    self.alarms.append(self.deadlines.add_alarm(next_alarm_time(h, m), label))
+                    self.alarm_list.insert(tk.END, label)
+                    self.arm_deadlines()
                 else:
                     raise ValueError
             except ValueError:
@@ -195,17 +240,8 @@ class ClockApp(tk.Toplevel):
         if sel:
             idx = sel[0]
             self.alarm_list.delete(idx)
-            del self.alarms[idx]
-
-    def check_alarms(self):
-        now = datetime.datetime.now().strftime("%H:%M")
-        if now in self.alarms:
-            self.alarms.remove(now)
-            self.alarm_list.delete(0, tk.END)
-            for alarm in self.alarms:
-                self.alarm_list.insert(tk.END, alarm)
-            messagebox.showinfo("Alarm", "It's time!")
-        self.after(1000 * 30, self.check_alarms)
+            self.deadlines.cancel(self.alarms.pop(idx))
+            self.arm_deadlines()
 
     # --- WORLD CLOCK ---
     def init_world_tab(self):
@@ -217,29 +253,44 @@ class ClockApp(tk.Toplevel):
         self.add_city_btn.grid(row=0, column=0, padx=5)
         self.remove_city_btn = tk.Button(btn_frame, text="Remove", command=self.remove_city, width=10, bg="#444", fg="white")
         self.remove_city_btn.grid(row=0, column=1, padx=5)
-        self.cities = []
-        self.update_world_clock()
+        self.cities = []  # (name, ZoneClock)
+        self.world_rows = []  # text currently shown in each listbox row
 
     def add_city(self):
         city = simpledialog.askstring("Add City", "Enter city (e.g. London, Tokyo):", parent=self)
         if city:
-            self.cities.append(city)
-            self.world_list.insert(tk.END, f"{city}: ...")
+            found = resolve_city(city)
+            if found is None:
+                messagebox.showerror("Error", f"Unknown city or time zone: {city}", parent=self)
+                return
+            name, zone = found
+            self.cities.append((name, ZoneClock(zone)))
+            self.update_world_clock()
 
     def remove_city(self):
         sel = self.world_list.curselection()
-        if sel:
+        if sel and sel[0] >= FIXED_ROWS:
             idx = sel[0]
             self.world_list.delete(idx)
-            del self.cities[idx]
+            del self.world_rows[idx]
+            del self.cities[idx - FIXED_ROWS]
 
     def update_world_clock(self):
-        self.world_list.delete(0, tk.END)
-        self.world_list.insert(tk.END, f"Local: {datetime.datetime.now().strftime('%H:%M:%S')}")
-        self.world_list.insert(tk.END, f"UTC:   {datetime.datetime.utcnow().strftime('%H:%M:%S')}")
-        for city in self.cities:
-            self.world_list.insert(tk.END, f"{city}: ...")
-        self.after(1000, self.update_world_clock)
+        """Rewrite only the rows whose text changed since the last tick."""
+        now = time.time()
+        rows = [f"{'Local':<16}{time.strftime('%H:%M:%S', time.localtime(now))}",
+                f"{'UTC':<16}{time.strftime('%H:%M:%S', time.gmtime(now))}"]
+        rows += [f"{name[:15]:<16}{clock.format(now)} {clock.abbreviation}" for name, clock in self.cities]
+        selected = set(self.world_list.curselection())
+        for idx, text in enumerate(rows):
+            if idx >= len(self.world_rows):
+                self.world_list.insert(tk.END, text)
+            elif self.world_rows[idx] != text:
+                self.world_list.delete(idx)
+                self.world_list.insert(idx, text)
+                if idx in selected:
+                    self.world_list.selection_set(idx)
+        self.world_rows = rows
 
     # --- SETTINGS ---
     def open_settings(self):
@@ -264,6 +315,11 @@ class ClockApp(tk.Toplevel):
         close_btn = tk.Button(dialog, text="Close", command=dialog.destroy, bg="#444", fg="white")
         close_btn.pack(pady=10)
 
+def set_text(label, text):
+    """Configure ``label`` only when its text really changes."""
+    if label.cget("text") != text:
+        label.config(text=text)
+
 if __name__ == "__main__":
     root = tk.Tk()
     root.withdraw()  # Hide root
@@ -0,0 +1,246 @@
+# Copyright 2025 the FranchukOS project authors.
+# Contributed under the Apache License, Version 2.0.
+
+"""Timekeeping for the Clock app.
+
+``Stopwatch`` measures with ``time.perf_counter`` from the moment it was
+started, so the display never drifts however late the UI ticks.
+``Deadlines`` keeps timers and alarms in one min-heap on the monotonic
+clock; the app sleeps until the head of the heap instead of polling.
+Alarms are wall-clock times, so their monotonic deadlines are recomputed
+whenever the wall clock is seen to jump (suspend, manual change, NTP step).
+
+The world clock resolves city names to IANA zones from a local index built
+out of the installed tz database. ``ZoneClock`` caches a zone's UTC offset
+until its next DST transition, so a tick is an addition, not a tz lookup.
+"""
+
+import bisect
+import datetime
+import functools
+import heapq
+import itertools
+import time
+import zoneinfo
+
+WALL_JUMP = 1.0  # seconds of wall/monotonic disagreement treated as a clock change
+TRANSITION_HORIZON = 400 * 86400  # look this far ahead for the next offset change
+TRANSITION_STEP = 7 * 86400  # DST rules never change twice within a week
+
+# Big cities that are not the name of their zone
+CITY_ALIASES = {
+    "abu dhabi": "Asia/Dubai", "atlanta": "America/New_York", "bangalore": "Asia/Kolkata",
+    "barcelona": "Europe/Madrid", "beijing": "Asia/Shanghai", "boston": "America/New_York",
+    "cape town": "Africa/Johannesburg", "dallas": "America/Chicago", "delhi": "Asia/Kolkata",
+    "frankfurt": "Europe/Berlin", "geneva": "Europe/Zurich", "houston": "America/Chicago",
+    "kiev": "Europe/Kyiv", "kyoto": "Asia/Tokyo", "miami": "America/New_York", "milan": "Europe/Rome",
+    "montreal": "America/Toronto", "mumbai": "Asia/Kolkata", "munich": "Europe/Berlin",
+    "new delhi": "Asia/Kolkata", "osaka": "Asia/Tokyo", "ottawa": "America/Toronto",
+    "rio de janeiro": "America/Sao_Paulo", "saint petersburg": "Europe/Moscow",
+    "san francisco": "America/Los_Angeles", "seattle": "America/Los_Angeles",
+    "shenzhen": "Asia/Shanghai", "washington": "America/New_York",
+}
+LEGACY_AREAS = ("Etc/", "US/", "Canada/", "Brazil/", "Chile/", "Mexico/", "SystemV/", "posix/", "right/")
+
+
+def format_duration(seconds, tenths=False):
+    """HH:MM:SS (or HH:MM:SS.t) for a non-negative number of seconds."""
+    if tenths:
+        total = int(seconds * 10)
+        seconds, tenth = divmod(total, 10)
+    else:
+        seconds = int(seconds)
+    h, rest = divmod(seconds, 3600)
+    m, s = divmod(rest, 60)
+    return f"{h:02}:{m:02}:{s:02}.{tenth}" if tenths else f"{h:02}:{m:02}:{s:02}"
+
+
+def next_alarm_time(hour, minute, now=None):
+    """Epoch seconds of the next local HH:MM strictly after ``now`` (a naive local datetime)."""
+    now = now or datetime.datetime.now()
+    when = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if when <= now:
+        when = datetime.datetime.combine(when.date() + datetime.timedelta(days=1), when.time())
+    return when.timestamp()
+
+
+class Stopwatch:
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.started = None  # clock reading when last started; None while stopped
+        self.banked = 0.0  # time accumulated before that
+        self.laps = []
+
+    @property
+    def running(self):
+        return self.started is not None
+
+    def start(self):
+        if self.started is None:
+            self.started = self.clock()
+
+    def stop(self):
+        if self.started is not None:
+            self.banked += self.clock() - self.started
+            self.started = None
+
+    def reset(self):
+        self.started = None
+        self.banked = 0.0
+        self.laps = []
+
+    def elapsed(self):
+        return self.banked + (self.clock() - self.started if self.started is not None else 0.0)
+
+    def lap(self):
+        """Record a lap; returns (lap time, total)."""
+        total = self.elapsed()
+        lap = total - (self.laps[-1][1] if self.laps else 0.0)
+        self.laps.append((lap, total))
+        return lap, total
+
+
+class Deadline:
+    __slots__ = ("kind", "label", "deadline", "wall", "cancelled")
+
+    def __init__(self, kind, label, deadline, wall=None):
+        self.kind = kind  # "timer" or "alarm"
+        self.label = label
+        self.deadline = deadline  # monotonic
+        self.wall = wall  # epoch seconds, alarms only
+        self.cancelled = False
+
+
+class Deadlines:
+    """Timers and alarms ordered by when they are due."""
+
+    def __init__(self, clock=time.monotonic, wall=time.time):
+        self.clock = clock
+        self.wall = wall
+        self.heap = []
+        self.seq = itertools.count()
+        self.offset = wall() - clock()
+
+    def add_timer(self, seconds, label="Timer"):
+        return self.push(Deadline("timer", label, self.clock() + seconds))
+
+    def add_alarm(self, epoch, label="Alarm"):
+        return self.push(Deadline("alarm", label, epoch - self.offset, epoch))
+
+    def push(self, entry):
+        heapq.heappush(self.heap, (entry.deadline, next(self.seq), entry))
+        return entry
+
+    def cancel(self, entry):
+        entry.cancelled = True  # dropped when it reaches the head
+
+    def remaining(self, entry):
+        return max(0.0, entry.deadline - self.clock())
+
+    def resync(self):
+        """Re-aim alarms if the wall clock moved relative to the monotonic one; True if it did."""
+        offset = self.wall() - self.clock()
+        if abs(offset - self.offset) < WALL_JUMP:
+            return False
+        self.offset = offset
+        entries = [entry for _, _, entry in self.heap if not entry.cancelled]
+        for entry in entries:
+            if entry.kind == "alarm":
+                entry.deadline = entry.wall - offset
+        self.heap = [(entry.deadline, next(self.seq), entry) for entry in entries]
+        heapq.heapify(self.heap)
+        return True
+
+    def next_deadline(self):
+        while self.heap and self.heap[0][2].cancelled:
+            heapq.heappop(self.heap)
+        return self.heap[0][0] if self.heap else None
+
+    def pop_due(self):
+        """Remove and return everything that is due, earliest first."""
+        self.resync()
+        now = self.clock()
+        due = []
+        while self.heap and self.heap[0][0] <= now:
+            entry = heapq.heappop(self.heap)[2]
+            if not entry.cancelled:
+                due.append(entry)
+        return due
+
+
+@functools.lru_cache(maxsize=1)
+def city_index():
+    """Lowercased city name -> IANA zone, from the installed tz database plus ``CITY_ALIASES``."""
+    index = {}
+    for name in sorted(zoneinfo.available_timezones()):
+        if "/" not in name or name.startswith(LEGACY_AREAS):
+            continue
+        index.setdefault(name.rsplit("/", 1)[1].replace("_", " ").lower(), name)
+    zones = set(index.values())
+    index.update((city, zone) for city, zone in CITY_ALIASES.items() if zone in zones)
+    return index
+
+
+def resolve_city(name):
+    """(display name, zone) for a city or zone name, or None. A unique prefix is enough."""
+    key = " ".join(name.replace("_", " ").split()).lower()
+    if not key:
+        return None
+    index = city_index()
+    if key in index:
+        return key.title(), index[key]
+    zone = name.strip().replace(" ", "_")
+    if "/" in zone:
+        try:
+            zoneinfo.ZoneInfo(zone)
+            return zone.rsplit("/", 1)[1].replace("_", " "), zone
+        except (zoneinfo.ZoneInfoNotFoundError, ValueError):
+            pass
+    cities = sorted(index)
+    start = bisect.bisect_left(cities, key)
+    matches = {index[city] for city in cities[start:start + 20] if city.startswith(key)}
+    if len(matches) == 1:
+        return cities[start].title(), matches.pop()
+    return None
+
+
+class ZoneClock:
+    """Local time in one zone, with the UTC offset cached until it next changes."""
+
+    def __init__(self, zone):
+        self.zone = zoneinfo.ZoneInfo(zone) if isinstance(zone, str) else zone
+        self.valid_from = self.valid_until = None
+        self.offset = 0
+        self.abbreviation = ""
+
+    def utc_offset(self, epoch):
+        """Offset in seconds at ``epoch``; only recomputed across a transition."""
+        if self.valid_from is None or not self.valid_from <= epoch < self.valid_until:
+            self.offset, self.abbreviation = self.lookup(epoch)
+            self.valid_from = epoch
+            self.valid_until = self.next_transition(epoch)
+        return self.offset
+
+    def lookup(self, epoch):
+        local = datetime.datetime.fromtimestamp(epoch, self.zone)
+        return int(local.utcoffset().total_seconds()), local.tzname() or ""
+
+    def next_transition(self, epoch):
+        """First second after ``epoch`` with a different offset (or the search horizon)."""
+        epoch = int(epoch)
+        current = self.lookup(epoch)
+        low = epoch
+        for high in range(epoch + TRANSITION_STEP, epoch + TRANSITION_HORIZON, TRANSITION_STEP):
+            if self.lookup(high) != current:
+                while high - low > 1:
+                    middle = (low + high) // 2
+                    if self.lookup(middle) == current:
+                        low = middle
+                    else:
+                        high = middle
+                return high
+            low = high
+        return epoch + TRANSITION_HORIZON
+
+    def format(self, epoch, pattern="%H:%M:%S"):
+        return time.strftime(pattern, time.gmtime(int(epoch) + self.utc_offset(epoch)))
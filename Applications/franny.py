@@ -880,7 +880,7 @@ class FrannyBrowser(QMainWindow):
         # Theme shortcuts from v21.1: Ctrl+Shift+1..N to switch themes
         for i, theme_name in enumerate(THEMES.keys(), start=1):
             # bind theme_name as default argument to avoid late-binding trap
-            QShortcut(QKeySequence(f"Ctrl+Shift+{i}"), self, activated=(lambda t=theme_name: apply_theme(QApplication.instance(), t)))
+            QShortcut(QKeySequence(f"Ctrl+Shift+{i}"), self, activated=(lambda t=theme_name: apply_theme(self, t)))
 
     def next_tab(self):
         idx = self.tabs.currentIndex()
@@ -1024,7 +1024,7 @@ class FrannyBrowser(QMainWindow):
             self.current_browser().setZoomFactor(zoom)
         except Exception:
             pass
-        apply_theme(QApplication.instance(), theme)
+        apply_theme(self, theme)
         self.adblock_enabled = adblock_enabled
         if adblock_enabled:
             self._adblocker = FrannyAdBlocker()
@@ -1408,7 +1408,7 @@ THEMES = {
 }
 
 # -------------------- UTILITY FUNCTIONS --------------------
-def apply_theme(app: QApplication, theme_name: str):
+def apply_theme(window: QWidget, theme_name: str):
     theme = THEMES.get(theme_name, THEMES["Dark"])
     palette = QPalette()
     palette.setColor(QPalette.Window, QColor(theme["window_bg"]))
@@ -1419,13 +1419,19 @@ def apply_theme(app: QApplication, theme_name: str):
     palette.setColor(QPalette.ButtonText, QColor(theme["toolbar_fg"]))
     palette.setColor(QPalette.Highlight, QColor(theme["tab_selected_bg"]))
     palette.setColor(QPalette.HighlightedText, QColor(theme["tab_selected_fg"]))
-    app.setPalette(palette)
+    # per window: in the app host the QApplication is shared with other apps
+    window.setPalette(palette)
+
+def open_window():
+    """Open a browser window in an already running QApplication (used by the app host)."""
+    window = FrannyBrowser()
+    # Apply default theme from the THEMES dict
+    apply_theme(window, "Dark")
+    return window
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
     app.setStyle("Fusion")
-    # Apply default theme from the THEMES dict
-    apply_theme(app, "Dark")
-    window = FrannyBrowser()
+    window = open_window()
     window.show()
     sys.exit(app.exec_())
\ No newline at end of file
@@ -4,10 +4,19 @@
 import tkinter as tk
 from tkinter import ttk, filedialog
 from PIL import Image, ImageTk
-from pygame import mixer
 import os
+import sys
 import time
 
+# Also runnable as a script from the repo root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Applications.insider_engine import GaplessPlayer
+from Applications.media_info import duration
+from Applications.media_library import AUDIO_EXTENSIONS, SORT_KEYS, LibraryView, MediaLibrary
+from core.scheduler import get_scheduler
+
+SEARCH_DELAY = 0.1  # seconds of typing quiet before the playlist is filtered
+
 class Insider:
     def __init__(self):
         self.root = tk.Tk()
@@ -15,13 +24,28 @@ class Insider:
         self.root.geometry("700x400")
         self.root.configure(bg="#1e1e1e")
 
-        mixer.init()
         self.playlist = []
+        self.entry_ids = []  # library track id per playlist row; the player follows these
+        self.row_of = {}  # track id -> playlist row
+        self.hidden = set()  # ids removed from the playlist this session
         self.current_index = -1
+        self.current_id = None
         self.is_playing = False
         self.total_duration = 0
+        self.updating_progress = False
+        self.player = GaplessPlayer(self.track_after)
+        self.scheduler = get_scheduler(self.root)
+        self.library = MediaLibrary()
+        self.view = LibraryView(self.library.tracks())
+        self.tracks = {track.id: track for track in self.view.tracks}
+        self.art_images = {}  # thumbnail key -> PhotoImage
+        self.search_job = None
 
         self.setup_ui()
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
+        self.refresh_playlist()
+        # Catch up with anything that changed in the music folders since last time
+        self.start_scan()
 
     def setup_ui(self):
         style = ttk.Style(self.root)
@@ -34,6 +58,17 @@ class Insider:
         self.left_frame = ttk.Frame(self.root)
         self.left_frame.pack(side="left", fill="y", padx=10, pady=10)
 
+        self.search_var = tk.StringVar()
+        self.search_var.trace_add("write", self.schedule_search)
+        self.search_entry = ttk.Entry(self.left_frame, textvariable=self.search_var)
+        self.search_entry.pack(fill="x", pady=(0, 5))
+
+        self.sort_var = tk.StringVar(value="Title")
+        self.sort_box = ttk.Combobox(self.left_frame, textvariable=self.sort_var, state="readonly",
+                                     values=[key.capitalize() for key in SORT_KEYS])
+        self.sort_box.pack(fill="x", pady=(0, 5))
+        self.sort_box.bind("<<ComboboxSelected>>", lambda event: self.refresh_playlist())
+
         self.playlist_box = tk.Listbox(self.left_frame, bg="#2c2c2c", fg="white", selectbackground="#444", width=30)
         self.playlist_box.pack(fill="y", expand=True)
         self.playlist_box.bind("<Double-1>", self.play_selected)
@@ -41,6 +76,9 @@ class Insider:
         self.add_btn = ttk.Button(self.left_frame, text="Add File", command=self.add_to_playlist)
         self.add_btn.pack(pady=5)
 
+        self.add_folder_btn = ttk.Button(self.left_frame, text="Add Folder", command=self.add_folder)
+        self.add_folder_btn.pack(pady=5)
+
         self.remove_btn = ttk.Button(self.left_frame, text="Remove", command=self.remove_from_playlist)
         self.remove_btn.pack(pady=5)
 
@@ -90,10 +128,68 @@ class Insider:
         self.album_art_label.image = self.album_image  
 
     def add_to_playlist(self):
-        files = filedialog.askopenfilenames(filetypes=[("Audio Files", "*.mp3 *.wav *.ogg *.flac")])
-        for file in files:
-            self.playlist.append(file)
-            self.playlist_box.insert(tk.END, os.path.basename(file))
+        patterns = " ".join(f"*{ext}" for ext in AUDIO_EXTENSIONS)
+        files = filedialog.askopenfilenames(filetypes=[("Audio Files", patterns)])
+        if files:
+            self.start_scan(folders=[], files=files)
+
+    def add_folder(self):
+        folder = filedialog.askdirectory()
+        if folder:
+            self.library.add_folder(folder)
+            self.start_scan(folders=[folder])
+
+    def start_scan(self, folders=None, files=None):
+        if self.current_index == -1:
+            self.file_label.config(text="Scanning library...")
+        self.scheduler.submit(self.scan_library, folders, files, callback=self.on_scan_done)
+
+    def scan_library(self, folders, files):
+        """Runs on the pool; a failed scan still reports back so the status line is cleared."""
+        try:
+            return self.library.scan(folders, files)
+        except Exception as e:
+            print(f"Library scan failed: {e}")
+            return 0, 0
+
+    def on_scan_done(self, result):
+        changed, removed = result
+        if self.current_index == -1:
+            self.file_label.config(text="No file selected")
+        if changed or removed:
+            self.view = LibraryView(self.library.tracks())
+            self.tracks = {track.id: track for track in self.view.tracks}
+            self.refresh_playlist()
+
+    def schedule_search(self, *args):
+        self.scheduler.cancel(self.search_job)
+        self.search_job = self.scheduler.call_later(SEARCH_DELAY, self.refresh_playlist, name="insider search")
+
+    def refresh_playlist(self):
+        """Show the library filtered by the search box and sorted by the chosen column."""
+        self.search_job = None
+        key = self.sort_var.get().lower()
+        tracks = [t for t in self.view.query(self.search_var.get(), key if key in SORT_KEYS else "title")
+                  if t.id not in self.hidden]
+        # New lists, swapped in whole: the player thread reads them in track_after
+        self.playlist = [track.path for track in tracks]
+        self.entry_ids = [track.id for track in tracks]
+        self.row_of = {track_id: row for row, track_id in enumerate(self.entry_ids)}
+        self.current_index = self.row_of.get(self.current_id, -1)
+        self.playlist_box.delete(0, tk.END)
+        if tracks:
+            self.playlist_box.insert(tk.END, *[track.label for track in tracks])
+        if self.current_index >= 0:
+            self.playlist_box.selection_set(self.current_index)
+            self.playlist_box.see(self.current_index)
+
+    def track_after(self, entry_id):
+        """(id, path) of the row after ``entry_id``; asked by the player to prefetch it."""
+        entry_ids, playlist, row_of = self.entry_ids, self.playlist, self.row_of
+        row = row_of.get(entry_id)
+        if row is None or row + 1 >= len(entry_ids) or entry_ids[row] != entry_id:
+            return None
+        return entry_ids[row + 1], playlist[row + 1]
 
     def play_selected(self, event):
         selected = self.playlist_box.curselection()
@@ -104,31 +200,43 @@ class Insider:
     def play_current(self):
         if 0 <= self.current_index < len(self.playlist):
             filepath = self.playlist[self.current_index]
-            mixer.music.load(filepath)
-            mixer.music.play()
-            self.total_duration = mixer.Sound(filepath).get_length()
-            self.file_label.config(text=os.path.basename(filepath))
-            self.update_album_art(filepath)
+            self.current_id = self.entry_ids[self.current_index]
+            self.player.play(self.current_id, filepath)
+            self.show_track(filepath)
             self.play_pause_btn.config(text="⏸")
-            self.is_playing = True
-            self.update_progress()
+            if not self.is_playing:
+                self.is_playing = True
+                self.update_progress()
+
+    def show_track(self, filepath):
+        track = self.tracks.get(self.current_id)
+        # The library (or else the file header) has the length; nothing is decoded twice
+        self.total_duration = (track.duration if track else None) or duration(filepath) or 0
+        self.file_label.config(text=track.label if track else os.path.basename(filepath))
+        self.update_album_art(filepath, track)
+        self.playlist_box.selection_clear(0, tk.END)
+        self.playlist_box.selection_set(self.current_index)
+        self.playlist_box.see(self.current_index)
 
     def toggle_play(self):
         if self.is_playing:
-            mixer.music.pause()
+            self.player.pause()
             self.play_pause_btn.config(text="▶️")
             self.is_playing = False
         else:
             if self.current_index == -1 and self.playlist:
                 self.current_index = 0
                 self.play_current()
+            elif not self.player.active:
+                self.play_current()
             else:
-                mixer.music.unpause()
+                self.player.resume()
                 self.play_pause_btn.config(text="⏸")
                 self.is_playing = True
+                self.update_progress()
 
     def stop_media(self):
-        mixer.music.stop()
+        self.player.stop()
         self.play_pause_btn.config(text="▶️")
         self.is_playing = False
 
@@ -146,46 +254,78 @@ class Insider:
         selected = self.playlist_box.curselection()
         if selected:
             index = selected[0]
-            del self.playlist[index]
-            self.playlist_box.delete(index)
+            self.hidden.add(self.entry_ids[index])
             if self.current_index == index:
                 self.stop_media()
                 self.file_label.config(text="No file selected")
                 self.default_album_art()
-                self.current_index = -1
+                self.current_id = None
+            self.refresh_playlist()
 
     def adjust_volume(self, val):
-        mixer.music.set_volume(float(val) / 100)
+        self.player.set_volume(float(val) / 100)
 
     def update_progress(self):
-        if self.is_playing and 0 <= self.current_index < len(self.playlist):
-            pos = mixer.music.get_pos() / 1000
+        if not self.is_playing:
+            return
+        position = self.player.position()
+        if position is None:
+            if not self.player.active:
+                # ran off the end of the playlist
+                self.play_pause_btn.config(text="▶️")
+                self.is_playing = False
+                return
+        else:
+            entry_id, filepath, pos, length = position
+            if entry_id != self.current_id:
+                # the player moved on to the next track by itself
+                self.current_id = entry_id
+                self.current_index = self.row_of.get(entry_id, -1)
+                self.show_track(filepath)
+            self.total_duration = self.total_duration or length
             percent = (pos / self.total_duration) * 100 if self.total_duration else 0
+            self.updating_progress = True
             self.progress_scale.set(percent)
+            self.updating_progress = False
 
             current_time = time.strftime('%M:%S', time.gmtime(pos))
             total_time = time.strftime('%M:%S', time.gmtime(self.total_duration))
             self.time_label.config(text=f"{current_time} / {total_time}")
 
-            self.root.after(1000, self.update_progress)
+        self.root.after(250, self.update_progress)
 
     def seek_media(self, val):
+        # Scale.set() from update_progress calls this too; only user drags seek
+        if self.updating_progress:
+            return
         if self.total_duration and self.current_index != -1:
             new_time = (float(val) / 100) * self.total_duration
-            mixer.music.play(start=new_time)
+            self.player.play(self.entry_ids[self.current_index], self.playlist[self.current_index], new_time)
             self.play_pause_btn.config(text="⏸")
-            self.is_playing = True
-
-    def update_album_art(self, filepath):
-        folder = os.path.dirname(filepath)
-        cover_path = os.path.join(folder, "cover.jpg")
-        if os.path.exists(cover_path):
-            img = Image.open(cover_path).resize((150, 150))
-        else:
-            img = Image.new("RGB", (150, 150), "#444")
-        self.album_image = ImageTk.PhotoImage(img)
+            if not self.is_playing:
+                self.is_playing = True
+                self.update_progress()
+
+    def update_album_art(self, filepath, track=None):
+        """Show the track's cached thumbnail; the scan already resized it."""
+        key = track.art if track else None
+        if key not in self.art_images:
+            try:
+                img = Image.open(self.library.art_path(key)) if key else Image.new("RGB", (150, 150), "#444")
+            except OSError:
+                img = Image.new("RGB", (150, 150), "#444")
+            if len(self.art_images) > 64:
+                self.art_images.clear()
+            self.art_images[key] = ImageTk.PhotoImage(img)
+        self.album_image = self.art_images[key]
         self.album_art_label.config(image=self.album_image)
-        self.album_art_label.image = self.album_image 
+        self.album_art_label.image = self.album_image
+
+    def close(self):
+        self.player.shutdown()
+        self.scheduler.shutdown()
+        self.library.close()
+        self.root.destroy()
 
     def run(self):
         self.root.mainloop()
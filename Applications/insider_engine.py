@@ -0,0 +1,317 @@
+# Copyright 2025 the FranchukOS project authors.
+# Contributed under the Apache License, Version 2.0.
+
+"""Gapless playback for Insider.
+
+Tracks are played as a stream of short decoded chunks on a reserved mixer
+channel. pygame starts a queued Sound on the very next sample after the
+current one ends, so as long as the first chunk of the next track is
+ready, the handover has no gap. That chunk is prepared ahead of time: as
+soon as a track starts, a background thread opens and decodes the next
+playlist entry.
+
+PCM WAV files in the mixer's format are read straight from disk chunk by
+chunk; anything else is decoded by pygame in the background thread.
+"""
+
+import threading
+import time
+import wave
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pygame
+
+SAMPLE_RATE = 44100
+CHANNELS = 2
+CHUNK_SECONDS = 1.0
+STREAM_CHANNEL = 0  # reserved mixer channel for the player stream
+
+
+def init_mixer():
+    """Initialise pygame's mixer in the format the player streams in."""
+    if not pygame.mixer.get_init():
+        pygame.mixer.init(frequency=SAMPLE_RATE, size=-16, channels=CHANNELS, buffer=1024)
+    pygame.mixer.set_reserved(STREAM_CHANNEL + 1)
+    rate, _, channels = pygame.mixer.get_init()
+    return rate, channels
+
+
+class ArrayStream:
+    """A track decoded in full by pygame, read as int16 (frames, channels) slices."""
+
+    def __init__(self, path, channels):
+        data = pygame.sndarray.array(pygame.mixer.Sound(path))
+        if data.ndim == 1:
+            data = np.repeat(data[:, None], channels, axis=1)
+        self.data = data
+        self.frames = len(data)
+        self.pos = 0
+
+    def seek(self, frame):
+        self.pos = max(0, min(frame, self.frames))
+
+    def read(self, count):
+        chunk = self.data[self.pos:self.pos + count]
+        self.pos += len(chunk)
+        return chunk
+
+    def close(self):
+        self.data = None
+
+
+class WavStream:
+    """A 16-bit PCM WAV at the mixer's rate, read from disk as it plays."""
+
+    def __init__(self, path, rate, channels):
+        self.file = wave.open(path, "rb")
+        if self.file.getsampwidth() != 2 or self.file.getframerate() != rate \
+                or self.file.getnchannels() not in (1, channels):
+            self.file.close()
+            raise ValueError("not in the mixer's format")
+        self.channels = channels
+        self.frames = self.file.getnframes()
+
+    def seek(self, frame):
+        self.file.setpos(max(0, min(frame, self.frames)))
+
+    def read(self, count):
+        raw = np.frombuffer(self.file.readframes(count), dtype="<i2")
+        chunk = raw.reshape(-1, self.file.getnchannels())
+        if chunk.shape[1] != self.channels:
+            chunk = np.repeat(chunk, self.channels, axis=1)
+        return chunk
+
+    def close(self):
+        self.file.close()
+
+
+def open_stream(path, rate, channels):
+    if path.lower().endswith(".wav"):
+        try:
+            return WavStream(path, rate, channels)
+        except (ValueError, wave.Error, EOFError):
+            pass
+    return ArrayStream(path, channels)
+
+
+class Chunk:
+    __slots__ = ("sound", "key", "path", "start", "frames", "total")
+
+    def __init__(self, sound, key, path, start, frames, total):
+        self.sound = sound
+        self.key = key
+        self.path = path
+        self.start = start  # first frame of the chunk within its track
+        self.frames = frames
+        self.total = total  # frames in the whole track
+
+
+class GaplessPlayer:
+    """Streams the playlist through one mixer channel.
+
+    Tracks are identified by a ``key`` chosen by the caller (a playlist
+    entry id), so edits to the playlist never confuse the player.
+    ``next_track(key)`` returns the ``(key, path)`` to play after ``key``,
+    or None at the end of the playlist; it is called from the player
+    threads. ``position()`` is what the UI polls.
+    """
+
+    def __init__(self, next_track):
+        self.next_track = next_track
+        self.rate, self.channels = init_mixer()
+        self.chunk_frames = int(CHUNK_SECONDS * self.rate)
+        self.channel = pygame.mixer.Channel(STREAM_CHANNEL)
+        self.lock = threading.Lock()
+        self.generation = 0
+        self.streams = {}  # (key, path) -> Future of an open stream
+        self.pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="insider decode")
+        self.on_air = None  # (monotonic time, Chunk) of the chunk being heard
+        self.queued = None  # Chunk queued behind it
+        self.paused_at = None
+        self.volume = 1.0
+        self.active = False  # a track is playing, paused or about to start
+
+    # ---- controls (Tk thread) ----
+
+    def play(self, key, path, start=0.0):
+        """Play ``path`` (playlist entry ``key``) from ``start`` seconds."""
+        generation = self.stop()
+        self.active = True
+        threading.Thread(target=self.feed, args=(generation, key, path, int(start * self.rate)),
+                         name="insider stream", daemon=True).start()
+
+    def seek(self, seconds):
+        chunk = self.current()
+        if chunk is not None:
+            self.play(chunk.key, chunk.path, seconds)
+
+    def pause(self):
+        if self.paused_at is None:
+            self.channel.pause()
+            self.paused_at = time.monotonic()
+
+    def resume(self):
+        if self.paused_at is not None:
+            with self.lock:
+                if self.on_air is not None:
+                    since, chunk = self.on_air
+                    self.on_air = (since + time.monotonic() - self.paused_at, chunk)
+                self.paused_at = None
+            self.channel.unpause()
+
+    def stop(self):
+        """Silence the channel; any running feeder sees the new generation and exits."""
+        with self.lock:
+            self.generation += 1
+            self.on_air = self.queued = None
+            self.paused_at = None
+            self.active = False
+            self.channel.stop()
+            return self.generation
+
+    def set_volume(self, volume):
+        self.volume = volume
+        self.channel.set_volume(volume)
+
+    def shutdown(self):
+        self.stop()
+        self.pool.shutdown(wait=False)
+
+    def current(self):
+        with self.lock:
+            return self.on_air[1] if self.on_air else None
+
+    def position(self):
+        """(key, path, seconds in, track seconds) of what is being heard, or None."""
+        with self.lock:
+            on_air, queued, paused_at = self.on_air, self.queued, self.paused_at
+        if on_air is None:
+            return None
+        since, chunk = on_air
+        heard = int(((paused_at or time.monotonic()) - since) * self.rate)
+        if heard >= chunk.frames and queued is not None:
+            # the queued chunk is already playing; the feeder just hasn't noticed yet
+            heard, chunk = heard - chunk.frames, queued
+        heard = min(chunk.frames, heard)
+        return chunk.key, chunk.path, (chunk.start + heard) / self.rate, chunk.total / self.rate
+
+    # ---- streaming (player threads) ----
+
+    def prefetch(self, key, path):
+        """Start opening (decoding) a track in the background; keeps the two most recent."""
+        entry = (key, path)
+        with self.lock:
+            future = self.streams.pop(entry, None) or self.pool.submit(self.open_prepared, path)
+            self.streams[entry] = future  # most recently used last
+            for old in list(self.streams)[:-2]:
+                self.streams.pop(old).add_done_callback(lambda f: f.exception() is None and f.result()[0].close())
+            return future
+
+    def open_prepared(self, path):
+        """Open a track and decode its first chunk, so it can go on air at once."""
+        stream = open_stream(path, self.rate, self.channels)
+        return stream, stream.read(self.chunk_frames)
+
+    def feed(self, generation, key, path, start_frame):
+        try:
+            track = self.start_track(key, path, start_frame)
+        except Exception as e:
+            print(f"Could not play {path}: {e}")
+            self.finish(generation)
+            return
+        playing = self.next_chunk(track, generation)
+        if playing is None or not self.put(generation, playing, start=True):
+            self.finish(generation)
+            return
+        queued = self.next_chunk(track, generation)
+        if queued is not None:
+            self.put(generation, queued)
+        poll = CHUNK_SECONDS / 8
+        while generation == self.generation:
+            if self.paused_at is not None:
+                time.sleep(poll)
+                continue
+            if queued is not None and self.channel.get_queue() is None:
+                # the queued chunk just went on air; queue the one after it
+                with self.lock:
+                    if generation != self.generation:
+                        break
+                    # it started right where the previous chunk ended, not when we noticed
+                    since, previous = self.on_air
+                    self.on_air = (since + previous.frames / self.rate, queued)
+                    self.queued = None
+                queued = self.next_chunk(track, generation)
+                if queued is not None:
+                    self.put(generation, queued)
+            elif not self.channel.get_busy():
+                if queued is None:
+                    break  # end of the playlist
+                # starved (e.g. a slow decode); carry on from where we are
+                if not self.put(generation, queued, start=True):
+                    break
+                queued = self.next_chunk(track, generation)
+                if queued is not None:
+                    self.put(generation, queued)
+            time.sleep(poll)
+        self.finish(generation)
+
+    def finish(self, generation):
+        with self.lock:
+            if generation == self.generation:
+                self.on_air = self.queued = None
+                self.active = False
+
+    def put(self, generation, chunk, start=False):
+        """Start or queue ``chunk``, unless a newer play() or stop() owns the channel."""
+        with self.lock:
+            if generation != self.generation:
+                return False
+            if start:
+                self.channel.set_volume(self.volume)
+                self.channel.play(chunk.sound)
+                self.on_air = (time.monotonic(), chunk)
+                self.queued = None
+            else:
+                self.channel.queue(chunk.sound)
+                self.queued = chunk
+            return True
+
+    def start_track(self, key, path, start_frame=0):
+        stream, first = self.prefetch(key, path).result()
+        if start_frame:
+            with self.lock:
+                stream.seek(start_frame)
+            first = None
+        else:
+            stream.seek(len(first))
+        following = self.next_track(key)
+        if following is not None:
+            self.prefetch(*following)
+        return {"key": key, "path": path, "stream": stream, "pending": first,
+                "frame": start_frame, "next": following}
+
+    def next_chunk(self, track, generation):
+        """The next Chunk of the stream, crossing into the next track when this one runs out."""
+        while generation == self.generation:
+            if track["pending"] is not None:
+                data, track["pending"] = track["pending"], None
+            else:
+                with self.lock:
+                    if generation != self.generation:
+                        return None
+                    data = track["stream"].read(self.chunk_frames)
+            if len(data):
+                chunk = Chunk(pygame.sndarray.make_sound(np.ascontiguousarray(data)), track["key"],
+                              track["path"], track["frame"], len(data), track["stream"].frames)
+                track["frame"] += len(data)
+                return chunk
+            following = track["next"]
+            if following is None:
+                return None
+            try:
+                track.update(self.start_track(*following))
+            except Exception as e:
+                print(f"Could not play {following[1]}: {e}")
+                track["next"] = self.next_track(following[0])
+        return None
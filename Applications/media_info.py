@@ -0,0 +1,390 @@
+# Copyright 2025 the FranchukOS project authors.
+# Contributed under the Apache License, Version 2.0.
+
+"""Track durations and tags read from container headers, without decoding audio.
+
+Each reader looks at a few kilobytes at most: the RIFF ``fmt``/``data``
+chunks of a WAV, FLAC's STREAMINFO block, the first and last Ogg pages,
+or an MP3's first frame (Xing/Info/VBRI frame counts, else the bitrate).
+``duration`` returns None for anything it cannot read; callers fall back
+to the length of the decoded audio.
+
+``read_tags`` returns title/artist/album/track/genre/year and embedded
+cover art from ID3v2/ID3v1, FLAC and Ogg Vorbis comments, and WAV
+LIST/INFO chunks.
+"""
+
+import base64
+import os
+import struct
+
+OGG_TAIL = 65536  # bytes searched for the last Ogg page
+
+MP3_BITRATES = {
+    # (MPEG-1, layer) and (MPEG-2/2.5, layer) tables, kbps
+    (1, 1): [0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448],
+    (1, 2): [0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384],
+    (1, 3): [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    (2, 1): [0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256],
+    (2, 2): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+    (2, 3): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+MP3_RATES = {3: [44100, 48000, 32000], 2: [22050, 24000, 16000], 0: [11025, 12000, 8000]}
+
+
+def duration(path):
+    """Length of the track in seconds, or None if the header can't tell."""
+    readers = {".wav": wav_duration, ".flac": flac_duration, ".ogg": ogg_duration,
+               ".oga": ogg_duration, ".opus": ogg_duration, ".mp3": mp3_duration}
+    reader = readers.get(os.path.splitext(path)[1].lower())
+    if reader is None:
+        return None
+    try:
+        with open(path, "rb") as f:
+            return reader(f)
+    except (OSError, struct.error, ValueError, IndexError, ZeroDivisionError):
+        return None  # truncated or damaged header
+
+
+def wav_duration(f):
+    header = f.read(12)
+    if header[:4] != b"RIFF" or header[8:12] != b"WAVE":
+        return None
+    rate = block_align = None
+    while True:
+        chunk = f.read(8)
+        if len(chunk) < 8:
+            return None
+        name, size = chunk[:4], struct.unpack("<I", chunk[4:])[0]
+        if name == b"fmt ":
+            fmt = f.read(size)
+            _, _, rate, _, block_align = struct.unpack("<HHIIH", fmt[:14])
+            f.seek(size % 2, 1)
+        elif name == b"data":
+            if not rate or not block_align:
+                return None
+            return size // block_align / rate
+        else:
+            f.seek(size + size % 2, 1)
+
+
+def flac_duration(f):
+    if f.read(4) != b"fLaC":
+        return None
+    while True:
+        header = f.read(4)
+        if len(header) < 4:
+            return None
+        last, kind = header[0] & 0x80, header[0] & 0x7F
+        size = int.from_bytes(header[1:], "big")
+        if kind == 0:  # STREAMINFO
+            info = f.read(size)
+            packed = int.from_bytes(info[10:18], "big")
+            rate = packed >> 44
+            samples = packed & ((1 << 36) - 1)
+            return samples / rate if rate and samples else None
+        if last:
+            return None
+        f.seek(size, 1)
+
+
+def ogg_duration(f):
+    first = f.read(4096)
+    if len(first) < 27 or first[:4] != b"OggS":
+        return None
+    segments = first[26]
+    packet = first[27 + segments:]
+    if packet[:7] == b"\x01vorbis":
+        rate, pre_skip = struct.unpack("<I", packet[12:16])[0], 0
+    elif packet[:8] == b"OpusHead":
+        rate, pre_skip = 48000, struct.unpack("<H", packet[10:12])[0]
+    else:
+        return None
+    f.seek(0, os.SEEK_END)
+    size = f.tell()
+    f.seek(max(0, size - OGG_TAIL))
+    tail = f.read()
+    at = tail.rfind(b"OggS")
+    while at >= 0:
+        granule = struct.unpack("<q", tail[at + 6:at + 14])[0]
+        if granule > 0:
+            return max(0, granule - pre_skip) / rate
+        at = tail.rfind(b"OggS", 0, at)
+    return None
+
+
+def synchsafe(data):
+    """The 28-bit integer ID3v2 packs into four 7-bit bytes."""
+    return (data[0] << 21) | (data[1] << 14) | (data[2] << 7) | data[3]
+
+
+def id3_header(header):
+    """(version, flags, tag size, audio offset) for a 10-byte ID3v2 header, else None.
+
+    The tag size excludes the header and the optional footer; the audio
+    offset is where the first frame may start, past both.
+    """
+    if len(header) < 10 or header[:3] != b"ID3":
+        return None
+    version, flags, size = header[3], header[5], synchsafe(header[6:10])
+    return version, flags, size, 10 + size + (10 if flags & 0x10 else 0)
+
+
+def mp3_duration(f):
+    f.seek(0, os.SEEK_END)
+    size = f.tell()
+    f.seek(0)
+    id3 = id3_header(f.read(10))
+    start = id3[3] if id3 else 0
+    f.seek(start)
+    data = f.read(16384)
+    for i in range(len(data) - 4):
+        if data[i] != 0xFF or data[i + 1] & 0xE0 != 0xE0:
+            continue
+        frame = parse_mp3_header(data[i:i + 4])
+        if frame is None:
+            continue
+        version, layer, kbps, rate, mono = frame
+        samples = 384 if layer == 1 else (1152 if layer == 2 or version == 3 else 576)
+        # Xing/Info sits after the side information; VBRI always 32 bytes in
+        side = (17 if mono else 32) if version == 3 else (9 if mono else 17)
+        for offset, tag in ((4 + side, (b"Xing", b"Info")), (36, (b"VBRI",))):
+            block = data[i + offset:i + offset + 18]
+            if block[:4] in tag:
+                if tag[0] == b"VBRI":
+                    frames = struct.unpack(">I", block[14:18])[0]
+                elif struct.unpack(">I", block[4:8])[0] & 1:
+                    frames = struct.unpack(">I", block[8:12])[0]
+                else:
+                    break
+                return frames * samples / rate
+        audio = size - start - i
+        f.seek(max(0, size - 128))
+        if f.read(3) == b"TAG":
+            audio -= 128
+        return audio * 8 / (kbps * 1000)
+    return None
+
+
+def parse_mp3_header(header):
+    """(version, layer, kbps, sample rate, mono) for a valid frame header, else None."""
+    version_bits = (header[1] >> 3) & 3
+    layer = 4 - ((header[1] >> 1) & 3)
+    bitrate_index = header[2] >> 4
+    rate_index = (header[2] >> 2) & 3
+    if version_bits == 1 or layer == 4 or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+    table = (1 if version_bits == 3 else 2, layer)
+    mono = (header[3] >> 6) == 3
+    return version_bits, layer, MP3_BITRATES[table][bitrate_index], MP3_RATES[version_bits][rate_index], mono
+
+
+# ---- tags ----
+
+TAG_FIELDS = ("title", "artist", "album", "track", "genre", "year")
+
+ID3_FRAMES = {
+    "TIT2": "title", "TPE1": "artist", "TALB": "album", "TRCK": "track", "TCON": "genre",
+    "TYER": "year", "TDRC": "year",
+    "TT2": "title", "TP1": "artist", "TAL": "album", "TRK": "track", "TCO": "genre", "TYE": "year",
+}
+COMMENT_KEYS = {"TITLE": "title", "ARTIST": "artist", "ALBUM": "album", "TRACKNUMBER": "track",
+                "GENRE": "genre", "DATE": "year", "YEAR": "year"}
+RIFF_INFO = {b"INAM": "title", b"IART": "artist", b"IPRD": "album", b"ITRK": "track",
+             b"IPRT": "track", b"IGNR": "genre", b"ICRD": "year"}
+ID3_ENCODINGS = {0: "latin-1", 1: "utf-16", 2: "utf-16-be", 3: "utf-8"}
+
+
+def read_tags(path):
+    """{field: value} for the TAG_FIELDS present, plus ``art`` (image bytes or None) and ``duration``."""
+    readers = {".mp3": mp3_tags, ".flac": flac_tags, ".ogg": ogg_tags, ".oga": ogg_tags,
+               ".opus": ogg_tags, ".wav": wav_tags}
+    reader = readers.get(os.path.splitext(path)[1].lower())
+    tags = {}
+    if reader is not None:
+        try:
+            with open(path, "rb") as f:
+                tags = reader(f)
+        except (OSError, struct.error, ValueError, IndexError, UnicodeDecodeError):
+            tags = {}
+    tags = {key: value for key, value in tags.items() if value}
+    if "track" in tags and not isinstance(tags["track"], int):
+        number = str(tags["track"]).split("/")[0].strip()
+        tags["track"] = int(number) if number.isdigit() else None
+    if "year" in tags:
+        tags["year"] = str(tags["year"])[:4]
+    tags.setdefault("art", None)
+    tags["duration"] = duration(path)
+    return tags
+
+
+def id3_text(data):
+    encoding = ID3_ENCODINGS.get(data[0], "latin-1")
+    text = data[1:].decode(encoding, errors="replace")
+    return text.split("\x00")[0].strip()
+
+
+def id3_picture(data, short_ids):
+    """Image bytes from an APIC (or v2.2 PIC) frame."""
+    encoding = data[0]
+    if short_ids:
+        pos = 4  # three-letter image format
+    else:
+        pos = data.index(b"\x00", 1) + 1  # MIME type
+    pos += 1  # picture type
+    terminator = b"\x00\x00" if encoding in (1, 2) else b"\x00"
+    end = data.find(terminator, pos)
+    while terminator == b"\x00\x00" and end >= 0 and (end - pos) % 2:
+        end = data.find(terminator, end + 1)
+    return data[end + len(terminator):] if end >= 0 else None
+
+
+def mp3_tags(f):
+    tags = {}
+    id3 = id3_header(f.read(10))
+    if id3:
+        version, flags, size, _ = id3
+        body = f.read(size)
+        pos = 0
+        if flags & 0x40 and version >= 3:  # extended header
+            ext = body[:4]
+            pos = synchsafe(ext) if version == 4 else struct.unpack(">I", ext)[0] + 4
+        short_ids = version == 2
+        head = 6 if short_ids else 10
+        while pos + head <= len(body):
+            if short_ids:
+                frame_id = body[pos:pos + 3].decode("latin-1")
+                frame_size = int.from_bytes(body[pos + 3:pos + 6], "big")
+            else:
+                frame_id = body[pos:pos + 4].decode("latin-1")
+                raw = body[pos + 4:pos + 8]
+                frame_size = synchsafe(raw) if version == 4 else struct.unpack(">I", raw)[0]
+            if not frame_id.strip("\x00") or frame_size <= 0:
+                break
+            data = body[pos + head:pos + head + frame_size]
+            field = ID3_FRAMES.get(frame_id)
+            if field and field not in tags:
+                tags[field] = id3_text(data)
+            elif frame_id in ("APIC", "PIC") and not tags.get("art"):
+                tags["art"] = id3_picture(data, short_ids)
+            pos += head + frame_size
+    if not tags.get("title"):
+        f.seek(0, os.SEEK_END)
+        if f.tell() >= 128:
+            f.seek(-128, os.SEEK_END)
+            tail = f.read(128)
+            if tail[:3] == b"TAG":
+                fields = [tail[3:33], tail[33:63], tail[63:93], tail[93:97]]
+                for key, raw in zip(("title", "artist", "album", "year"), fields):
+                    tags.setdefault(key, raw.split(b"\x00")[0].decode("latin-1").strip())
+                if tail[125] == 0 and tail[126]:
+                    tags.setdefault("track", tail[126])
+    return tags
+
+
+def vorbis_comments(data, tags):
+    """Fill ``tags`` from a Vorbis comment block (FLAC block 4 or an Ogg comment packet)."""
+    vendor = struct.unpack("<I", data[:4])[0]
+    pos = 4 + vendor
+    count = struct.unpack("<I", data[pos:pos + 4])[0]
+    pos += 4
+    for _ in range(count):
+        length = struct.unpack("<I", data[pos:pos + 4])[0]
+        entry = data[pos + 4:pos + 4 + length].decode("utf-8", errors="replace")
+        pos += 4 + length
+        key, _, value = entry.partition("=")
+        key = key.upper()
+        if key in COMMENT_KEYS and COMMENT_KEYS[key] not in tags:
+            tags[COMMENT_KEYS[key]] = value.strip()
+        elif key == "METADATA_BLOCK_PICTURE" and not tags.get("art"):
+            tags["art"] = flac_picture(base64.b64decode(value))
+    return tags
+
+
+def flac_picture(data):
+    pos = 4
+    mime = struct.unpack(">I", data[pos:pos + 4])[0]
+    pos += 4 + mime
+    desc = struct.unpack(">I", data[pos:pos + 4])[0]
+    pos += 4 + desc + 16
+    length = struct.unpack(">I", data[pos:pos + 4])[0]
+    return data[pos + 4:pos + 4 + length]
+
+
+def flac_tags(f):
+    tags = {}
+    if f.read(4) != b"fLaC":
+        return tags
+    while True:
+        header = f.read(4)
+        if len(header) < 4:
+            return tags
+        last, kind = header[0] & 0x80, header[0] & 0x7F
+        size = int.from_bytes(header[1:], "big")
+        if kind == 4:
+            vorbis_comments(f.read(size), tags)
+        elif kind == 6 and not tags.get("art"):
+            tags["art"] = flac_picture(f.read(size))
+        else:
+            f.seek(size, 1)
+        if last:
+            return tags
+
+
+def ogg_packets(f, count, limit=1 << 20):
+    """The first ``count`` packets of an Ogg stream (pages reassembled)."""
+    packets = []
+    current = b""
+    read = 0
+    while len(packets) < count and read < limit:
+        header = f.read(27)
+        if len(header) < 27 or header[:4] != b"OggS":
+            break
+        lacing = f.read(header[26])
+        body = f.read(sum(lacing))
+        read += 27 + len(lacing) + len(body)
+        pos = 0
+        for size in lacing:
+            current += body[pos:pos + size]
+            pos += size
+            if size < 255:
+                packets.append(current)
+                current = b""
+    return packets
+
+
+def ogg_tags(f):
+    packets = ogg_packets(f, 2)
+    if len(packets) < 2:
+        return {}
+    comment = packets[1]
+    if comment[:7] == b"\x03vorbis":
+        return vorbis_comments(comment[7:], {})
+    if comment[:8] == b"OpusTags":
+        return vorbis_comments(comment[8:], {})
+    return {}
+
+
+def wav_tags(f):
+    tags = {}
+    header = f.read(12)
+    if header[:4] != b"RIFF" or header[8:12] != b"WAVE":
+        return tags
+    while True:
+        chunk = f.read(8)
+        if len(chunk) < 8:
+            return tags
+        name, size = chunk[:4], struct.unpack("<I", chunk[4:])[0]
+        if name == b"LIST":
+            data = f.read(size)
+            if data[:4] == b"INFO":
+                pos = 4
+                while pos + 8 <= len(data):
+                    key, length = data[pos:pos + 4], struct.unpack("<I", data[pos + 4:pos + 8])[0]
+                    if key in RIFF_INFO:
+                        value = data[pos + 8:pos + 8 + length].split(b"\x00")[0]
+                        tags.setdefault(RIFF_INFO[key], value.decode("utf-8", errors="replace").strip())
+                    pos += 8 + length + length % 2
+            f.seek(size % 2, 1)
+        else:
+            f.seek(size + size % 2, 1)
@@ -0,0 +1,239 @@
+# Copyright 2025 the FranchukOS project authors.
+# Contributed under the Apache License, Version 2.0.
+
+"""Insider's media library.
+
+``MediaLibrary`` keeps one row per track in ``cache/insider/library.db``:
+tags, duration and a key into the album-art thumbnail cache. A scan walks
+the music folders on a thread pool, one top-level folder per task, and
+only reads tags from files whose mtime or size changed since the last
+scan. Cover art (embedded, or a ``cover.jpg``/``folder.jpg`` next to the
+track) is resized once into ``cache/insider/art`` and keyed by a hash of
+the image, so an album's tracks share one thumbnail.
+
+``LibraryView`` holds the rows in memory with one cached sort order per
+column, so filtering and re-sorting 50k tracks is a list scan, not a
+query.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from PIL import Image
+
+from Applications.media_info import TAG_FIELDS, read_tags
+
+CACHE_DIR = "cache/insider"
+AUDIO_EXTENSIONS = (".mp3", ".wav", ".ogg", ".oga", ".opus", ".flac")
+COVER_NAMES = ("cover.jpg", "cover.png", "folder.jpg", "folder.png", "front.jpg")
+THUMB_SIZE = 150
+SCAN_WORKERS = 8
+
+COLUMNS = ("id", "path", "mtime_ns", "size") + TAG_FIELDS + ("duration", "art")
+SORT_KEYS = ("title", "artist", "album", "duration", "year", "path")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tracks (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    title TEXT, artist TEXT, album TEXT, track INTEGER, genre TEXT, year TEXT,
+    duration REAL,
+    art TEXT
+);
+CREATE TABLE IF NOT EXISTS folders (path TEXT PRIMARY KEY);
+"""
+
+
+class Track:
+    __slots__ = COLUMNS + ("haystack",)
+
+    def __init__(self, row):
+        for name, value in zip(COLUMNS, row):
+            setattr(self, name, value)
+        # everything a search can match, lowercased once
+        self.haystack = " ".join(str(v) for v in (self.title, self.artist, self.album, self.genre,
+                                                   os.path.basename(self.path)) if v).lower()
+
+    @property
+    def label(self):
+        if self.title:
+            return f"{self.artist} - {self.title}" if self.artist else self.title
+        return os.path.basename(self.path)
+
+
+class MediaLibrary:
+    def __init__(self, cache_dir=CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.art_dir = os.path.join(cache_dir, "art")
+        os.makedirs(self.art_dir, exist_ok=True)
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(os.path.join(cache_dir, "library.db"), check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(_SCHEMA)
+        self.db.commit()
+
+    def close(self):
+        with self.lock:
+            self.db.close()
+
+    # ---- folders ----
+
+    def folders(self):
+        with self.lock:
+            return [path for path, in self.db.execute("SELECT path FROM folders ORDER BY path")]
+
+    def add_folder(self, path):
+        with self.lock, self.db:
+            self.db.execute("INSERT OR IGNORE INTO folders (path) VALUES (?)", (os.path.abspath(path),))
+
+    # ---- scanning ----
+
+    def scan(self, folders=None, files=None, workers=SCAN_WORKERS):
+        """Bring the library in line with ``folders`` (default: all saved) and ``files``.
+
+        Returns ``(added or changed, removed)``. Safe to run off the Tk thread.
+        """
+        folders = [os.path.abspath(f) for f in (self.folders() if folders is None else folders)]
+        files = [os.path.abspath(f) for f in files or []]
+        with self.lock:
+            known = {path: (mtime, size) for path, mtime, size
+                     in self.db.execute("SELECT path, mtime_ns, size FROM tracks")}
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="insider scan") as pool:
+            tasks = []
+            for folder in folders:
+                try:
+                    entries = list(os.scandir(folder))
+                except OSError as e:
+                    print(f"Could not scan {folder}: {e}")
+                    continue
+                # one task per top-level folder; loose files in the root form one more
+                tasks += [pool.submit(walk_files, entry.path) for entry in entries if entry.is_dir()]
+                tasks.append(pool.submit(stat_files, [entry.path for entry in entries if entry.is_file()]))
+            tasks.append(pool.submit(stat_files, files))
+            on_disk = {}
+            for task in tasks:
+                on_disk.update(task.result())
+
+            changed = [path for path, stamp in on_disk.items() if known.get(path) != stamp]
+            covers = {}
+            rows = list(pool.map(lambda path: self.read_track(path, on_disk[path], covers), changed))
+
+        # anything not seen by this scan is only gone if it really is gone (it may be outside these folders)
+        removed = [path for path in known if path not in on_disk and not os.path.exists(path)]
+        with self.lock, self.db:
+            self.db.executemany("DELETE FROM tracks WHERE path = ?", [(path,) for path in removed])
+            self.db.executemany(
+                f"INSERT OR REPLACE INTO tracks (id, {', '.join(COLUMNS[1:])}) VALUES "
+                f"((SELECT id FROM tracks WHERE path = ?), {', '.join('?' * (len(COLUMNS) - 1))})",
+                [(row[0],) + row for row in rows])
+        return len(rows), len(removed)
+
+    def read_track(self, path, stamp, covers):
+        """Library row for one file; a file whose tags cannot be read is listed untagged."""
+        try:
+            tags = read_tags(path)
+            art = self.cache_art(tags["art"]) if tags["art"] else self.folder_art(os.path.dirname(path), covers)
+        except Exception as e:
+            print(f"Could not read tags from {path}: {e}")
+            tags, art = {}, None
+        return (path,) + stamp + tuple(tags.get(name) for name in TAG_FIELDS) + (tags.get("duration"), art)
+
+    def folder_art(self, folder, covers):
+        """Thumbnail key of a cover image next to the tracks, looked up once per folder per scan."""
+        if folder not in covers:
+            covers[folder] = None
+            for name in COVER_NAMES:
+                cover = os.path.join(folder, name)
+                if os.path.isfile(cover):
+                    try:
+                        with open(cover, "rb") as f:
+                            covers[folder] = self.cache_art(f.read())
+                    except OSError:
+                        continue
+                    break
+        return covers[folder]
+
+    def cache_art(self, data):
+        """Store a THUMB_SIZE thumbnail of an image; returns its key (None if unreadable)."""
+        key = hashlib.sha1(data).hexdigest()
+        path = self.art_path(key)
+        if os.path.exists(path):
+            return key
+        try:
+            image = Image.open(BytesIO(data)).convert("RGB")
+            image = image.resize((THUMB_SIZE, THUMB_SIZE), Image.LANCZOS)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"  # scan workers may race on one album
+            image.save(tmp_path, "PNG")
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"Could not cache album art: {e}")
+            return None
+        return key
+
+    def art_path(self, key):
+        return os.path.join(self.art_dir, f"{key}.png")
+
+    # ---- reading ----
+
+    def tracks(self):
+        with self.lock:
+            rows = self.db.execute(f"SELECT {', '.join(COLUMNS)} FROM tracks").fetchall()
+        return [Track(row) for row in rows]
+
+
+def walk_files(top):
+    found = {}
+    for folder, _, names in os.walk(top):
+        found.update(stat_files(os.path.join(folder, name) for name in names))
+    return found
+
+
+def stat_files(paths):
+    found = {}
+    for path in paths:
+        if path.lower().endswith(AUDIO_EXTENSIONS):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            found[os.path.abspath(path)] = (stat.st_mtime_ns, stat.st_size)
+    return found
+
+
+class LibraryView:
+    """All tracks in memory; filter and sort without touching the database."""
+
+    def __init__(self, tracks):
+        self.tracks = tracks
+        self.orders = {}  # sort key -> track positions in that order
+        self.present = {}  # sort key -> how many tracks have a value for it (they come first)
+
+    def order(self, key):
+        if key not in self.orders:
+            def sort_key(i):
+                value = getattr(self.tracks[i], key)
+                if isinstance(value, str):
+                    value = value.lower()
+                # missing values sort last
+                return (value is None, value if value is not None else 0, self.tracks[i].path)
+            self.orders[key] = sorted(range(len(self.tracks)), key=sort_key)
+            self.present[key] = sum(getattr(track, key) is not None for track in self.tracks)
+        return self.orders[key]
+
+    def query(self, text="", key="title", reverse=False):
+        """Tracks matching every word of ``text``, sorted by ``key``."""
+        order = self.order(key)
+        if reverse:
+            present = self.present[key]
+            order = order[present - 1::-1] + order[present:] if present else order
+        words = text.lower().split()
+        tracks = self.tracks
+        if not words:
+            return [tracks[i] for i in order]
+        return [tracks[i] for i in order if all(word in tracks[i].haystack for word in words)]
@@ -0,0 +1,141 @@
+# Copyright 2025 the FranchukOS project authors.
+# Contributed under the Apache License, Version 2.0.
+
+"""Saving and revision history for Notetaking.
+
+Notes are written with ``atomic_write`` so a crash mid-save never leaves a
+half-written note. Each note has an append-only revision log under
+``cache/notes/history``: a revision is stored as a zlib-compressed line
+delta against the one before it, with a full copy every ``KEYFRAME_EVERY``
+revisions so restoring never replays a long chain. A small fixed header
+per record lets the history be listed without decompressing anything.
+"""
+
+import difflib
+import json
+import os
+import re
+import struct
+import threading
+import time
+import zlib
+
+HISTORY_DIR = "cache/notes/history"
+KEYFRAME_EVERY = 32
+MIN_REVISION_GAP = 120  # seconds between autosave revisions of the same note
+
+# payload length, timestamp, kind (b"F" full text, b"D" delta), text length
+HEADER = struct.Struct(">Id1sI")
+
+
+def atomic_write(path, text):
+    """Write ``text`` to ``path`` through a temp file and a rename."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as file:
+        file.write(text)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp_path, path)
+
+
+def make_delta(old, new):
+    """Line delta turning ``old`` into ``new``: [start, end] copies old lines, a string is new text."""
+    old_lines = old.splitlines(keepends=True)
+    new_lines = new.splitlines(keepends=True)
+    ops = []
+    matcher = difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            ops.append([i1, i2])
+        elif j2 > j1:
+            ops.append("".join(new_lines[j1:j2]))
+    return ops
+
+
+def apply_delta(old, ops):
+    old_lines = old.splitlines(keepends=True)
+    return "".join("".join(old_lines[op[0]:op[1]]) if isinstance(op, list) else op for op in ops)
+
+
+class Revision:
+    __slots__ = ("number", "timestamp", "kind", "size", "offset", "length")
+
+    def __init__(self, number, timestamp, kind, size, offset, length):
+        self.number = number
+        self.timestamp = timestamp
+        self.kind = kind
+        self.size = size
+        self.offset = offset
+        self.length = length
+
+
+class RevisionStore:
+    """Per-note revision logs; safe to use from the autosave thread and the Tk thread."""
+
+    def __init__(self, root=HISTORY_DIR):
+        self.root = root
+        self.lock = threading.Lock()
+        self.latest = {}  # log path -> (revision count, last revision text, its timestamp)
+
+    def log_path(self, note_path):
+        key = re.sub(r"[^A-Za-z0-9]+", "_", os.path.abspath(note_path)).strip("_")
+        return os.path.join(self.root, f"{key}.hist")
+
+    def revisions(self, note_path):
+        """Every revision of the note, oldest first, read from the record headers only."""
+        revisions = []
+        try:
+            with open(self.log_path(note_path), "rb") as f:
+                file_size = os.fstat(f.fileno()).st_size
+                offset = 0
+                while offset + HEADER.size <= file_size:
+                    f.seek(offset)
+                    length, timestamp, kind, size = HEADER.unpack(f.read(HEADER.size))
+                    offset += HEADER.size
+                    if offset + length > file_size:
+                        break  # torn final record from a crash while appending
+                    revisions.append(Revision(len(revisions), timestamp, kind, size, offset, length))
+                    offset += length
+        except FileNotFoundError:
+            pass
+        return revisions
+
+    def load(self, note_path, number, revisions=None):
+        """The note's text at revision ``number``."""
+        revisions = revisions or self.revisions(note_path)
+        start = number
+        while revisions[start].kind != b"F":
+            start -= 1
+        text = ""
+        with open(self.log_path(note_path), "rb") as f:
+            for revision in revisions[start:number + 1]:
+                f.seek(revision.offset)
+                payload = json.loads(zlib.decompress(f.read(revision.length)))
+                text = payload if revision.kind == b"F" else apply_delta(text, payload)
+        return text
+
+    def add(self, note_path, text, min_gap=0, timestamp=None):
+        """Append a revision unless ``text`` matches the last one or the last is under ``min_gap`` seconds old."""
+        timestamp = time.time() if timestamp is None else timestamp
+        path = self.log_path(note_path)
+        with self.lock:
+            if path not in self.latest:
+                revisions = self.revisions(note_path)
+                end = revisions[-1].offset + revisions[-1].length if revisions else 0
+                if os.path.exists(path) and os.path.getsize(path) > end:
+                    os.truncate(path, end)
+                last = self.load(note_path, len(revisions) - 1, revisions) if revisions else None
+                self.latest[path] = (len(revisions), last, revisions[-1].timestamp if revisions else 0)
+            count, last, last_time = self.latest[path]
+            if last == text or (last is not None and timestamp - last_time < min_gap):
+                return False
+            if last is None or count % KEYFRAME_EVERY == 0:
+                kind, payload = b"F", text
+            else:
+                kind, payload = b"D", make_delta(last, text)
+            data = zlib.compress(json.dumps(payload, separators=(",", ":")).encode("utf-8"), 6)
+            os.makedirs(self.root, exist_ok=True)
+            with open(path, "ab") as f:
+                f.write(HEADER.pack(len(data), timestamp, kind, len(text)) + data)
+            self.latest[path] = (count + 1, text, timestamp)
+        return True
@@ -0,0 +1,205 @@
+# Copyright 2025 the FranchukOS project authors.
+# Contributed under the Apache License, Version 2.0.
+
+"""Full-text index of the Notetaking library.
+
+Notes are indexed into an SQLite FTS5 table under ``cache/notes``. A sync
+only re-reads notes whose mtime or size changed since the last one, so
+opening a library of tens of thousands of notes costs one ``scandir``.
+Searches are ranked with bm25 and come back with a highlighted snippet.
+On SQLite builds without FTS5 the index falls back to a plain substring
+search over the same table.
+"""
+
+import os
+import re
+import sqlite3
+import threading
+
+CACHE_DIR = "cache/notes"
+NOTE_SUFFIX = ".txt"
+SNIPPET_TOKENS = 12
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS notes (
+    id INTEGER PRIMARY KEY,
+    name TEXT UNIQUE NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    body TEXT NOT NULL DEFAULT ''
+);
+"""
+
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS notes_fts USING fts5(
+    name, body, content='notes', content_rowid='id', tokenize='unicode61'
+);
+"""
+
+
+def default_db_path(notes_dir):
+    """One index per notes directory, named after its absolute path."""
+    key = re.sub(r"[^A-Za-z0-9]+", "_", os.path.abspath(notes_dir)).strip("_")
+    return os.path.join(CACHE_DIR, f"{key}.db")
+
+
+def fts_query(text):
+    """Turn what the user typed into an FTS5 query: every word must match, the last as a prefix."""
+    words = re.findall(r"\w+", text)
+    if not words:
+        return None
+    terms = ['"' + word.replace('"', '""') + '"' for word in words]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+class NoteIndex:
+    """Name, mtime and text of every note, kept in step with ``notes_dir``.
+
+    The connection is opened with ``check_same_thread=False`` so a sync can
+    run on a worker thread; a lock serialises access to it.
+    """
+
+    def __init__(self, notes_dir, db_path=None):
+        self.notes_dir = notes_dir
+        self.db_path = db_path or default_db_path(notes_dir)
+        os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(_SCHEMA)
+        try:
+            self.db.executescript(_FTS_SCHEMA)
+            self.fts = True
+        except sqlite3.OperationalError as e:
+            print(f"Full-text search unavailable, using substring search: {e}")
+            self.fts = False
+        self.db.commit()
+
+    def close(self):
+        with self.lock:
+            self.db.close()
+
+    # ---- keeping the index current ----
+
+    def scan(self):
+        """{name: (mtime_ns, size)} for every note on disk."""
+        found = {}
+        try:
+            entries = os.scandir(self.notes_dir)
+        except FileNotFoundError:
+            return found
+        with entries:
+            for entry in entries:
+                if entry.name.endswith(NOTE_SUFFIX) and entry.is_file():
+                    stat = entry.stat()
+                    found[entry.name] = (stat.st_mtime_ns, stat.st_size)
+        return found
+
+    def sync(self):
+        """Re-index changed notes and drop deleted ones; returns how many rows changed."""
+        on_disk = self.scan()
+        with self.lock:
+            known = {name: (mtime, size) for name, mtime, size
+                     in self.db.execute("SELECT name, mtime_ns, size FROM notes")}
+        changed = [name for name, stamp in on_disk.items() if known.get(name) != stamp]
+        removed = [name for name in known if name not in on_disk]
+        # Read outside the lock so searches stay responsive during a big first build
+        bodies = [(name, on_disk[name], self.read(name)) for name in changed]
+        with self.lock, self.db:
+            for name in removed:
+                self._delete(name)
+            for name, (mtime, size), body in bodies:
+                if body is not None:
+                    self._put(name, mtime, size, body)
+        return len(changed) + len(removed)
+
+    def update(self, name, body=None):
+        """Index one note right after it was written (or forget it if it is gone)."""
+        path = os.path.join(self.notes_dir, name)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            with self.lock, self.db:
+                self._delete(name)
+            return
+        if body is None:
+            body = self.read(name)
+        with self.lock, self.db:
+            self._put(name, stat.st_mtime_ns, stat.st_size, body or "")
+
+    def read(self, name):
+        try:
+            with open(os.path.join(self.notes_dir, name), "r", encoding="utf-8", errors="replace") as f:
+                return f.read()
+        except OSError as e:
+            print(f"Could not index note {name}: {e}")
+            return None
+
+    def _put(self, name, mtime, size, body):
+        row = self.db.execute("SELECT id, body FROM notes WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            note_id = self.db.execute("INSERT INTO notes (name, mtime_ns, size, body) VALUES (?, ?, ?, ?)",
+                                      (name, mtime, size, body)).lastrowid
+        else:
+            note_id, old_body = row
+            if self.fts:
+                # External-content tables are updated by deleting the old terms first
+                self.db.execute("INSERT INTO notes_fts (notes_fts, rowid, name, body) VALUES ('delete', ?, ?, ?)",
+                                (note_id, name, old_body))
+            self.db.execute("UPDATE notes SET mtime_ns = ?, size = ?, body = ? WHERE id = ?",
+                            (mtime, size, body, note_id))
+        if self.fts:
+            self.db.execute("INSERT INTO notes_fts (rowid, name, body) VALUES (?, ?, ?)", (note_id, name, body))
+
+    def _delete(self, name):
+        row = self.db.execute("SELECT id, body FROM notes WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            return
+        if self.fts:
+            self.db.execute("INSERT INTO notes_fts (notes_fts, rowid, name, body) VALUES ('delete', ?, ?, ?)",
+                            (row[0], name, row[1]))
+        self.db.execute("DELETE FROM notes WHERE id = ?", (row[0],))
+
+    # ---- queries ----
+
+    def names(self):
+        with self.lock:
+            return [name for name, in self.db.execute("SELECT name FROM notes ORDER BY name")]
+
+    def search(self, text, limit=100):
+        """[(name, snippet)] best match first; matched words are wrapped in [brackets]."""
+        if self.fts:
+            query = fts_query(text)
+            if query is None:
+                return []
+            sql = ("SELECT name, snippet(notes_fts, 1, '[', ']', '…', ?) FROM notes_fts "
+                   "WHERE notes_fts MATCH ? ORDER BY bm25(notes_fts, 5.0, 1.0) LIMIT ?")
+            with self.lock:
+                try:
+                    return self.db.execute(sql, (SNIPPET_TOKENS, query, limit)).fetchall()
+                except sqlite3.OperationalError as e:
+                    print(f"Search failed for {text!r}: {e}")
+                    return []
+        return self.substring_search(text, limit)
+
+    def substring_search(self, text, limit=100):
+        text = text.strip()
+        if not text:
+            return []
+        like = "%" + text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        with self.lock:
+            rows = self.db.execute(
+                "SELECT name, body FROM notes WHERE name LIKE ? ESCAPE '\\' OR body LIKE ? ESCAPE '\\' "
+                "ORDER BY name LIKE ? ESCAPE '\\' DESC, name LIMIT ?", (like, like, like, limit)).fetchall()
+        return [(name, make_snippet(body, text)) for name, body in rows]
+
+
+def make_snippet(body, text, width=60):
+    at = body.lower().find(text.lower())
+    if at < 0:
+        return body[:width].replace("\n", " ")
+    start = max(0, at - width // 2)
+    end = at + len(text)
+    snippet = body[start:at] + "[" + body[at:end] + "]" + body[end:end + width // 2]
+    return ("…" if start else "") + snippet.replace("\n", " ")
@@ -0,0 +1,181 @@
+# Copyright 2025 the FranchukOS project authors.
+# Contributed under the Apache License, Version 2.0.
+
+"""Live markdown preview for Notetaking.
+
+The note is split into blocks (headings, paragraphs, lists, quotes, code
+fences, rules) and each block is drawn into a Tk Text with tags for its
+styling. On every update only the run of blocks between the unchanged
+prefix and suffix is deleted and redrawn, so typing in a long note touches
+a few lines of the preview instead of the whole document.
+"""
+
+import re
+import tkinter as tk
+
+HEADING = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+LIST_ITEM = re.compile(r"^(\s*)([-*+]|\d+[.)])\s+(.*)$")
+RULE = re.compile(r"^\s*([-*_])(\s*\1){2,}\s*$")
+FENCE = re.compile(r"^\s*(```|~~~)")
+INLINE = re.compile(r"(\*\*.+?\*\*|__.+?__|`[^`]+`|\[[^\]]+\]\([^)]*\)|\*[^*\s][^*]*?\*|_[^_\s][^_]*?_)")
+
+
+def split_blocks(source):
+    """Cut markdown source into blocks; each block is a tuple of its lines."""
+    blocks = []
+    current = []
+    fence = None
+
+    def flush():
+        if current:
+            blocks.append(tuple(current))
+            current.clear()
+
+    for line in source.split("\n"):
+        if fence:
+            current.append(line)
+            if line.strip().startswith(fence):
+                fence = None
+                flush()
+            continue
+        match = FENCE.match(line)
+        if match:
+            flush()
+            fence = match.group(1)
+            current.append(line)
+        elif not line.strip():
+            flush()
+        elif HEADING.match(line) or RULE.match(line):
+            flush()
+            blocks.append((line,))
+        elif current and LIST_ITEM.match(line) and not LIST_ITEM.match(current[0]):
+            # a list starting right under a paragraph is a new block
+            flush()
+            current.append(line)
+        else:
+            current.append(line)
+    flush()
+    return blocks
+
+
+def inline_runs(text, tags=()):
+    """(text, tags) runs for one line of inline markdown."""
+    runs = []
+    pos = 0
+    for match in INLINE.finditer(text):
+        if match.start() > pos:
+            runs.append((text[pos:match.start()], tags))
+        token = match.group(0)
+        if token.startswith(("**", "__")):
+            runs.append((token[2:-2], tags + ("bold",)))
+        elif token.startswith("`"):
+            runs.append((token[1:-1], tags + ("code",)))
+        elif token.startswith("["):
+            label = token[1:token.index("]")]
+            runs.append((label, tags + ("link",)))
+        else:
+            runs.append((token[1:-1], tags + ("italic",)))
+        pos = match.end()
+    if pos < len(text):
+        runs.append((text[pos:], tags))
+    return runs
+
+
+def render_block(block):
+    """(text, tags) runs for a block, ending with the blank line that separates it from the next."""
+    first = block[0]
+    if FENCE.match(first):
+        body = block[1:-1] if len(block) > 1 and FENCE.match(block[-1]) else block[1:]
+        return [("\n".join(body) + "\n", ("codeblock",)), ("\n", ())]
+    match = HEADING.match(first)
+    if match:
+        level = f"h{len(match.group(1))}"
+        return inline_runs(match.group(2), (level,)) + [("\n\n", ())]
+    if RULE.match(first):
+        return [("─" * 40 + "\n\n", ("rule",))]
+    runs = []
+    if LIST_ITEM.match(first):
+        for line in block:
+            item = LIST_ITEM.match(line)
+            if item is None:
+                # a wrapped line continues the previous item
+                if runs:
+                    runs.pop()
+                runs += inline_runs(" " + line.strip(), ("item",))
+                runs.append(("\n", ()))
+                continue
+            indent, marker, text = item.groups()
+            bullet = marker if marker[0].isdigit() else "•"
+            depth = ("item2",) if len(indent.expandtabs(4)) >= 2 else ("item",)
+            runs.append((bullet + " ", depth))
+            runs += inline_runs(text, depth)
+            runs.append(("\n", ()))
+        return runs + [("\n", ())]
+    if first.lstrip().startswith(">"):
+        lines = [line.lstrip()[1:].strip() if line.lstrip().startswith(">") else line.strip() for line in block]
+        return inline_runs(" ".join(lines), ("quote",)) + [("\n\n", ())]
+    return inline_runs(" ".join(line.strip() for line in block)) + [("\n\n", ())]
+
+
+def changed_range(old, new):
+    """(prefix, old_end, new_end): ``old[prefix:old_end]`` became ``new[prefix:new_end]``."""
+    limit = min(len(old), len(new))
+    prefix = 0
+    while prefix < limit and old[prefix] == new[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < limit - prefix and old[-1 - suffix] == new[-1 - suffix]:
+        suffix += 1
+    return prefix, len(old) - suffix, len(new) - suffix
+
+
+class MarkdownPreview:
+    """Keeps a read-only Text widget showing ``source`` rendered, redrawing only changed blocks."""
+
+    def __init__(self, text):
+        self.text = text
+        self.blocks = []
+        self.heights = []  # lines each rendered block takes in the widget
+        self.configure_tags()
+        self.text.config(state=tk.DISABLED)
+
+    def configure_tags(self, fg="black", code_bg="#f3f3f3", link="#1a5fb4"):
+        family = "Arial"
+        sizes = {"h1": 22, "h2": 18, "h3": 15, "h4": 13, "h5": 12, "h6": 11}
+        for tag, size in sizes.items():
+            self.text.tag_configure(tag, font=(family, size, "bold"), spacing1=6, spacing3=2)
+        self.text.tag_configure("bold", font=(family, 11, "bold"))
+        self.text.tag_configure("italic", font=(family, 11, "italic"))
+        self.text.tag_configure("code", font=("Courier", 10), background=code_bg)
+        self.text.tag_configure("codeblock", font=("Courier", 10), background=code_bg, lmargin1=12, lmargin2=12)
+        self.text.tag_configure("link", foreground=link, underline=True)
+        self.text.tag_configure("quote", foreground="grey50", lmargin1=20, lmargin2=20,
+                                font=(family, 11, "italic"))
+        self.text.tag_configure("item", lmargin1=12, lmargin2=24)
+        self.text.tag_configure("item2", lmargin1=32, lmargin2=44)
+        self.text.tag_configure("rule", foreground="grey60")
+        self.text.config(fg=fg)
+
+    def update(self, source):
+        """Render ``source``; returns how many blocks were redrawn."""
+        blocks = split_blocks(source)
+        prefix, old_end, new_end = changed_range(self.blocks, blocks)
+        if prefix == old_end and prefix == new_end:
+            return 0
+        start_line = 1 + sum(self.heights[:prefix])
+        removed = sum(self.heights[prefix:old_end])
+        heights = []
+        args = []
+        for block in blocks[prefix:new_end]:
+            runs = render_block(block)
+            for chunk, tags in runs:
+                args += [chunk, tags]
+            heights.append(sum(chunk.count("\n") for chunk, _ in runs))
+        self.text.config(state=tk.NORMAL)
+        self.text.delete(f"{start_line}.0", f"{start_line + removed}.0")
+        if args:
+            self.text.insert(f"{start_line}.0", *args)
+        self.text.config(state=tk.DISABLED)
+        self.blocks = blocks
+        self.heights[prefix:old_end] = heights
+        return new_end - prefix
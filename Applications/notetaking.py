@@ -1,12 +1,24 @@
 import os
+import sys
 import json
+import threading
+import time
 import tkinter as tk
 from tkinter import filedialog, messagebox, scrolledtext
-import markdown
+
+# Run as a script from the repo root; make the repo packages importable
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Applications.note_history import MIN_REVISION_GAP, RevisionStore, atomic_write
+from Applications.note_index import NoteIndex
+from Applications.note_preview import MarkdownPreview
+from core.scheduler import get_scheduler
 
 APP_NAME = "Notetaking"
 NOTES_DIR = "notes"
 PINS_FILE = "pins.json"
+SEARCH_DELAY = 0.12  # seconds of typing quiet before the search runs
+PREVIEW_DELAY = 0.25  # seconds of typing quiet before the preview catches up
+AUTOSAVE_DELAY = 2.0  # seconds of typing quiet before the note is saved in the background
 os.makedirs(NOTES_DIR, exist_ok=True)
 
 # Load or create pin data
@@ -22,22 +34,51 @@ class NotetakingApp:
         self.root.title(APP_NAME)
         self.filename = None
         self.dark_mode = False
+        self.scheduler = get_scheduler(root)
+        self.index = NoteIndex(NOTES_DIR)
+        self.listed = []  # note filename behind each listbox row
+        self.search_job = None
+        self.preview_job = None
+        self.history = RevisionStore()
+        self.autosave_job = None
+        self.save_lock = threading.Lock()
+        self.save_count = 0  # orders saves so a slow older one never overwrites a newer one
+        self.saved = {}  # path -> number of the last save written to it
 
         # Sidebar
         self.sidebar = tk.Frame(root, width=200, bg="#f0f0f0")
         self.sidebar.pack(side=tk.LEFT, fill=tk.Y)
 
-        self.note_listbox = tk.Listbox(self.sidebar)
+        self.search_var = tk.StringVar()
+        self.search_var.trace_add("write", self.schedule_search)
+        self.search_entry = tk.Entry(self.sidebar, textvariable=self.search_var)
+        self.search_entry.pack(fill=tk.X, padx=5, pady=(5, 0))
+        self.search_entry.bind("<Escape>", lambda event: self.search_var.set(""))
+
+        self.note_listbox = tk.Listbox(self.sidebar, width=40)
         self.note_listbox.pack(fill=tk.BOTH, expand=1, padx=5, pady=5)
         self.note_listbox.bind("<<ListboxSelect>>", self.load_selected_note)
         self.note_listbox.bind("<Button-3>", self.right_click_note)
 
+        self.status = tk.Label(self.sidebar, text="", anchor="w", fg="grey40", bg="#f0f0f0")
+        self.status.pack(fill=tk.X, padx=5, pady=(0, 5))
+
+        # Show what the index knew last time right away, then catch up with the disk
         self.refresh_note_list()
+        self.scheduler.submit(self.index.sync, callback=self.on_index_synced)
 
-        # Text Area
-        self.text = tk.Text(root, undo=True, font=("Arial", 12))
-        self.text.pack(fill=tk.BOTH, expand=1, side=tk.LEFT)
+        # Text Area, with the markdown preview beside it when shown
+        self.panes = tk.PanedWindow(root, orient=tk.HORIZONTAL, sashwidth=4)
+        self.panes.pack(fill=tk.BOTH, expand=1, side=tk.LEFT)
+        self.text = tk.Text(self.panes, undo=True, font=("Arial", 12))
+        self.panes.add(self.text, stretch="always")
         self.text.edit_modified(False)
+        self.text.bind("<KeyRelease>", self.on_text_changed)
+
+        self.preview_text = scrolledtext.ScrolledText(self.panes, wrap=tk.WORD, font=("Arial", 11),
+                                                      padx=10, pady=8)
+        self.preview = MarkdownPreview(self.preview_text)
+        self.preview_shown = tk.BooleanVar(value=False)
 
         # Menu Bar
         menubar = tk.Menu(root)
@@ -47,12 +88,14 @@ class NotetakingApp:
         file_menu.add_command(label="Open...", command=self.open_note)
         file_menu.add_command(label="Save", command=self.save_note)
         file_menu.add_command(label="Save As...", command=self.save_note_as)
+        file_menu.add_command(label="History...", command=self.show_history)
         file_menu.add_separator()
         file_menu.add_command(label="Exit", command=self.exit_app)
         menubar.add_cascade(label="File", menu=file_menu)
 
         view_menu = tk.Menu(menubar, tearoff=0)
-        view_menu.add_command(label="Preview Markdown", command=self.preview_markdown)
+        view_menu.add_checkbutton(label="Preview Markdown", variable=self.preview_shown,
+                                  command=self.toggle_preview)
         view_menu.add_command(label="Toggle Dark Mode", command=self.toggle_dark_mode)
         menubar.add_cascade(label="View", menu=view_menu)
 
@@ -63,6 +106,7 @@ class NotetakingApp:
             self.text.delete(1.0, tk.END)
             self.filename = None
             self.root.title(f"{APP_NAME} - New Note")
+            self.on_text_changed()
 
     def open_note(self):
         if not self.confirm_unsaved():
@@ -75,11 +119,49 @@ class NotetakingApp:
     def save_note(self):
         if not self.filename:
             return self.save_note_as()
-        with open(self.filename, "w", encoding="utf-8") as file:
-            file.write(self.text.get(1.0, tk.END).rstrip())
-        self.text.edit_modified(False)
-        self.refresh_note_list()
-        messagebox.showinfo("Saved", "Note saved successfully!")
+        self.scheduler.cancel(self.autosave_job)
+        self.autosave_job = None
+        self.save_count += 1
+        self.on_saved(self.write_note(self.filename, self.note_body(), self.save_count, 0))
+
+    def autosave(self):
+        self.autosave_job = None
+        if self.filename and self.text.edit_modified():
+            self.save_count += 1
+            self.scheduler.submit(self.write_note, self.filename, self.note_body(), self.save_count,
+                                  MIN_REVISION_GAP, callback=self.on_saved)
+
+    def note_body(self):
+        return self.text.get(1.0, tk.END).rstrip()
+
+    def write_note(self, path, body, number, min_gap):
+        """Write, index and record a revision; runs on a worker thread for autosaves."""
+        with self.save_lock:
+            if number < self.saved.get(path, 0):
+                return None
+            try:
+                atomic_write(path, body)
+            except OSError as e:
+                print(f"Could not save {path}: {e}")
+                return None
+            self.saved[path] = number
+            if os.path.dirname(os.path.abspath(path)) == os.path.abspath(NOTES_DIR):
+                self.index.update(os.path.basename(path), body)
+            try:
+                self.history.add(path, body, min_gap)
+            except OSError as e:
+                print(f"Could not record a revision of {path}: {e}")
+        return path, body
+
+    def on_saved(self, result):
+        if result is None:
+            return
+        path, body = result
+        if path == self.filename and self.note_body() == body:
+            self.text.edit_modified(False)
+        self.status.config(text=f"Saved {time.strftime('%H:%M:%S')}")
+        if os.path.basename(path) not in self.listed or self.search_var.get().strip():
+            self.refresh_note_list()
 
     def save_note_as(self):
         path = filedialog.asksaveasfilename(initialdir=NOTES_DIR, defaultextension=".txt",
@@ -88,12 +170,70 @@ class NotetakingApp:
             self.filename = path
             self.save_note()
 
+    def show_history(self):
+        if not self.filename:
+            messagebox.showinfo("History", "Save the note first to start its history.")
+            return
+        path = self.filename
+        ordered = self.history.revisions(path)
+        revisions = ordered[::-1]  # newest first
+        if not revisions:
+            messagebox.showinfo("History", "This note has no saved revisions yet.")
+            return
+
+        win = tk.Toplevel(self.root)
+        win.title(f"History - {os.path.basename(path)}")
+        win.geometry("760x480")
+        listbox = tk.Listbox(win, width=32)
+        listbox.pack(side=tk.LEFT, fill=tk.Y, padx=5, pady=5)
+        right = tk.Frame(win)
+        right.pack(side=tk.LEFT, fill=tk.BOTH, expand=1)
+        preview = scrolledtext.ScrolledText(right, wrap=tk.WORD, font=("Arial", 11), state=tk.DISABLED)
+        preview.pack(fill=tk.BOTH, expand=1, padx=5, pady=5)
+        for revision in revisions:
+            stamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(revision.timestamp))
+            listbox.insert(tk.END, f"{stamp}  ({revision.size} chars)")
+        chosen = {}
+
+        def show(event=None):
+            selection = listbox.curselection()
+            if not selection:
+                return
+            revision = revisions[selection[0]]
+            chosen["text"] = self.history.load(path, revision.number, ordered)
+            preview.config(state=tk.NORMAL)
+            preview.delete(1.0, tk.END)
+            preview.insert(tk.END, chosen["text"])
+            preview.config(state=tk.DISABLED)
+
+        def restore():
+            if "text" not in chosen or self.filename != path:
+                return
+            # One undo step brings the current text back
+            self.text.edit_separator()
+            self.text.delete(1.0, tk.END)
+            self.text.insert(tk.END, chosen["text"])
+            self.text.edit_separator()
+            self.text.edit_modified(True)
+            self.on_text_changed()
+            win.destroy()
+
+        listbox.bind("<<ListboxSelect>>", show)
+        tk.Button(right, text="Restore This Version", command=restore).pack(side=tk.RIGHT, padx=5, pady=5)
+        listbox.selection_set(0)
+        show()
+
     def exit_app(self):
         if self.confirm_unsaved():
             self.save_pins()
+            self.scheduler.shutdown()
+            self.index.close()
             self.root.destroy()
 
     def confirm_unsaved(self):
+        if self.text.edit_modified() and self.filename:
+            # Named notes are autosaved anyway; just flush what is pending
+            self.save_note()
         if self.text.edit_modified():
             result = messagebox.askyesnocancel("Unsaved Changes", "Save changes before closing?")
             if result:
@@ -106,23 +246,45 @@ class NotetakingApp:
         return True
 
     def refresh_note_list(self):
+        """Fill the sidebar from the index: search matches if there is a query, else every note."""
+        query = self.search_var.get().strip()
+        if query:
+            results = self.index.search(query)
+            self.listed = [name for name, _ in results]
+            labels = [f"{name}  {snippet}" for name, snippet in results]
+        else:
+            notes = self.index.names()
+            present = set(notes)
+            pinned = [n for n in pinned_notes if n in present]
+            self.listed = pinned + [n for n in notes if n not in pinned]
+            labels = [f"📌 {note}" if i < len(pinned) else note for i, note in enumerate(self.listed)]
         self.note_listbox.delete(0, tk.END)
-        notes = sorted([f for f in os.listdir(NOTES_DIR) if f.endswith(".txt")])
-        pinned = [n for n in pinned_notes if n in notes]
-        unpinned = [n for n in notes if n not in pinned]
-        for note in pinned + unpinned:
-            label = f"📌 {note}" if note in pinned else note
-            self.note_listbox.insert(tk.END, label)
+        if labels:
+            self.note_listbox.insert(tk.END, *labels)
+
+    def on_index_synced(self, changed):
+        if changed:
+            self.refresh_note_list()
+
+    def schedule_search(self, *args):
+        self.scheduler.cancel(self.search_job)
+        self.search_job = self.scheduler.call_later(SEARCH_DELAY, self.refresh_note_list, name="note search")
 
     def load_selected_note(self, event):
+        index = self.note_listbox.curselection()
+        if not index:
+            return
+        # resolve the click first: saving below can re-rank the search results under it
+        name = self.listed[index[0]]
         if not self.confirm_unsaved():
             return
-        index = self.note_listbox.curselection()
-        if index:
-            label = self.note_listbox.get(index[0])
-            filename = label.replace("📌 ", "")
-            path = os.path.join(NOTES_DIR, filename)
+        path = os.path.join(NOTES_DIR, name)
+        if os.path.exists(path):
             self.load_note(path)
+        else:
+            # deleted behind our back; bring the index up to date
+            self.index.update(name)
+            self.refresh_note_list()
 
     def load_note(self, path):
         with open(path, "r", encoding="utf-8") as file:
@@ -131,17 +293,26 @@ class NotetakingApp:
         self.filename = path
         self.text.edit_modified(False)
         self.root.title(f"{APP_NAME} - {os.path.basename(path)}")
+        self.on_text_changed()
 
-    def preview_markdown(self):
-        html = markdown.markdown(self.text.get(1.0, tk.END))
-        preview_win = tk.Toplevel(self.root)
-        preview_win.title("Markdown Preview")
-        preview_win.geometry("600x500")
+    def toggle_preview(self):
+        if self.preview_shown.get():
+            self.panes.add(self.preview_text, stretch="always")
+            self.refresh_preview()
+        else:
+            self.panes.forget(self.preview_text)
+
+    def on_text_changed(self, event=None):
+        if self.filename and self.text.edit_modified():
+            self.scheduler.cancel(self.autosave_job)
+            self.autosave_job = self.scheduler.call_later(AUTOSAVE_DELAY, self.autosave, name="note autosave")
+        if self.preview_shown.get():
+            self.scheduler.cancel(self.preview_job)
+            self.preview_job = self.scheduler.call_later(PREVIEW_DELAY, self.refresh_preview, name="note preview")
 
-        preview_text = scrolledtext.ScrolledText(preview_win, wrap=tk.WORD, font=("Arial", 11))
-        preview_text.pack(fill=tk.BOTH, expand=1)
-        preview_text.insert(tk.END, html)
-        preview_text.config(state=tk.DISABLED)
+    def refresh_preview(self):
+        self.preview_job = None
+        self.preview.update(self.text.get(1.0, "end-1c"))
 
     def toggle_dark_mode(self):
         self.dark_mode = not self.dark_mode
@@ -150,15 +321,20 @@ class NotetakingApp:
         sb_bg = "#2e2e2e" if self.dark_mode else "#f0f0f0"
 
         self.text.config(bg=bg, fg=fg, insertbackground=fg)
+        self.preview_text.config(bg=bg)
+        self.preview.configure_tags(fg=fg, code_bg="#2b2b2b" if self.dark_mode else "#f3f3f3",
+                                    link="#8ab4f8" if self.dark_mode else "#1a5fb4")
         self.sidebar.config(bg=sb_bg)
+        self.status.config(bg=sb_bg)
         self.note_listbox.config(bg=bg, fg=fg, selectbackground="#444")
 
     def right_click_note(self, event):
         index = self.note_listbox.nearest(event.y)
         self.note_listbox.selection_clear(0, tk.END)
         self.note_listbox.selection_set(index)
-        label = self.note_listbox.get(index)
-        filename = label.replace("📌 ", "")
+        if index >= len(self.listed):
+            return
+        filename = self.listed[index]
 
         menu = tk.Menu(self.root, tearoff=0)
         if filename in pinned_notes:
@@ -6,7 +6,8 @@ from tkinter import ttk, filedialog, messagebox
 from Graphics.utils import set_background_color, set_background_image
 from config.manager import load_config, save_config
 from core.thememanage import apply_theme
-from PIL import Image, ImageTk
+from Graphics.wallpaper import WallpaperCache
+from PIL import ImageTk
 
 
 OS_VERSION = "37.5.0 (Teton) - Stable Release"
@@ -23,8 +24,8 @@ class SettingsApp:
         wallpaper = self.config.get("wallpaper", "assets/backgrounds/wallpaper.jpg")
         if not (wallpaper.startswith("#") or wallpaper in ["black", "white", "gray", "grey"]):
             try:
-                wallpaper_img = Image.open(wallpaper)
-                wallpaper_img = wallpaper_img.resize((700, 600), Image.LANCZOS)
+                # Same disk cache the desktop uses, so reopening Settings skips the resize
+                wallpaper_img = WallpaperCache().load(wallpaper, (700, 600))
                 self.wallpaper_photo = ImageTk.PhotoImage(wallpaper_img)
                 self.wallpaper_label = tk.Label(self.root, image=self.wallpaper_photo)
                 self.wallpaper_label.place(x=0, y=0, relwidth=1, relheight=1)
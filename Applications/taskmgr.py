@@ -7,10 +7,318 @@ from tkinter import ttk
 import psutil
 import threading
 import time
-from collections import deque
+import numpy as np
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.figure import Figure
 
+from core.scheduler import get_scheduler
+
+PROCESS_COLUMNS = ("PID", "Name", "CPU", "Memory")
+PROCESS_INTERVAL = 2.0  # seconds between process snapshots
+
+# Row layout is (pid, name, cpu, memory); these give each column's sort key
+SORT_KEYS = {
+    "PID": lambda row: row[0],
+    "Name": lambda row: (row[1].lower(), row[0]),
+    "CPU": lambda row: (row[2], row[0]),
+    "Memory": lambda row: (row[3], row[0]),
+}
+
+
+def take_snapshot():
+    """Sample every process once and return {pid: (pid, name, cpu, memory)}.
+
+    Values are rounded to what the table shows, so a process whose numbers
+    didn't visibly change diffs as unchanged.
+    """
+    snapshot = {}
+    for proc in psutil.process_iter():
+        try:
+            # one syscall batch per process instead of one per attribute
+            with proc.oneshot():
+                snapshot[proc.pid] = (
+                    proc.pid,
+                    proc.name()[:32],
+                    round(proc.cpu_percent(), 1),
+                    round(proc.memory_percent(), 1),
+                )
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            continue
+    return snapshot
+
+
+def diff_snapshots(old, new):
+    """Return (inserts, updates, removes) turning snapshot ``old`` into ``new``."""
+    inserts = {pid: row for pid, row in new.items() if pid not in old}
+    updates = {pid: row for pid, row in new.items() if pid in old and old[pid] != row}
+    removes = [pid for pid in old if pid not in new]
+    return inserts, updates, removes
+
+
+class ProcessSampler:
+    """Takes process snapshots on a background thread.
+
+    Each snapshot is diffed against the previous one and only the changes
+    are handed to ``on_diff(inserts, updates, removes)`` through
+    ``dispatch``, which puts the call on the Tk thread.
+    """
+
+    def __init__(self, dispatch, on_diff, interval=PROCESS_INTERVAL):
+        self.dispatch = dispatch
+        self.on_diff = on_diff
+        self.interval = interval
+        self.stop_event = threading.Event()
+        self.previous = {}
+        self.thread = threading.Thread(target=self.run, name="process sampler", daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+
+    def run(self):
+        while not self.stop_event.is_set():
+            try:
+                snapshot = take_snapshot()
+            except Exception as e:
+                print(f"Process sampling failed: {e}")
+            else:
+                inserts, updates, removes = diff_snapshots(self.previous, snapshot)
+                self.previous = snapshot
+                if inserts or updates or removes:
+                    self.dispatch(self.on_diff, inserts, updates, removes)
+            self.stop_event.wait(self.interval)
+
+
+METRICS_INTERVAL = 1.0  # seconds between metric samples
+
+# (label, seconds per point, points kept): 1 minute at 1 s, 1 hour at 10 s,
+# 24 hours at 4 min. Coarser levels are filled by averaging finer samples.
+RESOLUTIONS = (
+    ("1 minute", 1, 60),
+    ("1 hour", 10, 360),
+    ("24 hours", 240, 360),
+)
+
+
+class RingBuffer:
+    """Fixed-size time series of ``width`` float32 columns."""
+
+    def __init__(self, capacity, width):
+        self.capacity = capacity
+        self.times = np.zeros(capacity, dtype=np.float64)
+        self.values = np.zeros((capacity, width), dtype=np.float32)
+        self.head = 0
+        self.count = 0
+
+    def append(self, t, row):
+        self.times[self.head] = t
+        self.values[self.head] = row
+        self.head = (self.head + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def snapshot(self):
+        """Return (times, values) in chronological order."""
+        if self.count < self.capacity:
+            return self.times[:self.count].copy(), self.values[:self.count].copy()
+        order = np.r_[self.head:self.capacity, 0:self.head]
+        return self.times[order], self.values[order]
+
+
+class MetricSeries:
+    """One metric kept at every resolution in ``RESOLUTIONS``.
+
+    Raw samples go into the finest buffer; each coarser level averages the
+    samples that fall into its bucket and appends one point when the bucket
+    closes, so a 24 hour view costs 360 points rather than 86,400.
+    """
+
+    def __init__(self, width, resolutions=RESOLUTIONS):
+        self.width = width
+        self.levels = [(label, step, RingBuffer(points, width)) for label, step, points in resolutions]
+        self.pending = [None] * len(self.levels)  # (bucket, sum, count) per level
+
+    def append(self, t, row):
+        row = np.asarray(row, dtype=np.float32)
+        # the finest level keeps raw samples so the live view has no lag
+        self.levels[0][2].append(t, row)
+        for i, (_, step, buffer) in enumerate(self.levels[1:], start=1):
+            bucket = int(t // step)
+            pending = self.pending[i]
+            if pending is not None and pending[0] != bucket:
+                _, total, count = pending
+                buffer.append((pending[0] + 1) * step, total / count)
+                pending = None
+            if pending is None:
+                self.pending[i] = (bucket, row.copy(), 1)
+            else:
+                self.pending[i] = (bucket, pending[1] + row, pending[2] + 1)
+
+    def window(self, label):
+        for level_label, _, buffer in self.levels:
+            if level_label == label:
+                return buffer.snapshot()
+        raise KeyError(label)
+
+
+class RateCounter:
+    """Turns cumulative counters into per-second rates."""
+
+    def __init__(self):
+        self.last = None
+
+    def update(self, t, counters):
+        counters = np.asarray(counters, dtype=np.float64)
+        if self.last is None:
+            self.last = (t, counters)
+            return np.zeros_like(counters)
+        last_t, last_counters = self.last
+        self.last = (t, counters)
+        # counters can reset (interface down, driver reload); never report negative rates
+        return np.maximum(counters - last_counters, 0) / max(t - last_t, 1e-6)
+
+
+class MetricsStore:
+    """Ring-buffered CPU, memory, network and disk history."""
+
+    def __init__(self, cores, nics):
+        self.cores = cores
+        self.nics = list(nics)
+        self.lock = threading.Lock()
+        self.series = {
+            "cpu": MetricSeries(cores),
+            "memory": MetricSeries(1),
+            "net": MetricSeries(2 * len(self.nics)),  # sent, received per NIC
+            "disk": MetricSeries(2),  # read, write
+        }
+        self.net_rates = RateCounter()
+        self.disk_rates = RateCounter()
+        self.latest = {}
+
+    def sample(self):
+        t = time.time()
+        cpu = psutil.cpu_percent(percpu=True)
+        mem = psutil.virtual_memory()
+        pernic = psutil.net_io_counters(pernic=True)
+        net = []
+        for nic in self.nics:
+            counters = pernic.get(nic)
+            net.extend((counters.bytes_sent, counters.bytes_recv) if counters else (0, 0))
+        io = psutil.disk_io_counters()
+        disk = (io.read_bytes, io.write_bytes) if io else (0, 0)
+        self.record(t, cpu, mem, self.net_rates.update(t, net), self.disk_rates.update(t, disk))
+
+    def record(self, t, cpu, mem, net_rates, disk_rates):
+        with self.lock:
+            self.series["cpu"].append(t, cpu[:self.cores])
+            self.series["memory"].append(t, [mem.percent])
+            if self.nics:
+                self.series["net"].append(t, net_rates)
+            self.series["disk"].append(t, disk_rates)
+            self.latest = {"time": t, "cpu": cpu, "memory": mem, "net": net_rates, "disk": disk_rates}
+
+    def window(self, name, label):
+        with self.lock:
+            return self.series[name].window(label)
+
+
+class MetricsSampler(threading.Thread):
+    """Feeds the MetricsStore once a second and notifies the Tk thread."""
+
+    def __init__(self, store, dispatch, on_sample, interval=METRICS_INTERVAL):
+        super().__init__(name="metrics sampler", daemon=True)
+        self.store = store
+        self.dispatch = dispatch
+        self.on_sample = on_sample
+        self.interval = interval
+        self.stop_event = threading.Event()
+
+    def stop(self):
+        self.stop_event.set()
+
+    def run(self):
+        while not self.stop_event.is_set():
+            try:
+                self.store.sample()
+            except Exception as e:
+                print(f"Metrics sampling failed: {e}")
+            else:
+                self.dispatch(self.on_sample)
+            self.stop_event.wait(self.interval)
+
+
+class BlitChart:
+    """Line chart that redraws only its lines between full draws.
+
+    The axes, grid and labels are drawn once and cached as a background;
+    each update restores that background and blits the lines on top. A full
+    redraw only happens when the window or the y range changes.
+    """
+
+    def __init__(self, parent, title, ylabel, labels, ylim=None, scale=1.0):
+        self.fixed_ylim = ylim
+        self.scale = scale
+        self.window_label = RESOLUTIONS[0][0]
+        self.window_var = tk.StringVar(value=self.window_label)
+        bar = ttk.Frame(parent)
+        bar.pack(fill=tk.X, padx=10)
+        ttk.OptionMenu(bar, self.window_var, self.window_label, *[r[0] for r in RESOLUTIONS],
+                       command=self.set_window).pack(side=tk.RIGHT)
+
+        self.fig = Figure(figsize=(5, 2.5), dpi=100)
+        self.ax = self.fig.add_subplot(111)
+        self.lines = [self.ax.plot([], [], label=label, animated=True)[0] for label in labels]
+        self.ax.set_title(title)
+        self.ax.set_xlabel("Seconds ago")
+        self.ax.set_ylabel(ylabel)
+        self.ax.grid(True, linestyle='--', alpha=0.5)
+        if len(labels) <= 8:
+            self.ax.legend(loc='upper left', fontsize=8)
+        self.ymax = ylim[1] if ylim else 1.0
+        self.ax.set_ylim(*(ylim or (0, self.ymax)))
+        self.set_xlim()
+
+        self.canvas = FigureCanvasTkAgg(self.fig, master=parent)
+        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        self.background = None
+        self.canvas.mpl_connect("draw_event", self.on_draw)
+
+    def set_xlim(self):
+        span = next(step * points for label, step, points in RESOLUTIONS if label == self.window_label)
+        self.ax.set_xlim(-span, 0)
+
+    def set_window(self, label):
+        self.window_label = label
+        self.set_xlim()
+        self.canvas.draw_idle()
+
+    def on_draw(self, event):
+        self.background = self.canvas.copy_from_bbox(self.fig.bbox)
+        for line in self.lines:
+            self.ax.draw_artist(line)
+
+    def update(self, times, values, now):
+        x = times - now
+        values = values / self.scale
+        for i, line in enumerate(self.lines):
+            line.set_data(x, values[:, i] if len(values) else [])
+        if self.fixed_ylim is None and len(values):
+            # grow quickly, shrink only when the data falls well below the top
+            peak = float(values.max())
+            if peak > self.ymax or peak < self.ymax / 4:
+                self.ymax = max(peak * 1.25, 1.0)
+                self.ax.set_ylim(0, self.ymax)
+                self.background = None
+        if self.background is None:
+            self.canvas.draw_idle()
+            return
+        self.canvas.restore_region(self.background)
+        for line in self.lines:
+            self.ax.draw_artist(line)
+        self.canvas.blit(self.fig.bbox)
+
+
 class TaskManager:
     def __init__(self):
         self.root = tk.Tk()
@@ -29,16 +337,21 @@ class TaskManager:
         self.notebook = ttk.Notebook(self.root)
         self.notebook.pack(fill=tk.BOTH, expand=True, padx=8, pady=8)
 
+        nics = [nic for nic in psutil.net_io_counters(pernic=True) if not nic.startswith("lo")]
+        self.metrics = MetricsStore(psutil.cpu_count() or 1, nics)
+
         self.setup_cpu_tab()
         self.setup_memory_tab()
         self.setup_process_tab()
         self.setup_network_tab()
         self.setup_disk_tab()
 
-        self.cpu_data = deque(maxlen=60)
-        self.last_process_update = 0
-
-        self.update_data()
+        self.scheduler = get_scheduler(self.root)
+        self.process_sampler = ProcessSampler(self.scheduler.call_soon_threadsafe, self.apply_process_diff)
+        self.process_sampler.start()
+        self.metrics_sampler = MetricsSampler(self.metrics, self.scheduler.call_soon_threadsafe, self.update_data)
+        self.metrics_sampler.start()
+        self.root.bind("<Destroy>", self.on_destroy, add="+")
 
     def setup_cpu_tab(self):
         self.cpu_frame = ttk.Frame(self.notebook)
@@ -50,19 +363,8 @@ class TaskManager:
         self.cpu_progress = ttk.Progressbar(self.cpu_frame, orient='horizontal', length=400, mode='determinate')
         self.cpu_progress.pack(pady=(0, 10))
 
-        self.cpu_fig = Figure(figsize=(5, 2.5), dpi=100)
-        self.cpu_ax = self.cpu_fig.add_subplot(111)
-        self.cpu_usage_line, = self.cpu_ax.plot([], [], label="CPU Usage (%)", color='#0078d7')
-        self.cpu_ax.set_ylim(0, 100)
-        self.cpu_ax.set_xlim(0, 60)
-        self.cpu_ax.set_title("CPU Usage (Last 60s)")
-        self.cpu_ax.set_xlabel("Time (s)")
-        self.cpu_ax.set_ylabel("Usage (%)")
-        self.cpu_ax.grid(True, linestyle='--', alpha=0.5)
-        self.cpu_ax.legend(loc='upper right')
-
-        self.cpu_canvas = FigureCanvasTkAgg(self.cpu_fig, master=self.cpu_frame)
-        self.cpu_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        cores = [f"Core {i}" for i in range(self.metrics.cores)]
+        self.cpu_chart = BlitChart(self.cpu_frame, "CPU Usage per Core", "Usage (%)", cores, ylim=(0, 100))
 
     def setup_memory_tab(self):
         self.memory_frame = ttk.Frame(self.notebook)
@@ -74,15 +376,23 @@ class TaskManager:
         self.memory_progress = ttk.Progressbar(self.memory_frame, orient='horizontal', length=400, mode='determinate')
         self.memory_progress.pack(pady=(0, 10))
 
+        self.memory_chart = BlitChart(self.memory_frame, "Memory Usage", "Usage (%)", ["Memory (%)"], ylim=(0, 100))
+
     def setup_process_tab(self):
         self.process_frame = ttk.Frame(self.notebook)
         self.notebook.add(self.process_frame, text="Processes")
 
-        columns = ("PID", "Name", "CPU", "Memory")
-        self.process_tree = ttk.Treeview(self.process_frame, columns=columns, show='headings', selectmode='browse')
-        for col in columns:
-            self.process_tree.heading(col, text=col)
+        self.process_tree = ttk.Treeview(self.process_frame, columns=PROCESS_COLUMNS, show='headings', selectmode='browse')
+        for col in PROCESS_COLUMNS:
+            self.process_tree.heading(col, text=col, command=lambda c=col: self.sort_processes(c))
             self.process_tree.column(col, anchor='center', width=120 if col != "Name" else 260)
+
+        # Rows are keyed by PID and only touched when their process changes
+        self.process_rows = {}
+        self.row_stripes = {}
+        self.sort_column = "CPU"
+        self.sort_reverse = True
+        self.update_sort_headings()
         self.process_tree.pack(fill=tk.BOTH, expand=True, padx=8, pady=8)
 
         # Add striped rows
@@ -99,55 +409,111 @@ class TaskManager:
         self.notebook.add(self.network_frame, text="Network")
         self.network_label = ttk.Label(self.network_frame, text="Loading network usage...", font=('Segoe UI', 12, 'bold'))
         self.network_label.pack(pady=10)
+        labels = [f"{nic} {direction}" for nic in self.metrics.nics for direction in ("sent", "received")]
+        self.network_chart = BlitChart(self.network_frame, "Network Throughput", "KB/s", labels, scale=1024)
 
     def setup_disk_tab(self):
         self.disk_frame = ttk.Frame(self.notebook)
         self.notebook.add(self.disk_frame, text="Disk")
         self.disk_label = ttk.Label(self.disk_frame, text="Loading disk usage...", font=('Segoe UI', 12, 'bold'))
         self.disk_label.pack(pady=10)
+        self.disk_chart = BlitChart(self.disk_frame, "Disk IO", "MB/s", ["Read", "Write"], scale=1024 ** 2)
 
     def update_data(self):
+        """Refresh the labels and the chart on the visible tab from the latest sample."""
+        latest = self.metrics.latest
+        if not latest:
+            return
+        now = latest["time"]
+        visible = self.notebook.nametowidget(self.notebook.select())
+
         # CPU
-        cpu_percent = psutil.cpu_percent(interval=None)
+        cpu_percent = sum(latest["cpu"]) / max(len(latest["cpu"]), 1)
         self.cpu_label.config(text=f"CPU Usage: {cpu_percent:.1f}%")
         self.cpu_progress['value'] = cpu_percent
-        self.cpu_data.append(cpu_percent)
-        self.cpu_usage_line.set_data(range(len(self.cpu_data)), list(self.cpu_data))
-        self.cpu_ax.set_xlim(0, 60)
-        self.cpu_canvas.draw_idle()
 
         # Memory
-        mem = psutil.virtual_memory()
+        mem = latest["memory"]
         self.memory_label.config(text=f"Memory Usage: {mem.percent:.1f}% ({mem.used // (1024 ** 2)}MB / {mem.total // (1024 ** 2)}MB)")
         self.memory_progress['value'] = mem.percent
 
-        # Processes (update every 2 seconds)
-        now = time.time()
-        if now - self.last_process_update > 2:
-            for row in self.process_tree.get_children():
-                self.process_tree.delete(row)
-            for i, proc in enumerate(psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_percent'])):
-                tag = 'evenrow' if i % 2 == 0 else 'oddrow'
-                try:
-                    self.process_tree.insert('', tk.END, values=(
-                        proc.info['pid'],
-                        proc.info['name'][:32],
-                        f"{proc.info['cpu_percent']:.1f}",
-                        f"{proc.info['memory_percent']:.1f}"
-                    ), tags=(tag,))
-                except Exception:
-                    continue
-            self.last_process_update = now
-
         # Network
-        net = psutil.net_io_counters()
-        self.network_label.config(text=f"Sent: {net.bytes_sent // (1024 ** 2)} MB | Received: {net.bytes_recv // (1024 ** 2)} MB")
+        net = latest["net"]
+        self.network_label.config(text=f"Sent: {net[0::2].sum() / 1024:.1f} KB/s | Received: {net[1::2].sum() / 1024:.1f} KB/s")
 
         # Disk
         disk = psutil.disk_usage('/')
-        self.disk_label.config(text=f"Disk Usage: {disk.percent:.1f}% ({disk.used // (1024 ** 3)}GB / {disk.total // (1024 ** 3)}GB)")
+        read, write = latest["disk"] / (1024 ** 2)
+        self.disk_label.config(text=f"Disk Usage: {disk.percent:.1f}% ({disk.used // (1024 ** 3)}GB / {disk.total // (1024 ** 3)}GB) | Read {read:.1f} MB/s | Write {write:.1f} MB/s")
+
+        # Only the chart on screen is redrawn
+        charts = {
+            self.cpu_frame: ("cpu", self.cpu_chart),
+            self.memory_frame: ("memory", self.memory_chart),
+            self.network_frame: ("net", self.network_chart),
+            self.disk_frame: ("disk", self.disk_chart),
+        }
+        if visible in charts:
+            name, chart = charts[visible]
+            times, values = self.metrics.window(name, chart.window_label)
+            chart.update(times, values, now)
+
+    def on_destroy(self, event):
+        if event.widget is self.root:
+            self.process_sampler.stop()
+            self.metrics_sampler.stop()
+
+    def apply_process_diff(self, inserts, updates, removes):
+        tree = self.process_tree
+        for pid in removes:
+            self.process_rows.pop(pid, None)
+            self.row_stripes.pop(pid, None)
+            if tree.exists(str(pid)):
+                tree.delete(str(pid))
+        for pid, row in updates.items():
+            self.process_rows[pid] = row
+            tree.item(str(pid), values=self.format_process_row(row))
+        for pid, row in inserts.items():
+            self.process_rows[pid] = row
+            tree.insert('', tk.END, iid=str(pid), values=self.format_process_row(row))
+        self.reorder_processes()
+
+    def format_process_row(self, row):
+        pid, name, cpu, memory = row
+        return (pid, name, f"{cpu:.1f}", f"{memory:.1f}")
+
+    def sort_processes(self, column):
+        if column == self.sort_column:
+            self.sort_reverse = not self.sort_reverse
+        else:
+            self.sort_column = column
+            self.sort_reverse = column in ("CPU", "Memory")
+        self.update_sort_headings()
+        self.reorder_processes()
+
+    def update_sort_headings(self):
+        arrow = " ▼" if self.sort_reverse else " ▲"
+        for col in PROCESS_COLUMNS:
+            self.process_tree.heading(col, text=col + (arrow if col == self.sort_column else ""))
 
-        self.root.after_idle(lambda: self.root.after(1000, self.update_data))
+    def reorder_processes(self):
+        """Sort the sampled rows and move only the tree items that are out of place."""
+        tree = self.process_tree
+        key = SORT_KEYS[self.sort_column]
+        order = sorted(self.process_rows.values(), key=key, reverse=self.sort_reverse)
+        # Mirror the tree's order locally so each check is free; only rows
+        # whose position really changed cost a Tk call.
+        current = list(tree.get_children())
+        for index, row in enumerate(order):
+            iid = str(row[0])
+            if current[index] != iid:
+                current.remove(iid)
+                current.insert(index, iid)
+                tree.move(iid, '', index)
+            stripe = 'evenrow' if index % 2 == 0 else 'oddrow'
+            if self.row_stripes.get(row[0]) != stripe:
+                self.row_stripes[row[0]] = stripe
+                tree.item(iid, tags=(stripe,))
 
     def run(self):
         self.root.mainloop()
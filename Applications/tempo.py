@@ -1,37 +1,35 @@
+import os
+import sys
 import tkinter as tk
-from tkinter import filedialog
-import pygame
-from time import time, sleep
-import threading
+from tkinter import filedialog, simpledialog
+from time import time
 import json
 import itertools
 
+# Run as a script from the repo root; make the engine module importable
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Applications.tempo_engine import (DRUMS, NOTES, AudioScheduler, BitPattern, Pattern, SampleBank, Song, SongPlayer,
+                                       XorUndo, render_pattern, render_song, write_wav)
+from core.scheduler import get_scheduler
+
 APP_NAME = "Tempo"
 VERSION = "1.0.0"
+MAX_STEPS = 64
 
-pygame.mixer.init()
-# why did i do it like this
-notes = {
-    "C": "Applications/sounds/C.aiff",
-    "D": "Applications/sounds/D.aiff",
-    "E": "Applications/sounds/E.aiff",
-    "F": "Applications/sounds/F.aiff",
-    "G": "Applications/sounds/G.aiff",
-    "A": "Applications/sounds/A.aiff",
-    "B": "Applications/sounds/B.aiff",
-}
-
-drums = {
-    "Kick": "Applications/sounds/kick.wav",
-    "Snare": "Applications/sounds/snare.wav",
-    "HiHat": "Applications/sounds/hihat.wav"
-}
+notes = dict(NOTES)
+drums = dict(DRUMS)
 
 all_sounds = {**notes, **drums}
 rows = list(all_sounds.keys())
-steps = 16
 
-grid = [[0 for _ in range(steps)] for _ in range(len(rows))]
+# Every sound is decoded once here; playback never touches the files again
+bank = SampleBank(all_sounds).load()
+
+# The song holds every pattern as bitmasks; the grid buttons show one of them
+song = Song(rows)
+current = 0  # index of the pattern being edited
+song_mode = False
+history = XorUndo()
 sequence = []  # live recording
 note_volumes = {note: 1.0 for note in notes}
 master_volume = 1.0
@@ -44,55 +42,49 @@ key_bindings = {
     "q": "Kick", "w": "Snare", "e": "HiHat"
 }
 
-# --- Undo/Redo stacks ---
-undo_stack = []
-redo_stack = []
-
-def push_undo():
-    undo_stack.append(json.dumps(grid))
-    if len(undo_stack) > 50:
-        undo_stack.pop(0)
+# --- Undo/Redo: XOR deltas, applying one again reverts it ---
+def edit(delta):
+    history.record(delta)
+    show_delta(delta)
 
 def undo():
-    if undo_stack:
-        redo_stack.append(json.dumps(grid))
-        prev = undo_stack.pop()
-        loaded_grid = json.loads(prev)
-        for r in range(len(rows)):
-            for c in range(steps):
-                grid[r][c] = loaded_grid[r][c]
-                update_button_color(r, c)
+    delta = history.undo(song)
+    if delta:
+        show_delta(delta)
 
 def redo():
-    if redo_stack:
-        push_undo()
-        next_grid = json.loads(redo_stack.pop())
-        for r in range(len(rows)):
-            for c in range(steps):
-                grid[r][c] = next_grid[r][c]
+    delta = history.redo(song)
+    if delta:
+        show_delta(delta)
+
+def show_delta(delta):
+    """Bring the grid up to date after ``delta``, touching only the cells it flipped."""
+    index, steps_xor, changed = delta
+    if index != current or steps_xor:
+        select_pattern(index)
+        return
+    for r, mask in changed:
+        for c in range(len(buttons[r])):
+            if (mask >> c) & 1:
                 update_button_color(r, c)
 
-def play_sound(file, volume=1.0):
-    sound = pygame.mixer.Sound(file)
-    sound.set_volume(volume * master_volume)
-    sound.play()
+def play_sound(name, volume=1.0):
+    bank.play(name, volume * master_volume)
 
 def play_note(note):
     if note in notes:
-        play_sound(notes[note], volume=note_volumes.get(note, 1.0))
+        play_sound(note, volume=note_volumes.get(note, 1.0))
     elif note in drums:
-        play_sound(drums[note])
+        play_sound(note)
     # Record live note with timestamp
     sequence.append((note, time()))
 
 def toggle_cell(r, c):
-    push_undo()
-    grid[r][c] = 0 if grid[r][c] else 1
-    update_button_color(r, c)
+    edit(song.toggle(current, r, c))
 
 def update_button_color(r, c):
     btn = buttons[r][c]
-    btn.config(bg="green" if grid[r][c] else "lightgrey")
+    btn.config(bg="green" if song.patterns[current].get(r, c) else "lightgrey")
 
 def highlight_step(step):
     for r in range(len(rows)):
@@ -102,44 +94,151 @@ def unhighlight_step(step):
     for r in range(len(rows)):
         buttons[r][step].config(relief=tk.RAISED)
 
+def make_pattern(index):
+    """Snapshot of one song pattern and the mix settings, taken by the audio thread once per loop."""
+    gains = {name: note_volumes.get(name, 1.0) * master_volume for name in rows}
+    bits = song.patterns[index]
+    pattern = Pattern(list(bits.masks), bits.steps, rows, 0.5 / tempo_multiplier, swing_amount, gains)
+    pattern.index = index
+    return pattern
+
+player = SongPlayer(song, make_pattern)
+
+def next_pattern():
+    return player() if song_mode else make_pattern(current)
+
+audio = AudioScheduler(bank, next_pattern)
+highlighted_step = None
+
+def refresh_step_highlight():
+    """Follow the audio playhead from the Tk loop; only touches buttons when the step changes."""
+    global highlighted_step
+    position = audio.position()
+    step = None
+    if position and position[0].index == current and position[1] < len(buttons[0]):
+        step = position[1]
+    if step != highlighted_step:
+        if highlighted_step is not None:
+            unhighlight_step(highlighted_step)
+        if step is not None:
+            highlight_step(step)
+        highlighted_step = step
+
 def play_sequence():
-    step_time = 0.5 / tempo_multiplier
-    for step in range(steps):
-        highlight_step(step)
-        for r, row in enumerate(grid):
-            if row[step]:
-                play_sound(all_sounds[rows[r]])
-        # Swing: delay every other step
-        if step % 2 == 0:
-            sleep(step_time * (1 + swing_amount))
-        else:
-            sleep(step_time * (1 - swing_amount))
-        unhighlight_step(step)
+    if not audio.running:
+        player.rewind()
+    audio.play(loop=loop_var.get())
 
 def start_loop():
-    def loop():
-        while loop_var.get():
-            play_sequence()
-    threading.Thread(target=loop, daemon=True).start()
+    if loop_var.get():
+        if not audio.running:
+            player.rewind()
+        audio.play(loop=True)
+    else:
+        # finish the current bar, like the old loop thread did
+        audio.set_looping(False)
+
+def toggle_song_mode():
+    global song_mode
+    song_mode = song_mode_var.get()
 
 def save_pattern():
     file_path = filedialog.asksaveasfilename(defaultextension=".json")
     if file_path:
         with open(file_path, "w") as f:
-            json.dump(grid, f)
+            json.dump(song.patterns[current].to_grid(), f)
         print(f"Pattern saved to {file_path}")
 
+def export_wav():
+    label = "Number of passes through the song:" if song_mode else "Number of bars:"
+    bars = simpledialog.askinteger("Export WAV", label, initialvalue=1 if song_mode else 4, minvalue=1, maxvalue=512)
+    if not bars:
+        return
+    file_path = filedialog.asksaveasfilename(defaultextension=".wav", filetypes=[("WAV files", "*.wav")])
+    if file_path:
+        if song_mode:
+            audio_data = render_song(bank, [make_pattern(index) for index in song.order], bars)
+        else:
+            audio_data = render_pattern(bank, make_pattern(current), bars)
+        write_wav(file_path, audio_data, bank.rate)
+        print(f"{'Song' if song_mode else 'Pattern'} exported to {file_path}")
+
 def load_pattern():
     file_path = filedialog.askopenfilename(filetypes=[("JSON files", "*.json")])
     if file_path:
         with open(file_path, "r") as f:
             loaded_grid = json.load(f)
-        for r in range(len(rows)):
-            for c in range(steps):
-                grid[r][c] = loaded_grid[r][c]
-                update_button_color(r, c)
+        edit(song.set_grid(current, loaded_grid))
         print(f"Pattern loaded from {file_path}")
 
+def save_song():
+    file_path = filedialog.asksaveasfilename(defaultextension=".json")
+    if file_path:
+        with open(file_path, "w") as f:
+            json.dump(song.to_json(), f)
+        print(f"Song saved to {file_path}")
+
+def load_song():
+    file_path = filedialog.askopenfilename(filetypes=[("JSON files", "*.json")])
+    if file_path:
+        try:
+            with open(file_path, "r") as f:
+                loaded = Song.from_json(json.load(f), rows)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"Could not load song from {file_path}: {e}")
+            return
+        audio.stop()
+        song.patterns, song.order = loaded.patterns or [BitPattern(len(rows))], loaded.order
+        history.undo_stack.clear()
+        history.redo_stack.clear()
+        show_order()
+        select_pattern(0)
+        print(f"Song loaded from {file_path}")
+
+# --- Song patterns ---
+def select_pattern(index):
+    global current, highlighted_step
+    current = index
+    highlighted_step = None
+    pattern_spin.config(to=len(song.patterns))
+    pattern_var.set(index + 1)
+    steps_var.set(song.patterns[index].steps)
+    build_grid()
+
+def choose_pattern():
+    try:
+        index = int(pattern_var.get()) - 1
+    except ValueError:
+        return
+    if 0 <= index < len(song.patterns) and index != current:
+        select_pattern(index)
+
+def new_pattern():
+    index = song.add_pattern(song.patterns[current].steps)
+    song.order.append(index)
+    show_order()
+    select_pattern(index)
+
+def apply_steps(event=None):
+    try:
+        new_steps = int(steps_var.get())
+    except ValueError:
+        return
+    if 1 <= new_steps <= MAX_STEPS and new_steps != song.patterns[current].steps:
+        edit(song.resize(current, new_steps))
+
+def show_order():
+    order_var.set(" ".join(str(index + 1) for index in song.order))
+
+def apply_order(event=None):
+    order = []
+    for item in order_var.get().split():
+        if item.isdigit() and 1 <= int(item) <= len(song.patterns):
+            order.append(int(item) - 1)
+    # Swap in a new list: the audio thread may be reading the old one
+    song.order = order
+    show_order()
+
 def update_tempo(val):
     global tempo_multiplier
     tempo_multiplier = float(val)
@@ -175,22 +274,62 @@ swing_slider = tk.Scale(swing_frame, from_=0.0, to=0.5, resolution=0.01, orient=
 swing_slider.set(0.0)
 swing_slider.pack(side=tk.LEFT, padx=10)
 
+song_frame = tk.Frame(root, bg="#222")
+song_frame.pack(pady=5)
+tk.Label(song_frame, text="Pattern", font=("Arial", 11), fg="#fff", bg="#222").pack(side=tk.LEFT)
+pattern_var = tk.StringVar(value="1")
+pattern_spin = tk.Spinbox(song_frame, from_=1, to=1, width=4, textvariable=pattern_var, command=choose_pattern)
+pattern_spin.pack(side=tk.LEFT, padx=5)
+pattern_spin.bind("<Return>", lambda event: choose_pattern())
+tk.Button(song_frame, text="New Pattern", command=new_pattern,
+          bg="#607d8b", fg="#fff", font=("Arial", 10, "bold")).pack(side=tk.LEFT, padx=5)
+tk.Label(song_frame, text="Steps", font=("Arial", 11), fg="#fff", bg="#222").pack(side=tk.LEFT)
+steps_var = tk.StringVar(value=str(song.patterns[0].steps))
+steps_spin = tk.Spinbox(song_frame, from_=1, to=MAX_STEPS, width=4, textvariable=steps_var, command=apply_steps)
+steps_spin.pack(side=tk.LEFT, padx=5)
+steps_spin.bind("<Return>", apply_steps)
+tk.Label(song_frame, text="Order", font=("Arial", 11), fg="#fff", bg="#222").pack(side=tk.LEFT)
+order_var = tk.StringVar()
+order_entry = tk.Entry(song_frame, textvariable=order_var, width=30)
+order_entry.pack(side=tk.LEFT, padx=5)
+order_entry.bind("<Return>", apply_order)
+order_entry.bind("<FocusOut>", apply_order)
+show_order()
+song_mode_var = tk.BooleanVar()
+tk.Checkbutton(song_frame, text="Song Mode", variable=song_mode_var, command=toggle_song_mode,
+               font=("Arial", 11), fg="#fff", bg="#222", selectcolor="#333").pack(side=tk.LEFT, padx=5)
+tk.Button(song_frame, text="Save Song", command=save_song,
+          bg="#2196f3", fg="#fff", font=("Arial", 10, "bold")).pack(side=tk.LEFT, padx=5)
+tk.Button(song_frame, text="Load Song", command=load_song,
+          bg="#ff9800", fg="#fff", font=("Arial", 10, "bold")).pack(side=tk.LEFT, padx=5)
+
 button_frame = tk.Frame(root, bg="#222")
 button_frame.pack(pady=10)
 buttons = []
 
-for r, row_name in enumerate(rows):
-    row_frame = tk.Frame(button_frame, bg="#222")
-    row_frame.pack(pady=2)
-    tk.Label(row_frame, text=row_name, width=6, font=("Arial", 11, "bold"), fg="#fff", bg="#222").pack(side=tk.LEFT)
-    row_buttons = []
-    for c in range(steps):
-        btn = tk.Button(row_frame, bg="#444", activebackground="#0f0", width=4, height=2,
-                        font=("Arial", 10, "bold"),
-                        command=lambda r=r, c=c: toggle_cell(r, c))
-        btn.pack(side=tk.LEFT, padx=1)
-        row_buttons.append(btn)
-    buttons.append(row_buttons)
+def build_grid():
+    """(Re)create the step buttons for the pattern being edited."""
+    for child in button_frame.winfo_children():
+        child.destroy()
+    buttons.clear()
+    steps = song.patterns[current].steps
+    width = 4 if steps <= 16 else 2
+    for r, row_name in enumerate(rows):
+        row_frame = tk.Frame(button_frame, bg="#222")
+        row_frame.pack(pady=2)
+        tk.Label(row_frame, text=row_name, width=6, font=("Arial", 11, "bold"), fg="#fff", bg="#222").pack(side=tk.LEFT)
+        row_buttons = []
+        for c in range(steps):
+            btn = tk.Button(row_frame, bg="#444", activebackground="#0f0", width=width, height=2,
+                            font=("Arial", 10, "bold"),
+                            command=lambda r=r, c=c: toggle_cell(r, c))
+            btn.pack(side=tk.LEFT, padx=1)
+            row_buttons.append(btn)
+        buttons.append(row_buttons)
+        for c in range(steps):
+            update_button_color(r, c)
+
+build_grid()
 
 control_frame = tk.Frame(root, bg="#222")
 control_frame.pack(pady=10)
@@ -199,12 +338,14 @@ loop_var = tk.BooleanVar()
 tk.Checkbutton(control_frame, text="Loop", variable=loop_var, command=start_loop,
                font=("Arial", 11), fg="#fff", bg="#222", selectcolor="#333").pack(side=tk.LEFT, padx=5)
 
-tk.Button(control_frame, text="Play Once", command=lambda: threading.Thread(target=play_sequence).start(),
+tk.Button(control_frame, text="Play Once", command=play_sequence,
           bg="#4caf50", fg="#fff", font=("Arial", 11, "bold")).pack(side=tk.LEFT, padx=5)
 tk.Button(control_frame, text="Save Pattern", command=save_pattern,
           bg="#2196f3", fg="#fff", font=("Arial", 11, "bold")).pack(side=tk.LEFT, padx=5)
 tk.Button(control_frame, text="Load Pattern", command=load_pattern,
           bg="#ff9800", fg="#fff", font=("Arial", 11, "bold")).pack(side=tk.LEFT, padx=5)
+tk.Button(control_frame, text="Export WAV", command=export_wav,
+          bg="#673ab7", fg="#fff", font=("Arial", 11, "bold")).pack(side=tk.LEFT, padx=5)
 
 tk.Button(control_frame, text="Undo", command=undo,
           bg="#9e9e9e", fg="#222", font=("Arial", 11, "bold")).pack(side=tk.LEFT, padx=5)
@@ -218,9 +359,14 @@ master_slider.set(1.0)
 master_slider.pack(side=tk.LEFT, padx=5)
 
 def key_press(event):
+    if isinstance(event.widget, (tk.Entry, tk.Spinbox)):
+        return
     key = event.char.lower()
     if key in key_bindings:
         play_note(key_bindings[key])
 root.bind("<KeyPress>", key_press)
 
-root.mainloop()
\ No newline at end of file
+get_scheduler(root).call_every(0.015, refresh_step_highlight, name="tempo playhead")
+
+root.mainloop()
+audio.stop()
\ No newline at end of file
@@ -0,0 +1,578 @@
+# Copyright 2025 the FranchukOS project authors.
+# Contributed under the Apache License, Version 2.0.
+
+"""Audio engine for Tempo.
+
+Sounds are decoded once into float32 arrays by the SampleBank. Playback
+mixes the pattern into a continuous stream of fixed-size blocks with NumPy
+and queues them on a reserved pygame channel, so every step starts on an
+exact sample instead of whenever a sleeping thread wakes up.
+
+Songs chain patterns of any length. Each pattern row is one integer
+bitmask, and edits are XOR deltas, so a long song and its undo history
+stay a handful of integers per pattern.
+
+Patterns and songs can also be rendered offline to WAV:
+
+    python -m Applications.tempo_engine pattern.json out.wav --bars 4 --tempo 1.5
+"""
+
+import argparse
+import bisect
+import json
+import os
+import threading
+import time
+import wave
+from collections import deque
+
+import numpy as np
+import pygame
+
+SAMPLE_RATE = 44100
+CHANNELS = 2
+BLOCK_FRAMES = 2048  # ~46 ms per mixed block
+STREAM_CHANNEL = 0  # reserved mixer channel for the sequencer stream
+
+NOTES = {
+    "C": "Applications/sounds/C.aiff",
+    "D": "Applications/sounds/D.aiff",
+    "E": "Applications/sounds/E.aiff",
+    "F": "Applications/sounds/F.aiff",
+    "G": "Applications/sounds/G.aiff",
+    "A": "Applications/sounds/A.aiff",
+    "B": "Applications/sounds/B.aiff",
+}
+
+DRUMS = {
+    "Kick": "Applications/sounds/kick.wav",
+    "Snare": "Applications/sounds/snare.wav",
+    "HiHat": "Applications/sounds/hihat.wav"
+}
+
+
+def init_mixer():
+    """Initialise pygame's mixer in the format the engine mixes in."""
+    if not pygame.mixer.get_init():
+        pygame.mixer.init(frequency=SAMPLE_RATE, size=-16, channels=CHANNELS, buffer=512)
+    pygame.mixer.set_reserved(STREAM_CHANNEL + 1)
+    rate, _, channels = pygame.mixer.get_init()
+    return rate, channels
+
+
+class SampleBank:
+    """Every sound decoded once, as float32 (frames, channels) arrays."""
+
+    def __init__(self, sounds):
+        self.paths = dict(sounds)
+        self.samples = {}
+        self.sounds = {}
+        self.rate, self.channels = init_mixer()
+
+    def load(self):
+        for name, path in self.paths.items():
+            try:
+                sound = pygame.mixer.Sound(path)
+            except (pygame.error, FileNotFoundError) as e:
+                print(f"Could not load sound {name} from {path}: {e}")
+                continue
+            data = pygame.sndarray.array(sound).astype(np.float32) / 32768.0
+            if data.ndim == 1:
+                data = np.repeat(data[:, None], self.channels, axis=1)
+            self.sounds[name] = sound
+            self.samples[name] = data
+        return self
+
+    def get(self, name):
+        return self.samples.get(name)
+
+    def play(self, name, volume=1.0):
+        """Play ``name`` right away (live key presses) without decoding it again."""
+        sound = self.sounds.get(name)
+        if sound is not None:
+            sound.set_volume(volume)
+            sound.play()
+
+
+def step_offsets(steps, step_time, swing, rate):
+    """Frame offset of each step in the loop, and the loop length in frames.
+
+    With swing, even steps last ``step_time * (1 + swing)`` and odd steps
+    ``step_time * (1 - swing)``, so each pair still takes two step times.
+    """
+    durations = [step_time * (1 + swing if step % 2 == 0 else 1 - swing) for step in range(steps)]
+    starts = np.concatenate(([0.0], np.cumsum(durations)))
+    frames = np.round(starts * rate).astype(np.int64)
+    return frames[:-1].tolist(), int(frames[-1])
+
+
+class Pattern:
+    """What the engine plays: a snapshot of the sequencer state.
+
+    ``masks`` holds one integer per entry in ``rows`` with bit ``s`` set when
+    the row plays on step ``s``; ``gains`` maps row names to their volume
+    (per-note volume times master volume). ``index`` is the song pattern it
+    was taken from, and ``last`` says whether a single pass ends after it.
+    """
+
+    def __init__(self, masks, steps, rows, step_time, swing=0.0, gains=None):
+        self.masks = masks
+        self.steps = steps
+        self.rows = rows
+        self.step_time = step_time
+        self.swing = swing
+        self.gains = gains or {}
+        self.index = None
+        self.last = True
+
+    @classmethod
+    def from_grid(cls, grid, rows, step_time, swing=0.0, gains=None):
+        """Build a Pattern from lists of 0/1 steps, as saved by "Save Pattern"."""
+        steps = len(grid[0]) if grid else 0
+        return cls(grid_to_masks(grid), steps, rows, step_time, swing, gains)
+
+    def hits(self, step):
+        """(row name, gain) for every row switched on at ``step``."""
+        bit = 1 << step
+        return [(self.rows[r], self.gains.get(self.rows[r], 1.0))
+                for r, mask in enumerate(self.masks) if mask & bit]
+
+
+def grid_to_masks(grid):
+    return [sum(1 << step for step, on in enumerate(row) if on) for row in grid]
+
+
+def masks_to_grid(masks, steps):
+    return [[(mask >> step) & 1 for step in range(steps)] for mask in masks]
+
+
+# ---- song mode ----
+
+class BitPattern:
+    """One editable pattern of a song: ``steps`` long, one bitmask per row."""
+
+    __slots__ = ("steps", "masks")
+
+    def __init__(self, row_count, steps=16, masks=None):
+        self.steps = steps
+        self.masks = list(masks) if masks is not None else [0] * row_count
+
+    def get(self, row, step):
+        return (self.masks[row] >> step) & 1
+
+    def to_grid(self):
+        return masks_to_grid(self.masks, self.steps)
+
+
+class Song:
+    """Patterns of any length, chained by ``order`` (a list of pattern indexes).
+
+    Every edit is returned as an XOR delta ``(index, steps_xor, ((row, mask), ...))``.
+    Applying a delta a second time undoes it, so the undo history stores a
+    few integers per edit instead of a copy of the song.
+    """
+
+    def __init__(self, rows, steps=16):
+        self.rows = list(rows)
+        self.patterns = [BitPattern(len(self.rows), steps)]
+        self.order = [0]
+
+    def add_pattern(self, steps=16):
+        self.patterns.append(BitPattern(len(self.rows), steps))
+        return len(self.patterns) - 1
+
+    def apply(self, delta):
+        index, steps_xor, rows = delta
+        pattern = self.patterns[index]
+        pattern.steps ^= steps_xor
+        for row, mask in rows:
+            pattern.masks[row] ^= mask
+        return delta
+
+    def toggle(self, index, row, step):
+        return self.apply((index, 0, ((row, 1 << step),)))
+
+    def resize(self, index, steps):
+        """Change a pattern's length; steps cut off are cleared so they undo too."""
+        pattern = self.patterns[index]
+        keep = (1 << steps) - 1
+        cleared = tuple((row, mask & ~keep) for row, mask in enumerate(pattern.masks) if mask & ~keep)
+        return self.apply((index, pattern.steps ^ steps, cleared))
+
+    def set_grid(self, index, grid):
+        """Replace a pattern's steps with a 0/1 grid (a loaded pattern file)."""
+        pattern = self.patterns[index]
+        steps = len(grid[0]) if grid else pattern.steps
+        masks = grid_to_masks(grid[:len(self.rows)])
+        masks += [0] * (len(self.rows) - len(masks))
+        rows = tuple((row, old ^ new) for row, (old, new) in enumerate(zip(pattern.masks, masks)) if old != new)
+        return self.apply((index, pattern.steps ^ steps, rows))
+
+    def to_json(self):
+        return {
+            "rows": self.rows,
+            "patterns": [{"steps": p.steps, "masks": [format(mask, "x") for mask in p.masks]}
+                         for p in self.patterns],
+            "order": list(self.order),
+        }
+
+    @classmethod
+    def from_json(cls, data, rows=None):
+        """Load a saved song, matching its rows to ``rows`` by name."""
+        rows = list(rows or data["rows"])
+        song = cls(rows)
+        position = {name: r for r, name in enumerate(data["rows"])}
+        song.patterns = []
+        for saved in data["patterns"]:
+            masks = [int(mask, 16) for mask in saved["masks"]]
+            song.patterns.append(BitPattern(len(rows), saved["steps"],
+                                            [masks[position[name]] if name in position else 0 for name in rows]))
+        song.order = [i for i in data["order"] if 0 <= i < len(song.patterns)]
+        return song
+
+
+class XorUndo:
+    """Undo/redo history of Song deltas, capped at ``limit`` edits."""
+
+    def __init__(self, limit=1000):
+        self.undo_stack = deque(maxlen=limit)
+        self.redo_stack = []
+
+    def record(self, delta):
+        self.undo_stack.append(delta)
+        self.redo_stack.clear()
+
+    def undo(self, song):
+        if not self.undo_stack:
+            return None
+        delta = song.apply(self.undo_stack.pop())
+        self.redo_stack.append(delta)
+        return delta
+
+    def redo(self, song):
+        if not self.redo_stack:
+            return None
+        delta = song.apply(self.redo_stack.pop())
+        self.undo_stack.append(delta)
+        return delta
+
+
+class SongPlayer:
+    """Pattern source that plays the song order, one pattern per loop.
+
+    ``make_pattern(index)`` turns a song pattern into a Pattern with the
+    current mix settings. Returns None when the order is empty.
+    """
+
+    def __init__(self, song, make_pattern):
+        self.song = song
+        self.make_pattern = make_pattern
+        self.slot = 0
+
+    def rewind(self):
+        self.slot = 0
+
+    def __call__(self):
+        order = self.song.order
+        if not order:
+            return None
+        slot = self.slot % len(order)
+        self.slot = slot + 1
+        pattern = self.make_pattern(order[slot])
+        pattern.index = order[slot]
+        pattern.last = slot == len(order) - 1
+        return pattern
+
+
+class AudioScheduler:
+    """Renders the pattern block by block ahead of the playhead.
+
+    ``pattern_source()`` is asked for the current Pattern at the start of
+    every loop, so edits are heard from the next bar on; a SongPlayer hands
+    out the next pattern of the song instead. Without looping, playback ends
+    after a pattern whose ``last`` is set. A feeder thread keeps
+    one block queued behind the one playing on the reserved channel; the Tk
+    side only reads ``position()`` to move the step highlight.
+    """
+
+    def __init__(self, bank, pattern_source, block_frames=BLOCK_FRAMES):
+        self.bank = bank
+        self.pattern_source = pattern_source
+        self.block_frames = block_frames
+        self.lock = threading.Lock()
+        self.thread = None
+        self.running = False
+        self.looping = False
+        self.playing = None  # (monotonic time, first frame) of the block on air
+        self.reset()
+
+    def reset(self):
+        self.frame = 0  # next frame to render
+        self.loop_start = 0
+        self.pattern = None
+        self.offsets, self.loop_frames = [], 0
+        self.loops = deque(maxlen=4)  # recent (loop_start, pattern, offsets, loop_frames)
+        self.next_step = 0
+        self.finished = False
+        self.voices = []  # [sample, position, gain]
+
+    def play(self, loop=False):
+        with self.lock:
+            self.looping = loop
+            if self.running:
+                return
+            self.reset()
+            self.running = True
+        self.thread = threading.Thread(target=self.feed, name="tempo audio", daemon=True)
+        self.thread.start()
+
+    def set_looping(self, loop):
+        self.looping = loop
+
+    def stop(self):
+        self.running = False
+        pygame.mixer.Channel(STREAM_CHANNEL).stop()
+
+    def position(self):
+        """(pattern, step) under the playhead, or None when not playing."""
+        with self.lock:
+            playing, loops = self.playing, list(self.loops)
+        if not self.running or playing is None:
+            return None
+        since, first_frame = playing
+        frame = first_frame + int((time.monotonic() - since) * self.bank.rate)
+        # The renderer runs ahead, so the loop on air may be an earlier one
+        for loop_start, pattern, offsets, loop_frames in reversed(loops):
+            if loop_start <= frame:
+                in_loop = frame - loop_start
+                if in_loop >= loop_frames:
+                    return None
+                return pattern, bisect.bisect_right(offsets, in_loop) - 1
+        return None
+
+    def start_loop(self):
+        pattern = self.pattern_source()
+        if pattern is None:
+            return False
+        offsets, loop_frames = step_offsets(pattern.steps, pattern.step_time, pattern.swing, self.bank.rate)
+        with self.lock:
+            self.pattern, self.offsets, self.loop_frames = pattern, offsets, loop_frames
+            self.loops.append((self.loop_start, pattern, offsets, loop_frames))
+            self.next_step = 0
+        return bool(offsets)
+
+    def render_block(self):
+        """Mix the next ``block_frames`` frames of the stream."""
+        n = self.block_frames
+        out = np.zeros((n, self.bank.channels), dtype=np.float32)
+        start = self.frame
+        end = start + n
+        while not self.finished:
+            if self.pattern is None:
+                if not self.start_loop():
+                    self.finished = True
+                    break
+            if self.next_step >= len(self.offsets):
+                if not self.looping and self.pattern.last:
+                    self.finished = True
+                    break
+                with self.lock:
+                    self.loop_start += self.loop_frames
+                if not self.start_loop():
+                    self.finished = True
+                    break
+            at = self.loop_start + self.offsets[self.next_step]
+            if at >= end:
+                break
+            for name, gain in self.pattern.hits(self.next_step):
+                sample = self.bank.get(name)
+                if sample is not None:
+                    self.voices.append([sample, start - at, gain])
+            self.next_step += 1
+        # Each voice is one slice add; position < 0 means it starts inside this block
+        alive = []
+        for voice in self.voices:
+            sample, position, gain = voice
+            dst = max(0, -position)
+            src = max(0, position)
+            count = min(n - dst, len(sample) - src)
+            if count > 0:
+                out[dst:dst + count] += sample[src:src + count] * gain
+            voice[1] = position + n
+            if voice[1] < len(sample):
+                alive.append(voice)
+        self.voices = alive
+        self.frame = end
+        return out
+
+    def make_sound(self, block):
+        pcm = (np.clip(block, -1.0, 1.0) * 32767).astype(np.int16)
+        return pygame.sndarray.make_sound(np.ascontiguousarray(pcm))
+
+    def feed(self):
+        channel = pygame.mixer.Channel(STREAM_CHANNEL)
+        block_time = self.block_frames / self.bank.rate
+        on_air = self.frame
+        channel.play(self.make_sound(self.render_block()))
+        self.playing = (time.monotonic(), on_air)
+        queued = self.frame
+        channel.queue(self.make_sound(self.render_block()))
+        while self.running:
+            if channel.get_queue() is None:
+                # the queued block just went on air; render the one after it
+                with self.lock:
+                    self.playing = (time.monotonic(), queued)
+                if self.finished and not self.voices:
+                    break
+                queued = self.frame
+                channel.queue(self.make_sound(self.render_block()))
+            elif not channel.get_busy():
+                # starved (e.g. the machine stalled); restart the stream where we are
+                with self.lock:
+                    self.playing = (time.monotonic(), self.frame)
+                channel.play(self.make_sound(self.render_block()))
+            time.sleep(block_time / 4)
+        while self.running and channel.get_busy():
+            time.sleep(block_time / 4)
+        self.running = False
+        with self.lock:
+            self.playing = None
+
+
+# ---- offline rendering ----
+
+def render_pattern(bank, pattern, bars=1):
+    """Mix ``bars`` loops of ``pattern`` into one float32 (frames, channels) array.
+
+    One loop is mixed once (a slice add per hit). Every bar after that is
+    the same audio shifted by a loop length, so the loop, tails included, is
+    cut into loop-length segments and each segment is added to all bars in
+    a single broadcast add. The cost grows with the song length, not with
+    the number of notes.
+    """
+    offsets, loop_frames = step_offsets(pattern.steps, pattern.step_time, pattern.swing, bank.rate)
+    if not loop_frames or bars < 1:
+        return np.zeros((0, bank.channels), dtype=np.float32)
+    hits = []
+    for step, offset in enumerate(offsets):
+        for name, gain in pattern.hits(step):
+            sample = bank.get(name)
+            if sample is not None:
+                hits.append((offset, sample, gain))
+    length = max([loop_frames] + [offset + len(sample) for offset, sample, _ in hits])
+    segments = -(-length // loop_frames)
+    loop = np.zeros((segments * loop_frames, bank.channels), dtype=np.float32)
+    for offset, sample, gain in hits:
+        loop[offset:offset + len(sample)] += sample * gain
+    loop = loop.reshape(segments, loop_frames, bank.channels)
+    out = np.zeros((bars + segments - 1, loop_frames, bank.channels), dtype=np.float32)
+    for k in range(segments):
+        # segment k of every bar lands k bars later
+        out[k:k + bars] += loop[k]
+    return out.reshape(-1, bank.channels)[:(bars - 1) * loop_frames + length]
+
+
+def render_song(bank, patterns, passes=1):
+    """Mix the chained ``patterns`` (one loop each), ``passes`` times over.
+
+    Each distinct pattern is rendered once, however often the order repeats
+    it, and added at its start frame; tails ring on into the next pattern.
+    """
+    renders = {}
+    starts = []
+    frame = 0
+    for _ in range(passes):
+        for pattern in patterns:
+            key = pattern.index if pattern.index is not None else id(pattern)
+            if key not in renders:
+                renders[key] = (render_pattern(bank, pattern, 1),
+                                step_offsets(pattern.steps, pattern.step_time, pattern.swing, bank.rate)[1])
+            starts.append((frame, renders[key][0]))
+            frame += renders[key][1]
+    length = max([frame] + [start + len(audio) for start, audio in starts])
+    out = np.zeros((length, bank.channels), dtype=np.float32)
+    for start, audio in starts:
+        out[start:start + len(audio)] += audio
+    return out
+
+
+def write_wav(path, audio, rate):
+    """Write float audio in [-1, 1] as 16-bit PCM."""
+    pcm = (np.clip(audio, -1.0, 1.0) * 32767).astype("<i2")
+    with wave.open(path, "wb") as f:
+        f.setnchannels(audio.shape[1])
+        f.setsampwidth(2)
+        f.setframerate(rate)
+        f.writeframes(pcm.tobytes())
+
+
+def load_pattern_file(path, rows, tempo=1.0, swing=0.0, volumes=None, master=1.0):
+    """Build a Pattern from a grid saved by Tempo's "Save Pattern"."""
+    with open(path, "r") as f:
+        grid = json.load(f)
+    volumes = volumes or {}
+    gains = {name: volumes.get(name, 1.0) * master for name in rows}
+    return Pattern.from_grid(grid[:len(rows)], rows[:len(grid)], 0.5 / tempo, swing, gains)
+
+
+def song_patterns(song, tempo=1.0, swing=0.0, volumes=None, master=1.0):
+    """The song's order as Patterns, ready for render_song."""
+    volumes = volumes or {}
+    gains = {name: volumes.get(name, 1.0) * master for name in song.rows}
+    patterns = []
+    for index in song.order:
+        bits = song.patterns[index]
+        pattern = Pattern(list(bits.masks), bits.steps, song.rows, 0.5 / tempo, swing, gains)
+        pattern.index = index
+        patterns.append(pattern)
+    return patterns
+
+
+def parse_volumes(values):
+    volumes = {}
+    for item in values or []:
+        name, _, value = item.partition("=")
+        volumes[name] = float(value)
+    return volumes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render a Tempo pattern or song to a WAV file.")
+    parser.add_argument("pattern", help="pattern or song JSON saved by Tempo")
+    parser.add_argument("output", help="WAV file to write")
+    parser.add_argument("--bars", type=int, default=4,
+                        help="number of loops to render (default 4); passes through a song")
+    parser.add_argument("--tempo", type=float, default=1.0, help="tempo multiplier, as on the slider")
+    parser.add_argument("--swing", type=float, default=0.0, help="swing amount, 0.0 to 0.5")
+    parser.add_argument("--master", type=float, default=1.0, help="master volume")
+    parser.add_argument("--volume", action="append", metavar="NOTE=GAIN", help="per-note volume, repeatable")
+    parser.add_argument("--benchmark", action="store_true", help="report render speed against real time")
+    args = parser.parse_args(argv)
+
+    # No sound card is needed to decode and mix
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    sounds = {**NOTES, **DRUMS}
+    bank = SampleBank(sounds).load()
+    with open(args.pattern, "r") as f:
+        saved = json.load(f)
+    start = time.perf_counter()
+    if isinstance(saved, dict):
+        song = Song.from_json(saved, list(sounds))
+        patterns = song_patterns(song, args.tempo, args.swing, parse_volumes(args.volume), args.master)
+        audio = render_song(bank, patterns, args.bars)
+    else:
+        pattern = load_pattern_file(args.pattern, list(sounds), args.tempo, args.swing,
+                                    parse_volumes(args.volume), args.master)
+        audio = render_pattern(bank, pattern, args.bars)
+    elapsed = time.perf_counter() - start
+    write_wav(args.output, audio, bank.rate)
+
+    seconds = len(audio) / bank.rate
+    print(f"Wrote {args.output}: {args.bars} bars, {seconds:.2f} s of audio")
+    if args.benchmark:
+        print(f"Rendered in {elapsed * 1000:.1f} ms ({seconds / max(elapsed, 1e-9):.0f}x real time)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
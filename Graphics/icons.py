@@ -0,0 +1,185 @@
+# Copyright 2025 the FranchukOS project authors.
+# Contributed under the Apache License, Version 2.0.
+
+import json
+import math
+import os
+import tkinter as tk
+
+from core.apps import APPS
+
+CACHE_DIR = "cache/icons"
+
+# Icons that are not tied to an application
+SYSTEM_ICONS = {
+    "user": "assets/icons/user.png",
+    "lock": "assets/icons/lock.png",
+    "logo": "assets/icons/logo.png",
+    "holdon": "assets/icons/holdon.png",
+}
+
+
+def default_sources():
+    """Map icon names to source files: every app icon plus the system icons."""
+    sources = {entry.name: entry.icon for entry in APPS if entry.icon}
+    sources.update(SYSTEM_ICONS)
+    return sources
+
+
+def source_signature(sources):
+    """(path, mtime_ns, size) for every source that exists on disk."""
+    signature = {}
+    for name, path in sources.items():
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        signature[name] = [path, st.st_mtime_ns, st.st_size]
+    return signature
+
+
+def atlas_layout(names, size):
+    """Place ``names`` on a square grid of ``size`` pixel cells.
+
+    Returns ``(width, height, slots)`` where ``slots`` maps each name to the
+    top-left corner of its cell.
+    """
+    names = sorted(names)
+    columns = max(1, math.ceil(math.sqrt(len(names))))
+    rows = max(1, math.ceil(len(names) / columns))
+    slots = {name: [(i % columns) * size, (i // columns) * size] for i, name in enumerate(names)}
+    return columns * size, rows * size, slots
+
+
+def atlas_paths(cache_dir, size):
+    base = os.path.join(cache_dir, f"atlas_{size}")
+    return base + ".png", base + ".json"
+
+
+def ensure_atlas(sources, size, cache_dir=CACHE_DIR):
+    """Make sure the atlas for ``size`` on disk matches ``sources``.
+
+    Returns ``(png_path, slots)``, or ``(None, {})`` if nothing could be
+    built. Only touches PIL and the filesystem, so it is safe to call off the
+    Tk thread (the boot pipeline warms the atlas this way).
+    """
+    png_path, index_path = atlas_paths(cache_dir, size)
+    signature = source_signature(sources)
+    if not signature:
+        return None, {}
+    try:
+        with open(index_path, "r") as f:
+            index = json.load(f)
+        if index.get("size") == size and index.get("sources") == signature and os.path.exists(png_path):
+            return png_path, index["slots"]
+    except (OSError, ValueError):
+        pass  # missing or stale atlas; rebuild it below
+    try:
+        return build_atlas(signature, size, cache_dir)
+    except Exception as e:
+        print(f"Could not build icon atlas for size {size}: {e}")
+        return None, {}
+
+
+def build_atlas(signature, size, cache_dir=CACHE_DIR):
+    from PIL import Image
+
+    png_path, index_path = atlas_paths(cache_dir, size)
+    scaled = {}
+    for name, (path, _, _) in signature.items():
+        try:
+            with Image.open(path) as img:
+                scaled[name] = img.convert("RGBA").resize((size, size), Image.LANCZOS)
+        except OSError as e:
+            print(f"Failed to load icon '{name}' from {path}: {e}")
+    width, height, slots = atlas_layout(scaled, size)
+    sheet = Image.new("RGBA", (width, height), (0, 0, 0, 0))
+    for name, img in scaled.items():
+        sheet.paste(img, tuple(slots[name]))
+    os.makedirs(cache_dir, exist_ok=True)
+    sheet.save(png_path + ".tmp", "PNG")
+    os.replace(png_path + ".tmp", png_path)
+    with open(index_path + ".tmp", "w") as f:
+        json.dump({"size": size, "sources": signature, "slots": slots}, f)
+    os.replace(index_path + ".tmp", index_path)
+    return png_path, slots
+
+
+class IconService:
+    """Hands out icons from one pre-scaled atlas per size.
+
+    The atlas for a size is built once by ``ensure_atlas`` and cached as
+    ``cache/icons/atlas_<size>.png`` next to a JSON index of source mtimes
+    and sizes. The service loads that PNG straight into Tk and cuts icons out
+    of it, so sources are only decoded again when one of them changed.
+    PhotoImages are kept here, so windows never need to hold references.
+    """
+
+    def __init__(self, root, sources=None, cache_dir=CACHE_DIR):
+        self.root = root
+        self.sources = dict(sources) if sources is not None else default_sources()
+        self.cache_dir = cache_dir
+        self.atlases = {}
+        self.images = {}
+
+    def get(self, name, size=64):
+        """Return a PhotoImage for ``name`` at ``size`` pixels, or None."""
+        key = (name, size)
+        image = self.images.get(key)
+        if image is not None:
+            return image
+        atlas, slots = self.atlas(size)
+        if atlas is not None and name in slots:
+            x, y = slots[name]
+            image = tk.PhotoImage(master=self.root, width=size, height=size)
+            image.tk.call(image, "copy", str(atlas), "-from", x, y, x + size, y + size)
+        else:
+            image = self.load_single(name, size)
+        if image is not None:
+            self.images[key] = image
+        return image
+
+    def atlas(self, size):
+        if size not in self.atlases:
+            self.atlases[size] = self.load_atlas(size)
+        return self.atlases[size]
+
+    def load_atlas(self, size):
+        png_path, slots = ensure_atlas(self.sources, size, self.cache_dir)
+        if png_path is None:
+            return None, {}
+        try:
+            return tk.PhotoImage(master=self.root, file=png_path), slots
+        except tk.TclError:
+            # Tk builds without PNG support go through PIL instead
+            from PIL import Image, ImageTk
+            with Image.open(png_path) as img:
+                return ImageTk.PhotoImage(img, master=self.root), slots
+
+    def load_single(self, name, size):
+        """Fallback for icons that are not part of the atlas."""
+        path = self.sources.get(name, name)
+        if not os.path.exists(path):
+            return None
+        from PIL import Image, ImageTk
+        try:
+            with Image.open(path) as img:
+                return ImageTk.PhotoImage(img.convert("RGBA").resize((size, size), Image.LANCZOS), master=self.root)
+        except OSError as e:
+            print(f"Failed to load icon '{name}' from {path}: {e}")
+            return None
+
+    def warm(self, sizes=(64,)):
+        """Build or load the atlases for ``sizes`` ahead of first use."""
+        for size in sizes:
+            self.atlas(size)
+
+
+def get_icon_service(widget):
+    """Return the shared icon service for the Tk root that owns ``widget``."""
+    root = widget._root()
+    service = getattr(root, "icon_service", None)
+    if service is None:
+        service = IconService(root)
+        root.icon_service = service
+    return service
@@ -4,6 +4,7 @@ import tkinter as tk
 from tkinter import messagebox, simpledialog, ttk, filedialog
 from config.manager import load_profiles, save_profiles
 from PIL import Image, ImageTk, ImageFilter
+from Graphics.icons import get_icon_service
 import os
 import pygame
 
@@ -80,8 +81,9 @@ TRANSLATIONS = {
 LANGUAGES = [("English", "en"), ("Français", "fr"), ("Español", "es")]
 
 class LoginApp:
-    def __init__(self):
-        self.profiles = load_profiles()
+    def __init__(self, profiles=None):
+        # The boot pipeline hands over the profiles it already loaded
+        self.profiles = profiles if profiles is not None else load_profiles()
         self.language = "en"
         self.trans = TRANSLATIONS[self.language]
         self.root = tk.Tk()
@@ -155,11 +157,11 @@ class LoginApp:
         title = ttk.Label(container, text=self.trans["welcome"], font=("Segoe UI", 22, "bold"))
         title.pack(pady=(10, 20))
 
-        try:
-            self.user_icon = ImageTk.PhotoImage(Image.open("assets/icons/user.png").resize((20, 20)))
-            self.lock_icon = ImageTk.PhotoImage(Image.open("assets/icons/lock.png").resize((20, 20)))
-        except:
-            self.user_icon = self.lock_icon = None
+        # Cut from the on-disk atlas boot pre-built in cache/icons (this process has its own
+        # IconService); the service keeps them, so a language change rebuilds the UI without reloading
+        icons = get_icon_service(self.root)
+        self.user_icon = icons.get("user", 20)
+        self.lock_icon = icons.get("lock", 20)
 
         if self.user_icon:
             tk.Label(container, image=self.user_icon, background="#1c1c1c").pack()
@@ -4,31 +4,52 @@
 import tkinter as tk
 from tkinter import messagebox
 import time
-from threading import Thread
 from datetime import datetime
 
-import pygame
-from Applications.file_explorer import FileExplorer
-from Applications.terminal import Terminal
-from Applications.settings import SettingsApp
-from Applications.clock import ClockApp
-from Applications.insider import Insider
-from Applications.outsider import Outsider
-from Applications.games.snake import snake_game as SnakeGame
-from Applications.games.spi import SpaceInvaders
-from Applications.games.aloha import AlohaGameGUI as Aloha
-from Applications.franpaint import Franpaint
-from Applications.taskmgr import TaskManager
-from Applications.franny import FrannyBrowser
-from Applications.birdseye import Birdseye
-import subprocess
-import sys
+from core.apphost import AppHostPool
+from core.apps import registry
+from core.scheduler import get_scheduler
+from Graphics.icons import get_icon_service
+
+class FocusBus:
+    """Publish/subscribe hub for window events.
+
+    The WindowManager publishes "opened" (name), "closed" (name) and
+    "focus" (old_name, new_name); the taskbar and anything else interested
+    subscribe instead of being called directly.
+    """
+
+    def __init__(self):
+        self.subscribers = {}
+
+    def subscribe(self, event, callback):
+        self.subscribers.setdefault(event, []).append(callback)
+
+    def unsubscribe(self, event, callback):
+        callbacks = self.subscribers.get(event, [])
+        if callback in callbacks:
+            callbacks.remove(callback)
+
+    def publish(self, event, *args):
+        for callback in list(self.subscribers.get(event, ())):
+            try:
+                callback(*args)
+            except Exception as e:
+                print(f"Error in {event} subscriber: {e}")
+
 
 class WindowManager:
-    def __init__(self, taskbar):
+    def __init__(self, taskbar, schedule=None):
         self.taskbar = taskbar
         self.open_windows = {}
         self.active_window = None
+        self.active_name = None
+        self.bus = FocusBus()
+        # Focus changes are applied once per Tk tick, so a burst of switches
+        # only withdraws/shows the windows involved in the last one.
+        self.schedule = schedule or (lambda callback: get_scheduler(taskbar).call_later(0, callback, name="window focus"))
+        self.shown_name = None
+        self.focus_pending = False
 
     def open_window(self, window_name, window_class):
         if window_name not in self.open_windows:
@@ -39,7 +60,7 @@ class WindowManager:
                 window = window_class()
             window.grab_set()  # Block interactions with other windows until this one is closed.
             self.open_windows[window_name] = window
-            self.taskbar.add_taskbar_button(window_name)
+            self.bus.publish("opened", window_name)
             self.switch_to_window(window_name)  # Switch to the new window.
             return window
         else:
@@ -47,20 +68,110 @@ class WindowManager:
             self.switch_to_window(window_name)
             return self.open_windows[window_name]
 
+    def track_window(self, window_name, window):
+        """Adopt a window that was opened elsewhere, e.g. in an app host."""
+        new = window_name not in self.open_windows
+        self.open_windows[window_name] = window
+        if new:
+            self.bus.publish("opened", window_name)
+        self.switch_to_window(window_name)
+
+    def forget_window(self, window_name):
+        """Drop a window that has already closed on its own."""
+        if self.open_windows.pop(window_name, None) is not None:
+            self.window_gone(window_name)
+
     def close_window(self, window_name):
         if window_name in self.open_windows:
-            self.open_windows[window_name].destroy()
-            del self.open_windows[window_name]
-            self.taskbar.remove_taskbar_button(window_name)
+            self.open_windows.pop(window_name).destroy()
+            self.window_gone(window_name)
+
+    def window_gone(self, window_name):
+        if self.shown_name == window_name:
+            self.shown_name = None
+        if self.active_name == window_name:
+            self.active_name = None
+            self.active_window = None
+        self.bus.publish("closed", window_name)
 
     def switch_to_window(self, window_name):
-        # Hide the currently active window if any
-        if self.active_window and self.active_window.winfo_exists():
-            self.active_window.withdraw()
-        # Show the new window and make it active
+        if window_name not in self.open_windows:
+            return
+        self.active_name = window_name
         self.active_window = self.open_windows[window_name]
-        self.active_window.deiconify()
-        self.taskbar.update_taskbar_button(window_name)
+        if not self.focus_pending:
+            self.focus_pending = True
+            self.schedule(self.apply_focus)
+
+    def apply_focus(self):
+        self.focus_pending = False
+        old, new = self.shown_name, self.active_name
+        if old == new:
+            return
+        # Hide the previously shown window if any, then show the new one
+        previous = self.open_windows.get(old)
+        if previous is not None and previous.winfo_exists():
+            previous.withdraw()
+        if self.active_window is not None:
+            self.active_window.deiconify()
+        self.shown_name = new
+        self.bus.publish("focus", old, new)
+
+
+class TaskbarButtons:
+    """Taskbar buttons keyed by window name, restyled in batches.
+
+    ``make_button(name)`` creates a button and ``style(button, active)``
+    paints it. Focus changes only mark the two affected buttons dirty; they
+    are restyled together on the next ``schedule``d redraw.
+    """
+
+    def __init__(self, make_button, style, schedule):
+        self.make_button = make_button
+        self.style = style
+        self.schedule = schedule
+        self.buttons = {}
+        self.active = None
+        self.dirty = set()
+        self.redraw_pending = False
+
+    def add(self, name):
+        if name not in self.buttons:
+            self.buttons[name] = self.make_button(name)
+            self.mark(name)
+
+    def remove(self, name):
+        button = self.buttons.pop(name, None)
+        if button is not None:
+            button.destroy()
+        self.dirty.discard(name)
+        if self.active == name:
+            self.active = None
+
+    def focus(self, old, new):
+        self.active = new
+        self.mark(old)
+        self.mark(new)
+
+    def is_active(self, name):
+        return name == self.active
+
+    def mark(self, name):
+        if name is None:
+            return
+        self.dirty.add(name)
+        if not self.redraw_pending:
+            self.redraw_pending = True
+            self.schedule(self.redraw)
+
+    def redraw(self):
+        self.redraw_pending = False
+        dirty, self.dirty = self.dirty, set()
+        for name in dirty:
+            button = self.buttons.get(name)
+            if button is not None:
+                self.style(button, name == self.active)
+
 
 class AppWindow(tk.Toplevel):
     def __init__(self, parent, window_name, window_manager):
@@ -154,12 +265,31 @@ class Taskbar(tk.Frame):
         self.taskbar_buttons_frame.pack(side="bottom", fill="x")
 
         # Start updating time
-        self.update_time_thread = Thread(target=self.update_time, daemon=True)
-        self.update_time_thread.start()
+        self.scheduler = get_scheduler(self)
+
+        self.buttons = TaskbarButtons(
+            self.make_taskbar_button, self.style_taskbar_button,
+            lambda callback: self.scheduler.call_later(0, callback, name="taskbar redraw"))
+        self.window_manager.bus.subscribe("opened", self.add_taskbar_button)
+        self.window_manager.bus.subscribe("closed", self.remove_taskbar_button)
+        self.window_manager.bus.subscribe("focus", self.buttons.focus)
+        self.clock_job = self.scheduler.call_every(1, self.update_time, name="taskbar clock", delay=0)
+
+        # Warm Qt and Tk workers so apps open in-process instead of as new interpreters
+        self.app_hosts = AppHostPool(self.window_manager, self.scheduler.call_soon_threadsafe)
+        self.app_hosts.start()
 
     def add_taskbar_button(self, window_name):
+        self.buttons.add(window_name)
+
+    def remove_taskbar_button(self, window_name):
+        self.buttons.remove(window_name)
+
+    def make_taskbar_button(self, window_name):
+        icon = get_icon_service(self).get(window_name, 16)
         button = tk.Button(
             self.taskbar_buttons_frame, text=window_name,
+            image=icon or "", compound="left",
             command=lambda: self.window_manager.switch_to_window(window_name),
             bg="#2d2d2d", fg="white",
             activebackground="#444444",
@@ -168,63 +298,29 @@ class Taskbar(tk.Frame):
             padx=8, pady=4
         )
         button.bind("<Enter>", lambda e: button.config(bg="#3a3a3a"))
-        button.bind("<Leave>", lambda e: button.config(bg="#2d2d2d"))
+        button.bind("<Leave>", lambda e: self.style_taskbar_button(button, self.buttons.is_active(window_name)))
         button.bind("<Button-3>", lambda event, name=window_name: self.show_taskbar_context_menu(event, name))
         button.pack(side="left", padx=5, pady=5)
+        return button
 
-    def update_taskbar_button(self, window_name):
-        for button in self.taskbar_buttons_frame.winfo_children():
-            if button['text'] == window_name:
-                button.configure(bg="#555555")
-            else:
-                button.configure(bg="#2d2d2d")
+    def style_taskbar_button(self, button, active):
+        button.configure(bg="#555555" if active else "#2d2d2d")
 
     def get_time(self):
         return datetime.now().strftime("%H:%M:%S")
     
     def update_time(self):
         self.clock_label.configure(text=self.get_time())
-        self.after(1000, self.update_time)  
+
     def show_start_menu(self):
         menu = tk.Menu(self, tearoff=0, bg="#1e1e1e", fg="white", activebackground="#444444", font=("Segoe UI", 10))
 
-        # Productivity submenu
-        productivity_menu = tk.Menu(menu, tearoff=0, bg="#1e1e1e", fg="white", activebackground="#444444")
-        productivity_menu.add_command(label="Franny", command=self.launch_franny)
-        productivity_menu.add_command(label="Franny's Pop Shop", command=self.launch_shop)
-        productivity_menu.add_command(label="Birdseye", command=self.launch_birdseye)
-        productivity_menu.add_command(label="Sheets", command=self.launch_sheets)
-        productivity_menu.add_command(label="Calculator", command=self.launch_calc)
-        productivity_menu.add_command(label="Notetaking", command=self.launch_note)
-        productivity_menu.add_command(label="Franmail", command=self.launch_email)
-        menu.add_cascade(label="Productivity", menu=productivity_menu)
-
-        # System submenu
-        system_menu = tk.Menu(menu, tearoff=0, bg="#1e1e1e", fg="white", activebackground="#444444")
-        system_menu.add_command(label="Task Manager", command=self.launch_taskmgr)
-        system_menu.add_command(label="File Explorer", command=self.launch_file_explorer)  
-        system_menu.add_command(label="Terminal", command=self.launch_terminal)
-        system_menu.add_command(label="Settings", command=self.launch_settings)
-        system_menu.add_command(label="Clock", command=self.launch_clock)
-        menu.add_cascade(label="System", menu=system_menu)
-
-        # Creative submenu
-        creative_menu = tk.Menu(menu, tearoff=0, bg="#1e1e1e", fg="white", activebackground="#444444")
-        creative_menu.add_command(label="Franpaint", command=self.launch_franpaint)
-        creative_menu.add_command(label="Insider", command=self.launch_insider)
-        creative_menu.add_command(label="Outsider", command=self.launch_outsider)
-        creative_menu.add_command(label="Tempo", command=self.launch_tempo)
-        menu.add_cascade(label="Creative", menu=creative_menu)
-
-        # Games submenu
-        games_menu = tk.Menu(menu, tearoff=0, bg="#1e1e1e", fg="white", activebackground="#444444")
-        games_menu.add_command(label="Snake", command=self.launch_snake)
-        games_menu.add_command(label="Space Invaders", command=self.launch_space_invaders)
-        games_menu.add_command(label="Aloha", command=self.launch_aloha)
-        games_menu.add_command(label="Minesweeper", command=self.launch_mines)
-        games_menu.add_command(label="Tetris", command=self.launch_tetris)
-        games_menu.add_command(label="Runner", command=self.launch_runner)
-        menu.add_cascade(label="Games", menu=games_menu)
+        # Apps are listed from the registry and only imported when launched
+        for category, entries in registry.categories().items():
+            submenu = tk.Menu(menu, tearoff=0, bg="#1e1e1e", fg="white", activebackground="#444444")
+            for entry in entries:
+                submenu.add_command(label=entry.name, command=lambda name=entry.name: self.launch_app(name))
+            menu.add_cascade(label=category, menu=submenu)
 
         menu.add_separator()
         menu.add_command(label="Exit", command=self.exit_os)
@@ -234,7 +330,11 @@ class Taskbar(tk.Frame):
             self.winfo_rooty() + self.start_button.winfo_y() + 50
         )
 
+    def launch_app(self, name):
+        registry.launch(name, self.window_manager, self.app_hosts)
+
     def exit_os(self):
+        import pygame
         confirm = messagebox.askyesno("Exit", "Are you sure you want to exit FranchukOS?")
         if confirm:
             # Load and play the shutdown sound
@@ -244,25 +344,8 @@ class Taskbar(tk.Frame):
         while pygame.mixer.music.get_busy():
             pygame.time.Clock().tick(10)
 
+        self.app_hosts.stop()
         self.quit()
-    def add_taskbar_button(self, window_name):
-        button = tk.Button(self.taskbar_buttons_frame, text=window_name, command=lambda: self.window_manager.switch_to_window(window_name))
-        button.bind("<Button-3>", lambda event, name=window_name: self.show_taskbar_context_menu(event, name))
-        button.pack(side="left", padx=5)
-
-    def remove_taskbar_button(self, window_name):
-        # Find and remove button from taskbar
-        for button in self.taskbar_buttons_frame.winfo_children():
-            if button['text'] == window_name:
-                button.destroy()
-
-    def update_taskbar_button(self, window_name):
-        # Update the taskbar button to indicate the active window
-        for button in self.taskbar_buttons_frame.winfo_children():
-            if button['text'] == window_name:
-                button.configure(bg="lightgray")
-            else:
-                button.configure(bg="black")
 
     def show_taskbar_context_menu(self, event, window_name):
         menu = tk.Menu(self, tearoff=0, bg="black", fg="lime")
@@ -273,88 +356,6 @@ class Taskbar(tk.Frame):
 
         menu.post(event.x_root, event.y_root)
 
-    # This shit has got so fucked. 
-    # Maybe we can do something about this when v40 rolls around. 
-    def launch_file_explorer(self):
-        self.window_manager.open_window("File Explorer", FileExplorer)
-    def launch_terminal(self):
-        self.window_manager.open_window("Terminal", Terminal)
-    def launch_settings(self):
-        self.window_manager.open_window("Settings", SettingsApp)
-    def launch_clock(self):
-        self.window_manager.open_window("Clock", ClockApp)
-    def launch_insider(self):
-        self.window_manager.open_window("Insider", Insider)
-    def launch_outsider(self):
-        self.window_manager.open_window("Outsider", Outsider)
-    def launch_franny(self):
-        try:
-            subprocess.Popen([sys.executable, "Applications/franny.py"])
-        except Exception as e:
-            print(f"Failed to launch Franny: {e}")
-    def launch_snake(self):
-        self.window_manager.open_window("Snake", SnakeGame)
-    def launch_space_invaders(self):
-        self.window_manager.open_window("Space Invaders", SpaceInvaders)
-    def launch_aloha(self):
-        self.window_manager.open_window("Aloha", Aloha)
-    def launch_franpaint(self):
-        try:
-            subprocess.Popen([sys.executable, "Applications/franpaint.py"])
-        except Exception as e:
-            print(f"Failed to launch Franpaint: {e}")
-    def launch_taskmgr(self):
-        self.window_manager.open_window("Task Manager", TaskManager)
-    def launch_birdseye(self):
-        try:
-            subprocess.Popen([sys.executable, "Applications/birdseye.py"])
-        except Exception as e:
-            print(f"Failed to launch Birdseye: {e}")
-    def launch_sheets(self):
-        try:
-            subprocess.Popen([sys.executable, "Applications/sheets.py"])
-        except Exception as e:
-            print(f"Failed to launch Sheets: {e}")
-    def launch_mines(self):
-        try:
-            subprocess.Popen([sys.executable, "Applications/games/mines.py"])
-        except Exception as e:
-            print(f"Failed to launch Mines: {e}")
-    def launch_tetris(self):
-            try:
-                subprocess.Popen([sys.executable, "Applications/games/tetris.py"])
-            except Exception as e:
-                print(f"Failed to launch Tetris: {e}")
-    def launch_shop(self):
-        try:
-            subprocess.Popen([sys.executable, "Applications/store.py"])
-        except Exception as e:
-            print(f"Failed to launch Franny's Pop Shop: {e}")
-    def launch_calc(self):
-        try:
-            subprocess.Popen([sys.executable, "Applications/calculator.py"])
-        except Exception as e:
-            print(f"Failed to launch Calculator: {e}")
-    def launch_note(self):
-        try:
-            subprocess.Popen([sys.executable, "Applications/notetaking.py"])
-        except Exception as e:
-            print(f"Failed to launch Note: {e}")
-    def launch_tempo(self):
-        try:
-            subprocess.Popen([sys.executable, "Applications/tempo.py"])
-        except Exception as e:
-            print(f"Failed to launch Tempo: {e}")
-    def launch_email(self):
-        try:
-            subprocess.Popen([sys.executable, "Applications/franmail.py"])
-        except Exception as e:
-            print(f"Failed to launch Franmail: {e}")
-    def launch_runner(self):
-        try:
-            subprocess.Popen([sys.executable, "Applications/games/runner.py"])
-        except Exception as e:
-            print(f"Failed to launch Runner: {e}")
 if __name__ == "__main__":
     taskbar = Taskbar()
     taskbar.mainloop()
@@ -0,0 +1,170 @@
+# Copyright 2025 the FranchukOS project authors.
+# Contributed under the Apache License, Version 2.0.
+
+import hashlib
+import os
+import queue
+import threading
+
+from PIL import Image, ImageSequence, ImageTk
+
+CACHE_DIR = "cache/wallpapers"
+
+
+class WallpaperCache:
+    """Disk cache of wallpapers already scaled to the screen.
+
+    Renditions are keyed by (path, mtime, file size, screen size), so a
+    wallpaper is only decoded and LANCZOS-resized once; later loads just
+    decode the cached file.
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR, max_entries=64):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+
+    def key(self, path, size):
+        st = os.stat(path)
+        raw = f"{os.path.abspath(path)}|{st.st_mtime_ns}|{st.st_size}|{size[0]}x{size[1]}"
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def load(self, path, size):
+        """Return a PIL image of ``path`` scaled to ``size``."""
+        cached = os.path.join(self.cache_dir, self.key(path, size) + ".jpg")
+        if os.path.exists(cached):
+            try:
+                img = Image.open(cached)
+                img.load()
+                return img
+            except OSError:
+                pass  # corrupt entry; rebuild it below
+        img = Image.open(path).convert("RGB").resize(size, Image.LANCZOS)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = cached + ".tmp"
+            img.save(tmp_path, "JPEG", quality=92)
+            os.replace(tmp_path, cached)
+            self.prune()
+        except OSError as e:
+            print(f"Could not cache wallpaper {path}: {e}")
+        return img
+
+    def prune(self):
+        try:
+            entries = [os.path.join(self.cache_dir, f) for f in os.listdir(self.cache_dir) if f.endswith(".jpg")]
+        except OSError:
+            return
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort(key=os.path.getmtime)
+        for path in entries[:len(entries) - self.max_entries]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+class AnimationPlayer:
+    """Plays an animated image on a Tk label without decoding it all up front.
+
+    A background thread decodes and scales frames into a small ring buffer;
+    the Tk side pulls one frame per tick. Animations whose scaled frames fit
+    in ``memory_budget`` are kept after the first pass and then replay without
+    decoding at all, so a paused player can be restarted for free.
+    """
+
+    def __init__(self, root, path, size, buffer_frames=8, memory_budget=64 * 1024 * 1024):
+        self.root = root
+        self.path = path
+        self.size = size
+        with Image.open(path) as img:
+            self.frame_count = getattr(img, "n_frames", 1)
+        self.keep_frames = self.frame_count * size[0] * size[1] * 3 <= memory_budget
+        self.frames = []
+        self.durations = []
+        self.complete = False
+        self.label = None
+        self.index = 0
+        self._buffer = queue.Queue(maxsize=buffer_frames)
+        self._photo = None
+        self._thread = None
+        self._stop = threading.Event()
+        self._job = None
+
+    def start(self, label):
+        self.stop()
+        self.label = label
+        self._stop = threading.Event()
+        if not self.complete:
+            self.index = 0
+            self.frames = []
+            self.durations = []
+            self._buffer = queue.Queue(maxsize=self._buffer.maxsize)
+            self._thread = threading.Thread(target=self._decode, args=(self._stop, self._buffer), daemon=True)
+            self._thread.start()
+        self._tick()
+
+    def stop(self):
+        self._stop.set()
+        if self._job is not None:
+            try:
+                self.root.after_cancel(self._job)
+            except Exception:
+                pass
+            self._job = None
+
+    def _decode(self, stop, buffer):
+        try:
+            while not stop.is_set():
+                with Image.open(self.path) as img:
+                    for frame in ImageSequence.Iterator(img):
+                        duration = frame.info.get("duration", 100) or 100
+                        scaled = frame.convert("RGB").resize(self.size, Image.LANCZOS)
+                        while not stop.is_set():
+                            try:
+                                buffer.put((scaled, duration), timeout=0.5)
+                                break
+                            except queue.Full:
+                                continue
+                        if stop.is_set():
+                            return
+                buffer.put((None, 0))  # end of one pass
+                if self.keep_frames:
+                    return
+        except Exception as e:
+            print(f"Animation decode error for {self.path}: {e}")
+
+    def _tick(self):
+        self._job = None
+        if self._stop.is_set() or self.label is None:
+            return
+        if self.complete:
+            self.label.config(image=self.frames[self.index])
+            delay = self.durations[self.index]
+            self.index = (self.index + 1) % len(self.frames)
+            self._job = self.root.after(delay, self._tick)
+            return
+        try:
+            scaled, duration = self._buffer.get_nowait()
+        except queue.Empty:
+            self._job = self.root.after(10, self._tick)  # decoder is catching up
+            return
+        if scaled is None:
+            if self.keep_frames and self.frames:
+                self.complete = True
+                self.index = 0
+            self._job = self.root.after(0, self._tick)
+            return
+        if self.keep_frames:
+            photo = ImageTk.PhotoImage(scaled)
+            self.frames.append(photo)
+            self.durations.append(duration)
+            self.label.config(image=photo)
+        else:
+            # stream mode reuses one Tk image and pastes each frame into it
+            if self._photo is None:
+                self._photo = ImageTk.PhotoImage(scaled)
+            else:
+                self._photo.paste(scaled)
+            self.label.config(image=self._photo)
+        self._job = self.root.after(duration, self._tick)
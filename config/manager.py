@@ -1,8 +1,16 @@
 # Copyright 2025 the FranchukOS project authors.
 # Contributed under the Apache License, Version 2.0.
 
+import ctypes
+import ctypes.util
 import json
 import os
+import select
+import struct
+import sys
+import threading
+from dataclasses import dataclass
+from typing import Any
 
 CONFIG_PATH = "config/settings.json"
 PROFILES_PATH = "config/profiles.json"
@@ -21,8 +29,11 @@ def load_config():
 
 def save_config(config_data):
     """Save the system settings to the settings.json file."""
-    with open(CONFIG_PATH, "w") as file:
+    # Write to a temp file and rename so watchers never see a partial file.
+    tmp_path = CONFIG_PATH + ".tmp"
+    with open(tmp_path, "w") as file:
         json.dump(config_data, file, indent=4)
+    os.replace(tmp_path, CONFIG_PATH)
 
 def load_profiles():
     """Load user profiles from the profiles.json file."""
@@ -44,3 +55,151 @@ def save_profiles(profiles_data):
     """Save user profiles to the profiles.json file."""
     with open(PROFILES_PATH, "w") as file:
         json.dump(profiles_data, file, indent=4)
+
+# Events we care about on the config directory. settings.json is replaced
+# atomically by save_config(), which shows up as IN_MOVED_TO; editors that
+# write in place finish with IN_CLOSE_WRITE.
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_INOTIFY_EVENT = struct.Struct("iIII")
+
+
+@dataclass(frozen=True)
+class ConfigChange:
+    """A single settings key that changed between two reads of the config file."""
+    key: str
+    old: Any
+    new: Any
+
+
+def _load_inotify():
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        libc.inotify_init1
+        libc.inotify_add_watch
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+
+class ConfigWatcher:
+    """Watch the settings file and publish per-key ConfigChange events.
+
+    On Linux the watcher blocks on inotify, so nothing runs until the file is
+    actually written; elsewhere it falls back to a cheap mtime/size stat loop.
+    The file is only parsed when it changed. Callbacks are handed to
+    ``dispatch`` (e.g. a function that schedules them on the Tk loop) instead
+    of being called from the watcher thread.
+    """
+
+    def __init__(self, path=CONFIG_PATH, dispatch=None, poll_interval=2.0, use_inotify=True):
+        self.path = os.path.abspath(path)
+        self.dispatch = dispatch or (lambda fn: fn())
+        self.poll_interval = poll_interval
+        self.use_inotify = use_inotify
+        self.config = {}
+        self._subscribers = {}
+        self._signature = None
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+        self._wake_r = self._wake_w = None
+        self.backend = None
+
+    def subscribe(self, key, callback):
+        """Call ``callback(change)`` when ``key`` changes; ``None`` means any key."""
+        self._subscribers.setdefault(key, []).append(callback)
+
+    def start(self):
+        self.config = self._read() or {}
+        libc = _load_inotify() if self.use_inotify else None
+        if libc is not None:
+            fd = libc.inotify_init1(os.O_CLOEXEC)
+            directory = os.path.dirname(self.path).encode()
+            mask = _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+            if fd >= 0 and libc.inotify_add_watch(fd, directory, mask) >= 0:
+                self.backend = "inotify"
+                self._wake_r, self._wake_w = os.pipe()
+                self._thread = threading.Thread(target=self._inotify_loop, args=(fd,), daemon=True)
+            elif fd >= 0:
+                os.close(fd)
+        if self._thread is None:
+            self.backend = "stat"
+            self._thread = threading.Thread(target=self._poll_loop, daemon=True)
+        self._thread.start()
+        return self.config
+
+    def stop(self):
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        if self._wake_w is not None:
+            os.write(self._wake_w, b"x")
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+
+    def check(self):
+        """Re-read the file if it changed and publish the differences."""
+        new = self._read()
+        if new is None:
+            return []
+        with self._lock:
+            old, self.config = self.config, new
+        changes = [ConfigChange(key, old.get(key), new.get(key))
+                   for key in sorted(set(old) | set(new)) if old.get(key) != new.get(key)]
+        for change in changes:
+            for callback in self._subscribers.get(change.key, []) + self._subscribers.get(None, []):
+                self.dispatch(lambda cb=callback, c=change: cb(c))
+        return changes
+
+    def _file_signature(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _read(self):
+        signature = self._file_signature()
+        if signature is None or signature == self._signature:
+            return None
+        try:
+            with open(self.path, "r") as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            # half-written or invalid file; keep the last good config
+            return None
+        self._signature = signature
+        return data if isinstance(data, dict) else {}
+
+    def _poll_loop(self):
+        while not self._stop.wait(self.poll_interval):
+            self.check()
+
+    def _inotify_loop(self, fd):
+        name = os.path.basename(self.path).encode()
+        try:
+            while not self._stop.is_set():
+                # blocks until the directory changes or stop() wakes us up
+                readable, _, _ = select.select([fd, self._wake_r], [], [])
+                if self._wake_r in readable:
+                    break
+                buf = os.read(fd, 4096)
+                offset = 0
+                relevant = False
+                while offset + _INOTIFY_EVENT.size <= len(buf):
+                    _, _, _, length = _INOTIFY_EVENT.unpack_from(buf, offset)
+                    offset += _INOTIFY_EVENT.size
+                    if buf[offset:offset + length].rstrip(b"\0") == name:
+                        relevant = True
+                    offset += length
+                if relevant:
+                    self.check()
+        finally:
+            os.close(fd)
+            os.close(self._wake_r)
+            os.close(self._wake_w)
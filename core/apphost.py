@@ -0,0 +1,373 @@
+# Copyright 2025 the FranchukOS project authors.
+# Contributed under the Apache License, Version 2.0.
+
+"""Warm application hosts.
+
+Starting a Qt or Tk app as its own process pays for a fresh interpreter and
+the toolkit import on every launch. Instead the desktop keeps one worker per
+toolkit running (``python -m core.apphost qt|tk <address>``) with the app
+modules already imported. Launch requests go over a local
+``multiprocessing.connection`` socket and the worker opens the window
+in-process, reporting back when windows open and close so the desktop's
+WindowManager can track them.
+"""
+
+import logging
+import os
+import subprocess
+import sys
+import threading
+import time
+from multiprocessing.connection import Client, Listener, arbitrary_address
+
+log = logging.getLogger("franchukos.apphost")
+
+TOOLKITS = ("qt", "tk")
+AUTHKEY_ENV = "FRANCHUKOS_APPHOST_KEY"
+CONNECT_TIMEOUT = 15.0
+
+
+class RemoteWindow:
+    """Stands in for a window that lives in an app host.
+
+    Implements the small part of the Toplevel interface the WindowManager
+    uses, forwarding each call to the host.
+    """
+
+    def __init__(self, host, name):
+        self.host = host
+        self.name = name
+        self.alive = True
+
+    def withdraw(self):
+        self.host.send({"op": "hide", "name": self.name})
+
+    def deiconify(self):
+        self.host.send({"op": "show", "name": self.name})
+
+    def destroy(self):
+        self.alive = False
+        self.host.send({"op": "close", "name": self.name})
+
+    def winfo_exists(self):
+        return self.alive and self.host.running()
+
+    def grab_set(self):
+        pass
+
+
+class AppHost:
+    """Desktop side of one warm worker process."""
+
+    def __init__(self, toolkit, on_event, dispatch):
+        self.toolkit = toolkit
+        self.on_event = on_event
+        self.dispatch = dispatch
+        self.process = None
+        self.conn = None
+        self.pending = []
+        self.failed = False
+        self.lock = threading.Lock()
+
+    def start(self):
+        family = "AF_PIPE" if sys.platform == "win32" else "AF_UNIX"
+        self.address = arbitrary_address(family)
+        self.authkey = os.urandom(16)
+        env = dict(os.environ, **{AUTHKEY_ENV: self.authkey.hex()})
+        try:
+            self.process = subprocess.Popen(
+                [sys.executable, "-m", "core.apphost", self.toolkit, self.address], env=env)
+        except OSError as e:
+            print(f"Could not start {self.toolkit} app host: {e}")
+            self.failed = True
+            return
+        threading.Thread(target=self._connect, name=f"apphost-{self.toolkit}", daemon=True).start()
+
+    def running(self):
+        return not self.failed and self.process is not None and self.process.poll() is None
+
+    def send(self, message):
+        """Send ``message`` now, or queue it until the worker is connected.
+
+        Returns False if the worker is gone and the caller should fall back.
+        """
+        with self.lock:
+            if not self.running():
+                return False
+            if self.conn is None:
+                self.pending.append(message)
+                return True
+            try:
+                self.conn.send(message)
+                return True
+            except OSError:
+                self.failed = True
+                return False
+
+    def stop(self):
+        self.send({"op": "quit"})
+        if self.process is not None:
+            try:
+                self.process.wait(timeout=2)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+
+    def _connect(self):
+        deadline = time.monotonic() + CONNECT_TIMEOUT
+        conn = None
+        while conn is None and time.monotonic() < deadline and self.process.poll() is None:
+            try:
+                conn = Client(self.address, authkey=self.authkey)
+            except OSError:
+                time.sleep(0.05)
+        with self.lock:
+            if conn is None:
+                self.failed = True
+                pending, self.pending = self.pending, []
+            else:
+                self.conn = conn
+                pending = []
+                try:
+                    for message in self.pending:
+                        conn.send(message)
+                except OSError:
+                    self.failed = True
+                self.pending = []
+        if conn is None:
+            print(f"{self.toolkit} app host did not come up; launching apps as processes")
+            # Anything queued while waiting is handed back so it still launches
+            for message in pending:
+                if message.get("op") == "launch":
+                    self.dispatch(self.on_event, self, {"event": "failed", "name": message["name"],
+                                                        "error": "host unavailable"})
+            return
+        self._read(conn)
+
+    def _read(self, conn):
+        while True:
+            try:
+                event = conn.recv()
+            except (EOFError, OSError):
+                break
+            self.dispatch(self.on_event, self, event)
+        self.failed = True
+        self.dispatch(self.on_event, self, {"event": "exited"})
+
+
+class AppHostPool:
+    """Keeps one warm worker per toolkit and routes launches to them."""
+
+    def __init__(self, window_manager, dispatch, toolkits=TOOLKITS):
+        self.window_manager = window_manager
+        self.hosts = {toolkit: AppHost(toolkit, self.on_event, dispatch) for toolkit in toolkits}
+        self.launching = {}
+
+    def start(self):
+        for host in self.hosts.values():
+            host.start()
+
+    def stop(self):
+        for host in self.hosts.values():
+            host.stop()
+
+    def launch(self, entry, fallback):
+        """Open ``entry`` in its host; ``fallback()`` runs if the host can't."""
+        host = self.hosts.get(entry.host)
+        if host is None:
+            return fallback()
+        if entry.name in self.launching:
+            return None
+        if entry.name in self.window_manager.open_windows:
+            return self.window_manager.switch_to_window(entry.name)
+        if not host.send({"op": "launch", "name": entry.name}):
+            return fallback()
+        self.launching[entry.name] = (host, time.perf_counter(), fallback)
+
+    def on_event(self, host, event):
+        kind = event.get("event")
+        name = event.get("name")
+        if kind == "opened":
+            _, started, _ = self.launching.pop(name, (None, None, None))
+            if started is not None:
+                log.info("%s opened in the %s host in %.0f ms", name, host.toolkit,
+                         (time.perf_counter() - started) * 1000)
+            self.window_manager.track_window(name, RemoteWindow(host, name))
+        elif kind == "closed":
+            self.window_manager.forget_window(name)
+        elif kind == "failed":
+            print(f"App host could not open {name}: {event.get('error')}")
+            _, _, fallback = self.launching.pop(name, (None, None, None))
+            if fallback is not None:
+                fallback()
+        elif kind == "exited":
+            for name, window in list(self.window_manager.open_windows.items()):
+                if isinstance(window, RemoteWindow) and window.host is host:
+                    self.window_manager.forget_window(name)
+            for name in [n for n, (h, _, _) in self.launching.items() if h is host]:
+                _, _, fallback = self.launching.pop(name)
+                fallback()
+
+
+# ---- worker side ----
+
+class Worker:
+    """Runs inside the host process and opens windows on request."""
+
+    def __init__(self, toolkit, address, authkey):
+        from core.apps import APPS
+        self.toolkit = toolkit
+        self.address = address
+        self.authkey = authkey
+        self.entries = [entry for entry in APPS if entry.host == toolkit]
+        self.windows = {}
+        self.conn = None
+
+    def preimport(self):
+        from core.apps import registry
+        for entry in self.entries:
+            try:
+                registry.load(entry.name)
+            except Exception as e:
+                print(f"App host could not preload {entry.name}: {e}")
+
+    def listen(self, post):
+        """Accept the desktop's connection and hand each request to ``post``."""
+        with Listener(self.address, authkey=self.authkey) as listener:
+            self.conn = listener.accept()
+        while True:
+            try:
+                message = self.conn.recv()
+            except (EOFError, OSError):
+                break
+            post(message)
+            if message.get("op") == "quit":
+                return
+        post({"op": "quit"})
+
+    def reply(self, **event):
+        try:
+            self.conn.send(event)
+        except (OSError, AttributeError):
+            pass
+
+    def handle(self, message):
+        from core.apps import registry
+        op = message.get("op")
+        name = message.get("name")
+        window = self.windows.get(name)
+        if op == "launch":
+            if window is not None:
+                self.show(window)
+                self.reply(event="opened", name=name)
+                return
+            try:
+                window = self.open(registry.load(name), name)
+            except Exception as e:
+                self.reply(event="failed", name=name, error=str(e))
+                return
+            self.windows[name] = window
+            self.reply(event="opened", name=name)
+        elif op == "show" and window is not None:
+            self.show(window)
+        elif op == "hide" and window is not None:
+            self.hide(window)
+        elif op == "close" and window is not None:
+            self.close(window)
+        elif op == "quit":
+            self.quit()
+
+    def closed(self, name):
+        if self.windows.pop(name, None) is not None:
+            self.reply(event="closed", name=name)
+
+
+class QtWorker(Worker):
+    def run(self):
+        # QtWebEngine must be imported before the QApplication exists
+        self.preimport()
+        from PyQt5.QtCore import QObject, Qt, pyqtSignal
+        from PyQt5.QtWidgets import QApplication
+
+        class Bridge(QObject):
+            received = pyqtSignal(object)
+
+        self.Qt = Qt
+        # apps style their own windows; nothing here may change the shared application
+        self.app = QApplication(sys.argv[:1])
+        self.app.setQuitOnLastWindowClosed(False)
+        bridge = Bridge()
+        bridge.received.connect(self.handle)
+        threading.Thread(target=self.listen, args=(bridge.received.emit,), daemon=True).start()
+        self.app.exec_()
+
+    def open(self, factory, name):
+        window = factory()
+        window.setAttribute(self.Qt.WA_DeleteOnClose)
+        window.destroyed.connect(lambda *_: self.closed(name))
+        window.show()
+        return window
+
+    def show(self, window):
+        window.showNormal()
+        window.raise_()
+        window.activateWindow()
+
+    def hide(self, window):
+        window.hide()
+
+    def close(self, window):
+        window.close()
+
+    def quit(self):
+        self.app.quit()
+
+
+class TkWorker(Worker):
+    def run(self):
+        import tkinter as tk
+        from core.scheduler import Scheduler
+
+        self.root = tk.Tk()
+        self.root.withdraw()
+        self.preimport()
+        scheduler = Scheduler(self.root)
+        threading.Thread(target=self.listen, args=(lambda m: scheduler.call_soon_threadsafe(self.handle, m),),
+                         daemon=True).start()
+        self.root.mainloop()
+
+    def open(self, factory, name):
+        import tkinter as tk
+        # Some apps are their own Tk root, others take a parent
+        if isinstance(factory, type) and issubclass(factory, tk.Tk):
+            window = factory()
+        else:
+            try:
+                window = factory(self.root)
+            except TypeError:
+                window = factory()
+        window.bind("<Destroy>", lambda e: e.widget is window and self.closed(name), add="+")
+        return window
+
+    def show(self, window):
+        window.deiconify()
+        window.lift()
+
+    def hide(self, window):
+        window.withdraw()
+
+    def close(self, window):
+        window.destroy()
+
+    def quit(self):
+        self.root.quit()
+
+
+def main(argv):
+    toolkit, address = argv[1], argv[2]
+    authkey = bytes.fromhex(os.environ.pop(AUTHKEY_ENV))
+    worker = {"qt": QtWorker, "tk": TkWorker}[toolkit](toolkit, address, authkey)
+    worker.run()
+
+
+if __name__ == "__main__":
+    main(sys.argv)
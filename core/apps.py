@@ -0,0 +1,125 @@
+# Copyright 2025 the FranchukOS project authors.
+# Contributed under the Apache License, Version 2.0.
+
+import importlib
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class AppEntry:
+    """How to find and start one application.
+
+    ``module``/``attr`` name the window class (or factory) for in-process
+    apps; nothing is imported until the app is launched. ``mode`` is either
+    "window" (opened through the WindowManager) or "process" (``script`` is
+    started with its own interpreter, used for the Qt and pygame apps).
+    Process apps with a ``host`` toolkit ("qt" or "tk") are opened inside the
+    matching warm app host instead, and only fall back to ``script``.
+    """
+    name: str
+    module: str
+    attr: Optional[str] = None
+    mode: str = "window"
+    script: Optional[str] = None
+    icon: Optional[str] = None
+    category: Optional[str] = None
+    desktop: bool = False
+    host: Optional[str] = None
+
+
+APPS = [
+    AppEntry("Franny", "Applications.franny", "open_window", "process", "Applications/franny.py",
+             "assets/icons/apps/franny.png", "Productivity", desktop=True, host="qt"),
+    AppEntry("Franny's Pop Shop", "Applications.store", mode="process", script="Applications/store.py",
+             category="Productivity"),
+    AppEntry("Birdseye", "Applications.birdseye", "Birdseye", "process", "Applications/birdseye.py",
+             category="Productivity", host="qt"),
+    AppEntry("Sheets", "Applications.sheets", "SimpleSheet", "process", "Applications/sheets.py",
+             category="Productivity", host="tk"),
+    AppEntry("Calculator", "Applications.calculator", "Calculator", "process", "Applications/calculator.py",
+             category="Productivity", host="tk"),
+    AppEntry("Notetaking", "Applications.notetaking", mode="process", script="Applications/notetaking.py",
+             category="Productivity"),
+    AppEntry("Franmail", "Applications.franmail", "Franmail", "process", "Applications/franmail.py",
+             category="Productivity", host="tk"),
+    AppEntry("Task Manager", "Applications.taskmgr", "TaskManager", category="System"),
+    AppEntry("File Explorer", "Applications.file_explorer", "FileExplorer",
+             icon="assets/icons/apps/files.png", category="System", desktop=True),
+    AppEntry("Terminal", "Applications.terminal", "Terminal",
+             icon="assets/icons/apps/terminal.png", category="System", desktop=True),
+    AppEntry("Settings", "Applications.settings", "SettingsApp",
+             icon="assets/icons/apps/settings.png", category="System", desktop=True),
+    AppEntry("Clock", "Applications.clock", "ClockApp",
+             icon="assets/icons/apps/clock.png", category="System", desktop=True),
+    AppEntry("Franpaint", "Applications.franpaint", "Franpaint", "process", "Applications/franpaint.py",
+             "assets/icons/apps/franpaint.png", "Creative", desktop=True, host="qt"),
+    AppEntry("Insider", "Applications.insider", "Insider",
+             icon="assets/icons/apps/insider.png", category="Creative", desktop=True),
+    AppEntry("Outsider", "Applications.outsider", "Outsider",
+             icon="assets/icons/apps/viewer.png", category="Creative", desktop=True),
+    AppEntry("Tempo", "Applications.tempo", mode="process", script="Applications/tempo.py",
+             category="Creative"),
+    AppEntry("Snake", "Applications.games.snake", "snake_game",
+             icon="assets/icons/games/snake.jpg", category="Games", desktop=True),
+    AppEntry("Space Invaders", "Applications.games.spi", "SpaceInvaders",
+             icon="assets/icons/games/spi.jpg", category="Games", desktop=True),
+    AppEntry("Aloha", "Applications.games.aloha", "AlohaGameGUI",
+             icon="assets/icons/games/aloha.jpg", category="Games", desktop=True),
+    AppEntry("Minesweeper", "Applications.games.mines", mode="process", script="Applications/games/mines.py",
+             category="Games"),
+    AppEntry("Tetris", "Applications.games.tetris", mode="process", script="Applications/games/tetris.py",
+             category="Games"),
+    AppEntry("Runner", "Applications.games.runner", mode="process", script="Applications/games/runner.py",
+             category="Games"),
+]
+
+
+class AppRegistry:
+    """Looks up applications by name and imports them only when launched."""
+
+    def __init__(self, entries=APPS):
+        self.entries = {entry.name: entry for entry in entries}
+        self.load_times = {}
+
+    def get(self, name):
+        return self.entries[name]
+
+    def categories(self):
+        result = {}
+        for entry in self.entries.values():
+            if entry.category:
+                result.setdefault(entry.category, []).append(entry)
+        return result
+
+    def desktop_entries(self):
+        return [entry for entry in self.entries.values() if entry.desktop]
+
+    def load(self, name):
+        """Import the app's module and return its window class or factory."""
+        entry = self.get(name)
+        start = time.perf_counter()
+        module = importlib.import_module(entry.module)
+        if entry.name not in self.load_times:
+            self.load_times[entry.name] = time.perf_counter() - start
+        return getattr(module, entry.attr)
+
+    def launch(self, name, window_manager=None, hosts=None):
+        entry = self.get(name)
+        try:
+            if entry.mode == "process":
+                if entry.host and hosts is not None:
+                    return hosts.launch(entry, lambda: self.spawn(entry))
+                return self.spawn(entry)
+            return window_manager.open_window(entry.name, self.load(name))
+        except Exception as e:
+            print(f"Failed to launch {entry.name}: {e}")
+
+    def spawn(self, entry):
+        return subprocess.Popen([sys.executable, entry.script])
+
+
+registry = AppRegistry()
@@ -0,0 +1,99 @@
+# Copyright 2025 the FranchukOS project authors.
+# Contributed under the Apache License, Version 2.0.
+
+import importlib
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from core.startup import StartupReport
+
+
+class BootPipeline:
+    """Runs independent boot stages concurrently while the splash is up.
+
+    Each stage is a ``(name, fn)`` pair; ``fn`` takes no arguments and its
+    return value is kept in ``results`` under ``name``. A failing stage is
+    reported and recorded in ``errors`` but never stops the boot: whatever
+    it was warming is simply loaded later on demand.
+    """
+
+    def __init__(self, stages, max_workers=4, report=None):
+        self.stages = list(stages)
+        self.max_workers = max_workers
+        self.report = report or StartupReport("boot")
+        self.results = {}
+        self.errors = {}
+        self.done = threading.Event()
+        self.lock = threading.Lock()
+        self.remaining = len(self.stages)
+
+    def start(self, on_done=None):
+        """Start every stage; ``on_done()`` is called from a worker thread at the end."""
+        self.on_done = on_done
+        if not self.stages:
+            self._finish()
+            return
+        self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="boot")
+        for name, fn in self.stages:
+            self.executor.submit(self._run, name, fn)
+        self.executor.shutdown(wait=False)
+
+    def wait(self, timeout=None):
+        return self.done.wait(timeout)
+
+    def _run(self, name, fn):
+        start = time.perf_counter()
+        try:
+            self.results[name] = fn()
+        except Exception as e:
+            print(f"Boot stage {name} failed: {e}")
+            self.errors[name] = e
+        with self.lock:
+            self.report.record(name, time.perf_counter() - start)
+            self.remaining -= 1
+            finished = self.remaining == 0
+        if finished:
+            self._finish()
+
+    def _finish(self):
+        self.done.set()
+        if self.on_done is not None:
+            self.on_done()
+
+
+def preimport(*modules):
+    """Import ``modules`` so the first real import is a dictionary lookup."""
+    def stage():
+        for module in modules:
+            importlib.import_module(module)
+    return stage
+
+
+def default_stages(screen_size=None):
+    """The stages run behind the boot splash."""
+    from config.manager import load_config, load_profiles
+
+    def warm_icons():
+        from Graphics.icons import default_sources, ensure_atlas
+        sources = default_sources()
+        # 64px for the desktop, 20px for the login form, 16px for taskbar buttons
+        for size in (64, 20, 16):
+            ensure_atlas(sources, size)
+
+    def warm_wallpaper():
+        from Graphics.wallpaper import WallpaperCache
+        # Same rendition the desktop asks for, so its first load is a cache hit
+        wallpaper = load_config().get("wallpaper", "Assets/backgrounds/wallpaper.jpg")
+        if screen_size and os.path.isfile(wallpaper) and not wallpaper.lower().endswith(".gif"):
+            WallpaperCache().load(wallpaper, screen_size)
+
+    return [
+        ("config", load_config),
+        ("profiles", load_profiles),
+        ("icons", warm_icons),
+        ("wallpaper", warm_wallpaper),
+        ("login module", preimport("Graphics.login")),
+        ("desktop module", preimport("desktop", "Graphics.taskbar", "Graphics.wallpaper")),
+    ]
@@ -0,0 +1,217 @@
+# Copyright 2025 the FranchukOS project authors.
+# Contributed under the Apache License, Version 2.0.
+
+import heapq
+import itertools
+import queue
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+
+class Job:
+    """A scheduled callback. Keep the handle around to cancel it."""
+
+    def __init__(self, name, callback, args, deadline, interval=None, in_pool=False):
+        self.name = name
+        self.callback = callback
+        self.args = args
+        self.deadline = deadline
+        self.interval = interval
+        self.in_pool = in_pool
+        self.cancelled = False
+        self.busy = False
+        self.runs = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self.total_runtime = 0.0
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class Scheduler:
+    """One timer queue for every background job on a Tk root.
+
+    All jobs live in a single deadline heap and the scheduler keeps exactly one
+    ``after`` pending, for the earliest deadline. Jobs due within
+    ``coalesce_window`` of each other run in the same wakeup. Callbacks run on
+    the Tk thread; jobs marked ``in_pool`` (blocking work) run on a small
+    thread pool instead, and ``submit`` hands results back to the Tk thread.
+    """
+
+    def __init__(self, root, coalesce_window=0.015, max_workers=4, clock=time.monotonic):
+        self.root = root
+        self.coalesce_window = coalesce_window
+        self.max_workers = max_workers
+        self.clock = clock
+        self.wakeups = 0
+        self._heap = []
+        self._jobs = set()
+        self._seq = itertools.count()
+        self._after_id = None
+        self._armed_deadline = None
+        self._pool = None
+        self._inbox = queue.SimpleQueue()
+        self._owner = threading.get_ident()
+
+    def call_later(self, delay, callback, *args, name=None):
+        job = Job(name or getattr(callback, "__name__", "job"), callback, args, self.clock() + delay)
+        self._push(job)
+        return job
+
+    def call_every(self, interval, callback, *args, name=None, in_pool=False, delay=None):
+        first = self.clock() + (interval if delay is None else delay)
+        job = Job(name or getattr(callback, "__name__", "job"), callback, args, first, interval, in_pool)
+        self._push(job)
+        return job
+
+    def cancel(self, job):
+        if job is not None:
+            job.cancel()
+            self._jobs.discard(job)
+
+    def call_soon_threadsafe(self, callback, *args):
+        """Run ``callback`` on the Tk thread; safe to call from any thread."""
+        self._inbox.put((callback, args))
+        if threading.get_ident() == self._owner:
+            self._arm(self.clock())
+            return
+        try:
+            self.root.after(0, self._drain_inbox)
+        except RuntimeError:
+            pass  # main loop not running yet; the next wakeup drains the inbox
+
+    def submit(self, fn, *args, callback=None):
+        """Run blocking ``fn`` on the pool and pass its result to ``callback`` on the Tk thread."""
+        future = self._executor().submit(fn, *args)
+        if callback is not None:
+            def done(f):
+                if f.exception() is None:
+                    self.call_soon_threadsafe(callback, f.result())
+                else:
+                    print(f"Background job {getattr(fn, '__name__', fn)} failed: {f.exception()}")
+            future.add_done_callback(done)
+        return future
+
+    def stats(self):
+        jobs = {}
+        for job in list(self._jobs):
+            runs = job.runs or 1
+            jobs[job.name] = {
+                "runs": job.runs,
+                "interval": job.interval,
+                "avg_latency_ms": round(job.total_latency / runs * 1000, 3),
+                "max_latency_ms": round(job.max_latency * 1000, 3),
+                "avg_runtime_ms": round(job.total_runtime / runs * 1000, 3),
+            }
+        return {"scheduled": len(self._jobs), "wakeups": self.wakeups, "jobs": jobs}
+
+    def shutdown(self):
+        for job in list(self._jobs):
+            job.cancel()
+        self._jobs.clear()
+        self._heap.clear()
+        if self._after_id is not None:
+            try:
+                self.root.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+
+    def _executor(self):
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="scheduler")
+        return self._pool
+
+    def _push(self, job):
+        self._jobs.add(job)
+        heapq.heappush(self._heap, (job.deadline, next(self._seq), job))
+        self._arm(job.deadline)
+
+    def _arm(self, deadline):
+        if self._armed_deadline is not None and self._armed_deadline <= deadline:
+            return  # an earlier wakeup is already pending
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+        delay_ms = max(0, int((deadline - self.clock()) * 1000))
+        self._after_id = self.root.after(delay_ms, self._wakeup)
+        self._armed_deadline = deadline
+
+    def _wakeup(self):
+        self._after_id = None
+        self._armed_deadline = None
+        self.wakeups += 1
+        now = self.clock()
+        horizon = now + self.coalesce_window
+        while self._heap and self._heap[0][0] <= horizon:
+            deadline, _, job = heapq.heappop(self._heap)
+            if job.cancelled:
+                continue
+            self._run(job, max(0.0, now - deadline))
+            if job.interval and not job.cancelled:
+                # keep periodic jobs on their original grid; skip missed periods
+                job.deadline = deadline + job.interval
+                if job.deadline <= now:
+                    job.deadline = now + job.interval
+                heapq.heappush(self._heap, (job.deadline, next(self._seq), job))
+            else:
+                self._jobs.discard(job)
+        self._drain_inbox()
+        while self._heap and self._heap[0][2].cancelled:
+            heapq.heappop(self._heap)
+        if self._heap:
+            self._arm(self._heap[0][0])
+
+    def _run(self, job, latency):
+        job.runs += 1
+        job.total_latency += latency
+        job.max_latency = max(job.max_latency, latency)
+        if job.in_pool:
+            if job.busy:
+                return  # previous run still going; don't pile up
+            job.busy = True
+            self._executor().submit(self._run_in_pool, job)
+            return
+        start = self.clock()
+        try:
+            job.callback(*job.args)
+        except Exception:
+            print(f"Scheduled job {job.name} failed:")
+            traceback.print_exc()
+        job.total_runtime += self.clock() - start
+
+    def _run_in_pool(self, job):
+        start = self.clock()
+        try:
+            job.callback(*job.args)
+        except Exception:
+            print(f"Scheduled job {job.name} failed:")
+            traceback.print_exc()
+        finally:
+            job.total_runtime += self.clock() - start
+            job.busy = False
+
+    def _drain_inbox(self):
+        while True:
+            try:
+                callback, args = self._inbox.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                callback(*args)
+            except Exception:
+                traceback.print_exc()
+
+
+def get_scheduler(widget):
+    """Return the shared scheduler for the Tk root that owns ``widget``."""
+    root = widget._root()
+    scheduler = getattr(root, "scheduler", None)
+    if scheduler is None:
+        scheduler = Scheduler(root)
+        root.scheduler = scheduler
+    return scheduler
@@ -0,0 +1,41 @@
+# Copyright 2025 the FranchukOS project authors.
+# Contributed under the Apache License, Version 2.0.
+
+import logging
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger("franchukos.startup")
+
+
+class StartupReport:
+    """Collects how long each startup stage took."""
+
+    def __init__(self, name="startup"):
+        self.name = name
+        self.started = time.perf_counter()
+        self.stages = []
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def record(self, name, seconds):
+        self.stages.append((name, seconds))
+        logger.debug("%s: %s took %.1f ms", self.name, name, seconds * 1000)
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def report(self):
+        lines = [f"{self.name}: {self.elapsed() * 1000:.1f} ms total"]
+        for name, seconds in self.stages:
+            lines.append(f"  {name:<24} {seconds * 1000:8.1f} ms")
+        return "\n".join(lines)
+
+    def log(self):
+        logger.info(self.report())
@@ -2,23 +2,16 @@
 # Contributed under the Apache License, Version 2.0.
 
 import tkinter as tk
-from PIL import Image, ImageTk, ImageSequence
-from Graphics.taskbar import Taskbar, WindowManager
+from PIL import Image, ImageTk
+from Graphics.taskbar import Taskbar
 from Graphics.utils import set_background_image, set_background_color
-from Applications.file_explorer import FileExplorer
-from Applications.terminal import Terminal
-from Applications.settings import SettingsApp
-from Applications.clock import ClockApp
-from Applications.insider import Insider
-from Applications.outsider import Outsider
-from Applications.franny import FrannyBrowser
-from Applications.franpaint import Franpaint
-from Applications.games.snake import snake_game as SnakeGame
-from Applications.games.spi import SpaceInvaders
-from Applications.games.aloha import AlohaGameGUI as Aloha
-import threading
+from Graphics.wallpaper import WallpaperCache, AnimationPlayer
+from Graphics.icons import get_icon_service
+from core.apps import registry
+from core.startup import StartupReport
 import time
-from config.manager import load_config
+from config.manager import ConfigWatcher
+from core.scheduler import get_scheduler
 from core.thememanage import apply_theme
 import random
 import itertools
@@ -26,32 +19,44 @@ import os
 
 class Desktop(tk.Tk):
     def __init__(self):
-        super().__init__()
+        self.startup_report = StartupReport("desktop")
+        with self.startup_report.stage("tk window"):
+            super().__init__()
         self.title("Desktop")
         self.attributes("-fullscreen", True)
         self.bind("<Escape>", lambda e: self.attributes("-fullscreen", False))
 
-        self.window_manager = WindowManager(self)
-        self.taskbar = Taskbar(self)
+        # Every desktop timer goes through this one scheduler on the Tk loop
+        self.scheduler = get_scheduler(self)
+
+        with self.startup_report.stage("taskbar"):
+            self.taskbar = Taskbar(self)
+        self.window_manager = self.taskbar.window_manager
 
         self.icons = []
-        self.icon_images = [] 
+        self.icon_service = get_icon_service(self)
         self.wallpaper_label = None
         self.current_wallpaper = None
         self.current_theme = None
-        self.config = load_config()
-        if not isinstance(self.config, dict):
-            self.config = {}
+        # Config changes arrive as events on the Tk loop; nothing polls the file.
+        self.config_watcher = ConfigWatcher(dispatch=self.scheduler.call_soon_threadsafe)
+        with self.startup_report.stage("config"):
+            self.config = self.config_watcher.start()
 
         # Dynamic wallpaper attributes
+        self.wallpaper_cache = WallpaperCache()
         self.wallpaper_frames = None
-        self.wallpaper_index = 0
-        self.wallpaper_animating = False
-
-        self.set_wallpaper(self.config.get("wallpaper", "Assets/backgrounds/wallpaper.jpg"))
-        apply_theme(self, self.config.get("theme", "light"))
-        self.poll_wallpaper_config()
-        self.setup_ui()
+        self.wallpaper_player = None
+        self.slideshow_job = None
+        self.screensaver_player = None
+
+        with self.startup_report.stage("wallpaper"):
+            self.set_wallpaper(self.config.get("wallpaper", "Assets/backgrounds/wallpaper.jpg"))
+        self.current_theme = self.config.get("theme", "light")
+        apply_theme(self, self.current_theme)
+        self.watch_config()
+        with self.startup_report.stage("icons"):
+            self.setup_ui()
 
         # Screensaver
         self.screensaver_timeout = int(self.config.get("screensaver_timeout", 300))
@@ -65,33 +70,45 @@ class Desktop(tk.Tk):
 
         # Panic 
         self.start_kernel_panic()
+
+        # Report once the first frame has actually been drawn
+        self._constructed_at = time.perf_counter()
+        self.after_idle(self.finish_startup)
+
+    def finish_startup(self):
+        self.update_idletasks()
+        self.startup_report.record("first draw", time.perf_counter() - self._constructed_at)
+        print(self.startup_report.report())
  
-    def poll_wallpaper_config(self):
-        def watcher():
-            while True:
-                try:
-                    config = load_config()
-                    if not isinstance(config, dict):
-                        config = {}
-                    wallpaper = config.get("wallpaper", "Assets/backgrounds/wallpaper.jpg")
-                    if wallpaper != self.current_wallpaper:
-                        self.set_wallpaper(wallpaper)
-                    theme = config.get("theme", "light")
-                    if theme != self.current_theme:
-                        self.current_theme = theme
-                        apply_theme(self, theme)
-                    time.sleep(2)
-                except Exception as e:
-                    print(f"Wallpaper/theme watcher error: {e}")
-                    time.sleep(2)
-        threading.Thread(target=watcher, daemon=True).start()
+    def watch_config(self):
+        self.config_watcher.subscribe("wallpaper", self.on_wallpaper_changed)
+        self.config_watcher.subscribe("theme", self.on_theme_changed)
+
+    def on_wallpaper_changed(self, change):
+        wallpaper = change.new or "Assets/backgrounds/wallpaper.jpg"
+        if wallpaper != self.current_wallpaper:
+            self.set_wallpaper(wallpaper)
+
+    def on_theme_changed(self, change):
+        theme = change.new or "light"
+        if theme != self.current_theme:
+            self.current_theme = theme
+            apply_theme(self, theme)
+
+    def screen_size(self):
+        return (self.winfo_screenwidth(), self.winfo_screenheight())
 
     def set_wallpaper(self, path):
         """Supports static images, animated GIFs, and folder slideshows."""
         try:
             self.current_wallpaper = path
             self.wallpaper_frames = None
-            self.wallpaper_animating = False
+            if self.wallpaper_player:
+                self.wallpaper_player.stop()
+                self.wallpaper_player = None
+            if self.slideshow_job:
+                self.scheduler.cancel(self.slideshow_job)
+                self.slideshow_job = None
 
             if os.path.isdir(path):
                 images = [os.path.join(path, f) for f in os.listdir(path) if f.lower().endswith((".jpg", ".png"))]
@@ -101,85 +118,56 @@ class Desktop(tk.Tk):
                 self.animate_slideshow()
                 return
 
-            img = Image.open(path)
-            if getattr(img, "is_animated", False):  
-                self.wallpaper_frames = [ImageTk.PhotoImage(frame.resize(
-                    (self.winfo_screenwidth(), self.winfo_screenheight()), Image.LANCZOS)) 
-                    for frame in ImageSequence.Iterator(img)]
-                self.wallpaper_index = 0
-                self.wallpaper_animating = True
-                if not self.wallpaper_label:
-                    self.wallpaper_label = tk.Label(self, bd=0)
-                    self.wallpaper_label.place(x=0, y=0, relwidth=1, relheight=1)
-                self.animate_wallpaper()
+            with Image.open(path) as img:
+                animated = getattr(img, "is_animated", False)
+            if animated:
+                # frames are decoded in the background instead of all up front
+                self.ensure_wallpaper_label()
+                self.wallpaper_player = AnimationPlayer(self, path, self.screen_size())
+                self.wallpaper_player.start(self.wallpaper_label)
                 return
 
-            img = img.resize((self.winfo_screenwidth(), self.winfo_screenheight()), Image.LANCZOS)
-            self.wallpaper_photo = ImageTk.PhotoImage(img)
-            if self.wallpaper_label:
-                self.wallpaper_label.config(image=self.wallpaper_photo)
-            else:
-                self.wallpaper_label = tk.Label(self, image=self.wallpaper_photo, bd=0)
-                self.wallpaper_label.place(x=0, y=0, relwidth=1, relheight=1)
-            self.wallpaper_label.lower()
+            self.show_wallpaper_image(self.wallpaper_cache.load(path, self.screen_size()))
         except Exception as e:
             print(f"Could not load wallpaper from {path}: {e}")
             self.configure(bg="black")
 
-    def animate_wallpaper(self):
-        if not self.wallpaper_animating or not self.wallpaper_frames:
-            return
-        frame = self.wallpaper_frames[self.wallpaper_index]
-        self.wallpaper_label.config(image=frame)
-        self.wallpaper_index = (self.wallpaper_index + 1) % len(self.wallpaper_frames)
-        self.after(100, self.animate_wallpaper)  
+    def ensure_wallpaper_label(self):
+        if not self.wallpaper_label:
+            self.wallpaper_label = tk.Label(self, bd=0)
+            self.wallpaper_label.place(x=0, y=0, relwidth=1, relheight=1)
+        self.wallpaper_label.lower()
+
+    def show_wallpaper_image(self, img):
+        self.wallpaper_photo = ImageTk.PhotoImage(img)
+        self.ensure_wallpaper_label()
+        self.wallpaper_label.config(image=self.wallpaper_photo)
 
     def animate_slideshow(self):
+        self.slideshow_job = None
         if not self.wallpaper_frames:
             return
         path = next(self.wallpaper_frames)
         try:
-            img = Image.open(path).resize((self.winfo_screenwidth(), self.winfo_screenheight()), Image.LANCZOS)
-            self.wallpaper_photo = ImageTk.PhotoImage(img)
-            if self.wallpaper_label:
-                self.wallpaper_label.config(image=self.wallpaper_photo)
-            else:
-                self.wallpaper_label = tk.Label(self, image=self.wallpaper_photo, bd=0)
-                self.wallpaper_label.place(x=0, y=0, relwidth=1, relheight=1)
-            self.wallpaper_label.lower()
+            self.show_wallpaper_image(self.wallpaper_cache.load(path, self.screen_size()))
         except Exception as e:
             print(f"Slideshow error: {e}")
-        self.after(8000, self.animate_slideshow)  
+        self.slideshow_job = self.scheduler.call_later(8, self.animate_slideshow, name="wallpaper slideshow")
 
     def setup_ui(self):
         self.icon_container = tk.Frame(self, bg="", bd=0)
         self.icon_container.place(relx=0, rely=0)
-        apps = [
-            ("Terminal", "assets/icons/apps/terminal.png", Terminal),
-            ("File Explorer", "assets/icons/apps/files.png", FileExplorer),
-            ("Settings", "assets/icons/apps/settings.png", SettingsApp),
-            ("Clock", "assets/icons/apps/clock.png", ClockApp),
-            ("Insider", "assets/icons/apps/insider.png", Insider),
-            ("Outsider", "assets/icons/apps/viewer.png", Outsider),
-            ("Franny", "assets/icons/apps/franny.png", FrannyBrowser),
-            ("Snake", "assets/icons/games/snake.jpg", SnakeGame),
-            ("Space Invaders", "assets/icons/games/spi.jpg", SpaceInvaders),
-            ("Aloha", "assets/icons/games/aloha.jpg", Aloha),
-            ("Franpaint", "assets/icons/apps/franpaint.png", Franpaint),
-        ]
-
-        for idx, (name, icon_path, app_class) in enumerate(apps):
-            self.create_icon(name, icon_path, app_class, row=idx//5, col=idx%5)
+        for idx, entry in enumerate(registry.desktop_entries()):
+            self.create_icon(entry.name, entry.icon, row=idx//5, col=idx%5)
 
         self.taskbar.lift()
         self.taskbar.pack(side=tk.BOTTOM, fill=tk.X)
 
-    def create_icon(self, name, icon_path, app_class, row, col):
-        try:
-            icon_img = Image.open(icon_path).resize((64, 64), Image.LANCZOS)
-            icon_photo = ImageTk.PhotoImage(icon_img)
-        except Exception as e:
-            print(f"Failed to load icon '{name}' from {icon_path}: {e}")
+    def create_icon(self, name, icon_path, row, col):
+        # The icon service cuts this out of the shared 64px atlas and keeps the reference
+        icon_photo = self.icon_service.get(name, 64)
+        if icon_photo is None:
+            print(f"Failed to load icon '{name}' from {icon_path}")
             return
 
         icon_frame = tk.Frame(self.icon_container, bg="#000000", bd=0)
@@ -188,7 +176,7 @@ class Desktop(tk.Tk):
         icon_button = tk.Button(
             icon_frame,
             image=icon_photo,
-            command=lambda: self.window_manager.launch(app_class),
+            command=lambda: self.taskbar.launch_app(name),
             bd=0,
             bg="#000000",
             activebackground="#222222"
@@ -199,7 +187,6 @@ class Desktop(tk.Tk):
         label.pack()
 
         self.icons.append(icon_frame)
-        self.icon_images.append(icon_photo)  
 
     def reset_screensaver_timer(self, event=None):
         self.last_activity = time.time()
@@ -207,12 +194,11 @@ class Desktop(tk.Tk):
             self.deactivate_screensaver()
 
     def start_screensaver_timer(self):
-        def check():
-            while True:
-                if not self.screensaver_active and (time.time() - self.last_activity > self.screensaver_timeout):
-                    self.activate_screensaver()
-                time.sleep(2)
-        threading.Thread(target=check, daemon=True).start()
+        self.screensaver_job = self.scheduler.call_every(2, self.check_screensaver, name="screensaver")
+
+    def check_screensaver(self):
+        if not self.screensaver_active and (time.time() - self.last_activity > self.screensaver_timeout):
+            self.activate_screensaver()
 
     def activate_screensaver(self):
         self.screensaver_active = True
@@ -226,25 +212,21 @@ class Desktop(tk.Tk):
         self.screensaver_window.bind("<Motion>", self.reset_screensaver_timer)
 
         try:
-            gif = Image.open("Assets/screensavers/fractal.gif")
-            frames = [ImageTk.PhotoImage(frame.copy().resize(
-                (self.winfo_screenwidth(), self.winfo_screenheight()), Image.LANCZOS)) 
-                for frame in ImageSequence.Iterator(gif)]
-            label = tk.Label(self.screensaver_window, bd=0)
+            # the player keeps its decoded frames, so later activations reuse them
+            if self.screensaver_player is None:
+                self.screensaver_player = AnimationPlayer(self, "Assets/screensavers/fractal.gif", self.screen_size(),
+                                                          memory_budget=192 * 1024 * 1024)
+            label = tk.Label(self.screensaver_window, bd=0, bg="black")
             label.pack(fill="both", expand=True)
-
-            def animate(index=0):
-                if not self.screensaver_active: return
-                label.config(image=frames[index])
-                self.screensaver_window.after(100, animate, (index + 1) % len(frames))
-
-            animate()
+            self.screensaver_player.start(label)
         except Exception as e:
             print(f"Screensaver GIF error: {e}")
             tk.Label(self.screensaver_window, text="Franchuk is waiting. Don't leave him alone.",
                      fg="white", bg="black", font=("Segoe UI", 48)).pack(expand=True)
             
     def deactivate_screensaver(self, event=None):
+        if self.screensaver_player:
+            self.screensaver_player.stop()
         if self.screensaver_window:
             self.screensaver_window.destroy()
             self.screensaver_window = None
@@ -252,12 +234,11 @@ class Desktop(tk.Tk):
         self.last_activity = time.time()
 
     def start_kernel_panic(self):
-        def panic_thread():
-            while True:
-                if random.randint(1, 10000) == 1 and not hasattr(self, "panic_active"):
-                    self.after(0, self.show_kernel_panic_screen)
-                time.sleep(1)
-        threading.Thread(target=panic_thread, daemon=True).start()
+        self.kernel_panic_job = self.scheduler.call_every(1, self.maybe_kernel_panic, name="kernel panic")
+
+    def maybe_kernel_panic(self):
+        if random.randint(1, 10000) == 1 and not hasattr(self, "panic_active"):
+            self.show_kernel_panic_screen()
 
     def hex(self, length):
         return "0x" + "".join(random.choice("0123456789ABCDEF") for _ in range(length))
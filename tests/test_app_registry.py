@@ -0,0 +1,30 @@
+import subprocess
+import sys
+
+from core.apps import APPS, AppEntry, AppRegistry
+
+
+def test_taskbar_import_does_not_load_applications():
+    # Run in a fresh interpreter; other test modules import applications
+    code = ("import sys, Graphics.taskbar; "
+            "print([m for m in sys.modules if m.startswith('Applications.')])")
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "[]"
+
+
+def test_entries_are_complete():
+    for entry in APPS:
+        if entry.mode == "process":
+            assert entry.script
+            if entry.host:
+                assert entry.host in ("qt", "tk") and entry.attr
+        else:
+            assert entry.mode == "window" and entry.attr
+
+
+def test_load_imports_on_demand_and_records_time():
+    registry = AppRegistry([AppEntry("Codec", "encodings.idna", "Codec")])
+    assert registry.load_times == {}
+    cls = registry.load("Codec")
+    assert cls.__name__ == "Codec"
+    assert "Codec" in registry.load_times
@@ -0,0 +1,148 @@
+# Copyright 2025 the FranchukOS project authors.
+# Contributed under the Apache License, Version 2.0.
+
+import os
+import threading
+
+from core import apphost
+from core.apphost import AppHost, AppHostPool, RemoteWindow, Worker
+from core.apps import AppEntry, registry
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class FakeWindowManager:
+    def __init__(self):
+        self.open_windows = {}
+        self.switched = []
+
+    def track_window(self, name, window):
+        self.open_windows[name] = window
+
+    def forget_window(self, name):
+        self.open_windows.pop(name, None)
+
+    def switch_to_window(self, name):
+        self.switched.append(name)
+
+
+def make_pool(accept=True):
+    """A pool whose hosts record what they are sent instead of talking to a process."""
+    wm = FakeWindowManager()
+    pool = AppHostPool(wm, lambda fn, *args: fn(*args))
+    sent = []
+    for host in pool.hosts.values():
+        host.send = lambda message, host=host: accept and not sent.append((host.toolkit, message))
+        host.running = lambda: True
+    return pool, wm, sent
+
+
+def test_launch_goes_to_the_host_and_opened_windows_are_tracked():
+    pool, wm, sent = make_pool()
+    fallbacks = []
+    entry = AppEntry("Franny", "Applications.franny", "open_window", host="qt")
+    pool.launch(entry, lambda: fallbacks.append("Franny"))
+    pool.launch(entry, lambda: fallbacks.append("Franny"))  # already on its way
+    assert sent == [("qt", {"op": "launch", "name": "Franny"})]
+
+    pool.on_event(pool.hosts["qt"], {"event": "opened", "name": "Franny"})
+    window = wm.open_windows["Franny"]
+    assert isinstance(window, RemoteWindow) and window.winfo_exists()
+    pool.launch(entry, lambda: fallbacks.append("Franny"))
+    assert wm.switched == ["Franny"]
+
+    window.withdraw()
+    window.destroy()
+    assert sent[1:] == [("qt", {"op": "hide", "name": "Franny"}), ("qt", {"op": "close", "name": "Franny"})]
+    pool.on_event(pool.hosts["qt"], {"event": "closed", "name": "Franny"})
+    assert wm.open_windows == {} and fallbacks == []
+
+
+def test_launch_falls_back_when_the_host_cannot_open_the_app():
+    pool, wm, sent = make_pool(accept=False)
+    fallbacks = []
+    pool.launch(AppEntry("Notes", "x", "y", host="tk"), lambda: fallbacks.append("Notes"))
+    pool.launch(AppEntry("Terminal", "x", "y"), lambda: fallbacks.append("Terminal"))  # no host
+    assert fallbacks == ["Notes", "Terminal"] and pool.launching == {}
+
+    pool, wm, sent = make_pool()
+    pool.launch(AppEntry("Notes", "x", "y", host="tk"), lambda: fallbacks.append("Notes again"))
+    pool.on_event(pool.hosts["tk"], {"event": "failed", "name": "Notes", "error": "boom"})
+    assert fallbacks[-1] == "Notes again" and pool.launching == {}
+
+
+def test_host_exit_forgets_its_windows_and_relaunches_pending_apps():
+    pool, wm, sent = make_pool()
+    qt, tk = pool.hosts["qt"], pool.hosts["tk"]
+    wm.track_window("Franny", RemoteWindow(qt, "Franny"))
+    wm.track_window("Notes", RemoteWindow(tk, "Notes"))
+    wm.track_window("Settings", object())
+    fallbacks = []
+    pool.launch(AppEntry("Paint", "x", "y", host="qt"), lambda: fallbacks.append("Paint"))
+
+    pool.on_event(qt, {"event": "exited"})
+    assert sorted(wm.open_windows) == ["Notes", "Settings"]
+    assert fallbacks == ["Paint"] and pool.launching == {}
+
+
+def test_launches_queued_for_a_host_that_never_comes_up_fall_back(monkeypatch):
+    monkeypatch.chdir(REPO)
+    events = []
+    done = threading.Event()
+
+    def on_event(host, event):
+        events.append(event)
+        done.set()
+
+    # "none" is not a toolkit, so the worker exits before it listens
+    host = AppHost("none", on_event, lambda fn, *args: fn(*args))
+    host.pending.append({"op": "launch", "name": "Notes"})  # as if sent while it was starting
+    host.start()
+    assert done.wait(apphost.CONNECT_TIMEOUT + 5)
+    assert events == [{"event": "failed", "name": "Notes", "error": "host unavailable"}]
+    assert not host.running() and host.send({"op": "launch", "name": "Notes"}) is False
+    host.process.wait()
+
+
+class RecordingWorker(Worker):
+    def __init__(self):
+        super().__init__("qt", None, None)
+        self.replies = []
+        self.calls = []
+
+    def reply(self, **event):
+        self.replies.append(event)
+
+    def open(self, factory, name):
+        self.calls.append(("open", name))
+        return factory()
+
+    def show(self, window):
+        self.calls.append(("show", window))
+
+    def close(self, window):
+        self.calls.append(("close", window))
+
+
+def test_worker_opens_each_app_once(monkeypatch):
+    def load(name):
+        if name == "Broken":
+            raise ImportError("no module")
+        return lambda: f"{name} window"
+
+    monkeypatch.setattr(registry, "load", load)
+    worker = RecordingWorker()
+    worker.handle({"op": "launch", "name": "Franny"})
+    worker.handle({"op": "launch", "name": "Franny"})
+    worker.handle({"op": "launch", "name": "Broken"})
+    worker.handle({"op": "close", "name": "Franny"})
+    worker.closed("Franny")
+    worker.closed("Franny")  # a second destroy notification is not reported again
+
+    assert worker.calls == [("open", "Franny"), ("show", "Franny window"), ("close", "Franny window")]
+    assert worker.replies == [
+        {"event": "opened", "name": "Franny"},
+        {"event": "opened", "name": "Franny"},
+        {"event": "failed", "name": "Broken", "error": "no module"},
+        {"event": "closed", "name": "Franny"},
+    ]
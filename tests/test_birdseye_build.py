@@ -0,0 +1,39 @@
+# Copyright 2025 the FranchukOS project authors.
+# Contributed under the Apache License, Version 2.0.
+
+from Applications.birdseye import BuildCache, java_sources, parse_depfile
+
+
+def test_parse_depfile():
+    text = "C:/out/main.exe: C:/src/main.cpp \\\n C:/src/my\\ util.h \\\n  sub/x.hpp\n"
+    assert parse_depfile(text) == ["C:/src/main.cpp", "C:/src/my util.h", "sub/x.hpp"]
+    assert parse_depfile("") == []
+
+
+def test_key_covers_java_siblings(tmp_path):
+    (tmp_path / "Main.java").write_text("class Main { }")
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "Helper.java").write_text("class Helper { }")
+    cache = BuildCache(str(tmp_path / "cache"))
+    main = str(tmp_path / "Main.java")
+    key = cache.key_for(main, ["javac"], java_sources(str(tmp_path)))
+    (tmp_path / "pkg" / "Helper.java").write_text("class Helper { int x; }")
+    assert cache.key_for(main, ["javac"], java_sources(str(tmp_path))) != key
+    assert java_sources(str(tmp_path), limit=1) is None
+
+
+def test_edited_header_invalidates_a_cpp_build(tmp_path):
+    source = tmp_path / "main.cpp"
+    header = tmp_path / "util.h"
+    source.write_text('#include "util.h"\nint main() { return VALUE; }\n')
+    header.write_text("#define VALUE 1\n")
+    cache = BuildCache(str(tmp_path / "cache"))
+    key = cache.key_for(str(source), ["g++"])
+    depfile = tmp_path / "deps.d"
+    depfile.write_text("main: main.cpp \\\n util.h\n")  # relative to where g++ ran
+    assert not cache.is_built(key)
+    cache.mark_built(key, str(depfile), str(tmp_path))
+    assert cache.is_built(key)
+    header.write_text("#define VALUE 2\n")
+    assert cache.key_for(str(source), ["g++"]) == key
+    assert not cache.is_built(key)
@@ -0,0 +1,31 @@
+# Copyright 2025 the FranchukOS project authors.
+# Contributed under the Apache License, Version 2.0.
+
+import os
+
+from Applications.birdseye import parse_porcelain_v2
+
+
+def test_parse_porcelain_v2_records():
+    root = os.path.abspath("repo")
+    records = [
+        "# branch.oid 0123abcd",
+        "1 .M N... 100644 100644 100644 aaaa bbbb src/app.py",
+        "1 A. N... 000000 100644 100644 0000 cccc new file.txt",
+        "1 D. N... 100644 000000 000000 dddd 0000 gone.txt",
+        "2 R. N... 100644 100644 100644 eeee eeee R100 docs/new.md",
+        "docs/old.md",
+        "u UU N... 100644 100644 100644 100644 ffff 1111 2222 both.c",
+        "? notes/todo.txt",
+        "! ignored.log",
+    ]
+    status = parse_porcelain_v2("\0".join(records).encode() + b"\0", root)
+    path = lambda rel: os.path.normpath(os.path.join(root, rel))
+    assert status == {
+        path("src/app.py"): "modified",
+        path("new file.txt"): "added",
+        path("gone.txt"): "deleted",
+        path("docs/new.md"): "renamed",
+        path("both.c"): "conflict",
+        path("notes/todo.txt"): "untracked",
+    }
@@ -0,0 +1,62 @@
+# Copyright 2025 the FranchukOS project authors.
+# Contributed under the Apache License, Version 2.0.
+
+import json
+import os
+
+from Applications.birdseye import AutosaveJournal, replay_journal
+
+
+def write_journal(path, records, tail=""):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("".join(json.dumps(r) + "\n" for r in records) + tail)
+
+
+def test_replay_uses_utf16_offsets_and_stops_at_a_torn_tail(tmp_path):
+    journal = tmp_path / "doc.journal"
+    write_journal(journal, [
+        {"t": "snap", "path": "/x/notes.txt", "text": "😀 hi"},
+        {"t": "edit", "p": 3, "r": 2, "a": "there"},  # the emoji is two UTF-16 units
+        {"t": "edit", "p": 0, "r": 0, "a": ">"},
+    ], tail='{"t": "edit", "p": 0, "r": 1')
+    assert replay_journal(str(journal)) == ("/x/notes.txt", ">😀 there")
+
+
+def test_split_surrogate_pairs_replay_and_never_break_recovery(tmp_path):
+    journal = tmp_path / "doc.journal"
+    write_journal(journal, [
+        {"t": "snap", "path": None, "text": "ab"},
+        {"t": "edit", "p": 1, "r": 0, "a": "\ud83d"},  # an emoji typed in two halves
+        {"t": "edit", "p": 2, "r": 0, "a": "\ude00"},
+    ])
+    assert replay_journal(str(journal)) == (None, "a😀b")
+
+    crashed = tmp_path / "journals" / "1234-dead"
+    crashed.mkdir(parents=True)
+    write_journal(crashed / "half.journal", [{"t": "snap", "path": None, "text": "x\ud83d"}])
+    (crashed / "bad.journal").write_bytes(b'{"t": "snap", "path": null, "text": "\xff"}\n')
+    journal = AutosaveJournal(str(tmp_path / "journals"))
+    try:
+        assert journal.recover() == [("half", None, "x\ufffd")]
+    finally:
+        journal.close()
+
+
+def test_recover_skips_journals_of_running_sessions(tmp_path):
+    live = AutosaveJournal(str(tmp_path))
+    live.snapshot("live", None, "still being typed")
+    crashed = tmp_path / "1234-dead"
+    crashed.mkdir()
+    write_journal(crashed / "lost.journal", [{"t": "snap", "path": None, "text": "unsaved"}])
+    write_journal(tmp_path / "old.journal", [{"t": "snap", "path": "/a.txt", "text": "legacy"}])
+
+    journal = AutosaveJournal(str(tmp_path))
+    try:
+        assert journal.recover() == [("lost", None, "unsaved"), ("old", "/a.txt", "legacy")]
+        assert not crashed.exists()
+        live.close()  # flushes the live journal
+        assert os.path.exists(live.journal_path("live"))
+        # once its window has closed, what it left behind is recoverable
+        assert [doc_id for doc_id, _, _ in journal.recover()] == ["live", "lost", "old"]
+    finally:
+        journal.close()
@@ -0,0 +1,57 @@
+# Copyright 2025 the FranchukOS project authors.
+# Contributed under the Apache License, Version 2.0.
+
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication  # noqa: E402
+
+from Applications.birdseye import HIGHLIGHT_CHAR_LIMIT, ChunkedFileReader, EditorTab  # noqa: E402
+
+app = QApplication.instance() or QApplication([])
+
+
+def test_chunks_end_on_newlines_and_keep_multibyte_characters(tmp_path):
+    text = "".join(f"line {i} — ünïcode\n" for i in range(200)) + "no newline at the end ✓"
+    path = tmp_path / "big.txt"
+    path.write_bytes(text.encode("utf-8"))
+    reader = ChunkedFileReader(str(path), chunk_size=100)
+    chunks = []
+    while not reader.at_end():
+        chunks.append(reader.read_next())
+    reader.close()
+    assert "".join(chunks) == text
+    assert all(chunk.endswith("\n") for chunk in chunks[:-1])
+    assert reader.progress() == 1.0
+
+
+def test_a_line_longer_than_a_chunk_is_split_safely(tmp_path):
+    text = "é" * 300
+    path = tmp_path / "long.txt"
+    path.write_bytes(text.encode("utf-8"))
+    reader = ChunkedFileReader(str(path), chunk_size=101)  # every chunk ends mid-character
+    chunks = []
+    while not reader.at_end():
+        chunks.append(reader.read_next())
+    reader.close()
+    assert "".join(chunks) == text
+
+
+def test_highlighter_is_detached_before_a_big_file_is_shown(tmp_path, monkeypatch):
+    small = tmp_path / "small.py"
+    small.write_text("def f():\n    return 1\n")
+    big = tmp_path / "big.py"
+    big.write_text("x = 1\n" * (HIGHLIGHT_CHAR_LIMIT // 6 + 1))
+
+    tab = EditorTab()
+    tab.load_file(str(small))
+    assert tab.text_edit.highlighting_enabled()
+
+    tab = EditorTab()
+    highlighted = []
+    monkeypatch.setattr(type(tab.text_edit.highlighter), "highlightBlock",
+                        lambda self, text: highlighted.append(text))
+    tab.load_file(str(big))
+    assert not tab.text_edit.highlighting_enabled()
+    assert highlighted == []
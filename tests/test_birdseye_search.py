@@ -0,0 +1,44 @@
+# Copyright 2025 the FranchukOS project authors.
+# Contributed under the Apache License, Version 2.0.
+
+import os
+import stat
+
+from Applications.birdseye import apply_matches, compile_search, replace_in_file, search_text, utf16_offsets
+
+
+def test_search_and_replace_with_groups():
+    text = "def foo(a):\n    return foo_bar(a)\nFOO = 1\n"
+    rx = compile_search(r"\b(foo)\b", regex=True, case_sensitive=False)
+    matches = search_text(rx, text, r"<\1>")
+    assert [(m[2], m[4]) for m in matches] == [(1, "<foo>"), (3, "<FOO>")]
+    assert matches[1][3] == "FOO = 1"
+    assert apply_matches(text, matches) == "def <foo>(a):\n    return foo_bar(a)\n<FOO> = 1\n"
+
+    literal = compile_search("a.b", case_sensitive=True)
+    assert [m[:2] for m in search_text(literal, "axb a.b A.B")] == [(4, 7)]
+
+
+def test_utf16_offsets_count_astral_characters_twice():
+    text = "a😀b😀c"
+    assert utf16_offsets(text, [0, 2, 3, 4]) == [0, 3, 4, 6]
+    assert utf16_offsets("plain", [1, 4]) == [1, 4]
+
+
+def test_replace_in_file_is_strict_and_keeps_mode(tmp_path):
+    script = tmp_path / "run.sh"
+    script.write_bytes("echo héllo\r\necho héllo\n".encode("utf-8"))
+    script.chmod(0o755)
+    latin = tmp_path / "latin.txt"
+    latin.write_bytes("héllo".encode("latin-1"))
+
+    rx = compile_search("héllo")
+    matches = search_text(rx, script.read_bytes().decode("utf-8"), "bye")
+    assert replace_in_file(str(script), os.stat(script).st_mtime_ns, matches) is None
+    assert script.read_bytes() == b"echo bye\r\necho bye\n"
+    assert stat.S_IMODE(os.stat(script).st_mode) == 0o755
+    assert replace_in_file(str(script), 0, matches) == "changed since the search"
+
+    assert replace_in_file(str(latin), os.stat(latin).st_mtime_ns, [(0, 5, 1, "", "x")]) == "not UTF-8"
+    assert latin.read_bytes() == "héllo".encode("latin-1")
+    assert sorted(os.listdir(tmp_path)) == ["latin.txt", "run.sh"]
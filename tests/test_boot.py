@@ -0,0 +1,42 @@
+# Copyright 2025 the FranchukOS project authors.
+# Contributed under the Apache License, Version 2.0.
+
+import threading
+import time
+
+from core.boot import BootPipeline
+
+
+def test_stages_run_concurrently_and_are_timed():
+    barrier = threading.Barrier(3, timeout=2)
+
+    def stage(value):
+        def run():
+            barrier.wait()  # only passes if all three run at once
+            return value
+        return run
+
+    pipeline = BootPipeline([("a", stage(1)), ("b", stage(2)), ("c", stage(3))])
+    finished = []
+    pipeline.start(on_done=lambda: finished.append(True))
+    assert pipeline.wait(5)
+    assert pipeline.results == {"a": 1, "b": 2, "c": 3}
+    assert finished == [True]
+    assert sorted(name for name, _ in pipeline.report.stages) == ["a", "b", "c"]
+
+
+def test_failing_stage_does_not_stop_boot():
+    def broken():
+        raise RuntimeError("no disk")
+
+    pipeline = BootPipeline([("broken", broken), ("ok", lambda: time.sleep(0.01) or "fine")])
+    pipeline.start()
+    assert pipeline.wait(5)
+    assert pipeline.results == {"ok": "fine"}
+    assert isinstance(pipeline.errors["broken"], RuntimeError)
+
+
+def test_empty_pipeline_finishes_immediately():
+    pipeline = BootPipeline([])
+    pipeline.start()
+    assert pipeline.done.is_set()
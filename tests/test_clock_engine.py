@@ -0,0 +1,75 @@
+# Copyright 2025 the FranchukOS project authors.
+# Contributed under the Apache License, Version 2.0.
+
+import datetime
+
+from Applications.clock_engine import (Deadlines, Stopwatch, ZoneClock, format_duration, next_alarm_time,
+                                       resolve_city)
+
+
+class FakeClock:
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_stopwatch_counts_from_start_not_ticks():
+    clock = FakeClock(100.0)
+    watch = Stopwatch(clock)
+    watch.start()
+    clock.now = 101.25
+    assert watch.lap() == (1.25, 1.25)
+    watch.stop()
+    clock.now = 500.0  # stopped time doesn't count
+    watch.start()
+    clock.now = 502.0
+    assert watch.elapsed() == 3.25
+    assert watch.lap() == (2.0, 3.25)
+    assert format_duration(3723.46, tenths=True) == "01:02:03.4"
+
+
+def test_deadlines_pop_in_order_and_follow_wall_clock_jumps():
+    mono, wall = FakeClock(10.0), FakeClock(1000.0)
+    deadlines = Deadlines(mono, wall)
+    late = deadlines.add_timer(30, "late")
+    soon = deadlines.add_timer(5, "soon")
+    dropped = deadlines.add_timer(1, "dropped")
+    alarm = deadlines.add_alarm(1020.0)
+    deadlines.cancel(dropped)
+    assert deadlines.next_deadline() == 15.0
+    mono.now, wall.now = 16.0, 1006.0
+    assert deadlines.pop_due() == [soon]
+
+    # wall clock steps forward a minute: the alarm is due now, the timer isn't
+    wall.now += 60
+    assert deadlines.pop_due() == [alarm]
+    assert deadlines.remaining(late) == 24.0
+    mono.now = 40.0
+    assert deadlines.pop_due() == [late]
+    assert deadlines.next_deadline() is None
+
+
+def test_next_alarm_time_rolls_over_to_tomorrow():
+    now = datetime.datetime(2025, 3, 1, 23, 30, 15)
+    assert next_alarm_time(23, 45, now) == datetime.datetime(2025, 3, 1, 23, 45).timestamp()
+    assert next_alarm_time(23, 30, now) == datetime.datetime(2025, 3, 2, 23, 30).timestamp()
+    assert next_alarm_time(7, 0, now) == datetime.datetime(2025, 3, 2, 7, 0).timestamp()
+
+
+def test_cities_resolve_to_zones():
+    assert resolve_city("new york") == ("New York", "America/New_York")
+    assert resolve_city("Mumbai") == ("Mumbai", "Asia/Kolkata")
+    assert resolve_city("Europe/Paris") == ("Paris", "Europe/Paris")
+    assert resolve_city("toky") == ("Tokyo", "Asia/Tokyo")
+    assert resolve_city("nowhere at all") is None
+
+
+def test_zone_offset_is_cached_until_the_dst_change():
+    clock = ZoneClock("Europe/London")
+    before = datetime.datetime(2025, 3, 30, 0, 59, 59, tzinfo=datetime.timezone.utc).timestamp()
+    clock.utc_offset(before - 86400 * 30)
+    assert clock.valid_until == before + 1  # 01:00 UTC, when BST starts
+    assert clock.format(before) == "00:59:59" and clock.abbreviation == "GMT"
+    assert clock.format(before + 1) == "02:00:00" and clock.abbreviation == "BST"
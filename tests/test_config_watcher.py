@@ -0,0 +1,66 @@
+import json
+import os
+import threading
+
+import pytest
+
+from config.manager import ConfigWatcher
+
+
+def write_config(path, data):
+    tmp = str(path) + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(data, f)
+    os.replace(tmp, path)
+
+
+def test_check_reports_changed_keys_only(tmp_path):
+    path = tmp_path / "settings.json"
+    write_config(path, {"theme": "light", "wallpaper": "a.png"})
+    watcher = ConfigWatcher(str(path))
+    watcher.config = watcher._read()
+    seen = []
+    watcher.subscribe("theme", seen.append)
+    write_config(path, {"theme": "dark", "wallpaper": "a.png", "extra": 1})
+    changes = watcher.check()
+    assert {c.key for c in changes} == {"theme", "extra"}
+    assert [(c.old, c.new) for c in seen] == [("light", "dark")]
+    # unchanged file is not parsed again
+    assert watcher.check() == []
+
+
+def test_invalid_json_keeps_last_config(tmp_path):
+    path = tmp_path / "settings.json"
+    write_config(path, {"theme": "light"})
+    watcher = ConfigWatcher(str(path))
+    watcher.config = watcher._read()
+    path.write_text("{not json")
+    assert watcher.check() == []
+    assert watcher.config == {"theme": "light"}
+
+
+@pytest.mark.parametrize("use_inotify", [True, False])
+def test_watcher_publishes_through_dispatch(tmp_path, use_inotify):
+    path = tmp_path / "settings.json"
+    write_config(path, {"theme": "light"})
+    dispatched = []
+    got_change = threading.Event()
+
+    def dispatch(fn):
+        dispatched.append(fn)
+        got_change.set()
+
+    watcher = ConfigWatcher(str(path), dispatch=dispatch, poll_interval=0.05, use_inotify=use_inotify)
+    seen = []
+    watcher.subscribe(None, seen.append)
+    assert watcher.start() == {"theme": "light"}
+    try:
+        write_config(path, {"theme": "dark"})
+        assert got_change.wait(5)
+    finally:
+        watcher.stop()
+    # callbacks only run once the dispatcher invokes them
+    assert seen == []
+    for fn in dispatched:
+        fn()
+    assert seen[0].key == "theme" and seen[0].new == "dark"
@@ -0,0 +1,25 @@
+# Copyright 2025 the FranchukOS project authors.
+# Contributed under the Apache License, Version 2.0.
+
+import os
+
+from Graphics.icons import atlas_layout, source_signature
+
+
+def test_atlas_layout_is_square_and_stable():
+    width, height, slots = atlas_layout(["c", "a", "b", "d", "e"], 64)
+    assert (width, height) == (192, 128)
+    assert slots["a"] == [0, 0]
+    assert slots["e"] == [64, 64]
+    assert len({tuple(xy) for xy in slots.values()}) == 5
+
+
+def test_source_signature_tracks_mtime_and_skips_missing(tmp_path):
+    icon = tmp_path / "icon.png"
+    icon.write_bytes(b"one")
+    sources = {"icon": str(icon), "gone": str(tmp_path / "gone.png")}
+    first = source_signature(sources)
+    assert list(first) == ["icon"]
+    icon.write_bytes(b"three")
+    os.utime(icon, ns=(0, first["icon"][1] + 1_000_000))
+    assert source_signature(sources) != first
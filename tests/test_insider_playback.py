@@ -0,0 +1,75 @@
+# Copyright 2025 the FranchukOS project authors.
+# Contributed under the Apache License, Version 2.0.
+
+import os
+import struct
+import wave
+
+import numpy as np
+
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from Applications.insider_engine import GaplessPlayer  # noqa: E402
+from Applications.media_info import duration  # noqa: E402
+
+
+def write_wav(path, seconds, rate=44100, channels=2, value=1000):
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(channels)
+        f.setsampwidth(2)
+        f.setframerate(rate)
+        f.writeframes(np.full((int(seconds * rate), channels), value, dtype="<i2").tobytes())
+
+
+def ogg_page(granule, packet):
+    return (b"OggS" + bytes([0, 0]) + struct.pack("<qIII", granule, 1, 0, 0)
+            + bytes([1, len(packet)]) + packet)
+
+
+def test_durations_come_from_headers(tmp_path):
+    write_wav(tmp_path / "a.wav", 1.5, rate=22050, channels=1)
+    packed = (48000 << 44) | (1 << 41) | (15 << 36) | (48000 * 90)
+    streaminfo = bytes(10) + packed.to_bytes(8, "big") + bytes(16)
+    (tmp_path / "b.flac").write_bytes(b"fLaC" + bytes([0x80, 0, 0, 34]) + streaminfo)
+    vorbis = b"\x01vorbis" + struct.pack("<IBI", 0, 2, 44100) + bytes(15)
+    (tmp_path / "c.ogg").write_bytes(ogg_page(0, vorbis) + bytes(5000) + ogg_page(44100 * 7, b"x"))
+    frame = b"\xff\xfb\x90\x00" + bytes(32) + b"Xing" + struct.pack(">II", 1, 1000) + bytes(400)
+    (tmp_path / "d.mp3").write_bytes(b"ID3\x03\x00\x00\x00\x00\x00\x0a" + bytes(10) + frame)
+    (tmp_path / "e.mp3").write_bytes(b"\xff\xfb\x90\x00" + bytes(16000 - 4))
+
+    assert duration(str(tmp_path / "a.wav")) == 1.5
+    assert duration(str(tmp_path / "b.flac")) == 90
+    assert duration(str(tmp_path / "c.ogg")) == 7
+    assert abs(duration(str(tmp_path / "d.mp3")) - 1000 * 1152 / 44100) < 1e-9
+    assert duration(str(tmp_path / "e.mp3")) == 1.0  # 128 kbps CBR
+    assert duration(str(tmp_path / "missing.mp3")) is None
+
+    # damaged files are unknown length, never an exception
+    (tmp_path / "short.mp3").write_bytes(b"ID3\x03\x00")
+    (tmp_path / "short.ogg").write_bytes(b"OggS\x00\x02")
+    (tmp_path / "short.flac").write_bytes(b"fLaC\x00\x00\x00\x22" + bytes(5))
+    (tmp_path / "short.wav").write_bytes(b"RIFF\x00\x00\x00\x00WAVEfmt \x10\x00\x00\x00")
+    for name in ("short.mp3", "short.ogg", "short.flac", "short.wav"):
+        assert duration(str(tmp_path / name)) is None
+
+
+def test_stream_crosses_into_the_prefetched_track(tmp_path):
+    write_wav(tmp_path / "one.wav", 1.5, value=100)
+    write_wav(tmp_path / "two.wav", 0.5, channels=1, value=200)
+    tracks = [str(tmp_path / "one.wav"), str(tmp_path / "two.wav")]
+    player = GaplessPlayer(lambda key: (key + 1, tracks[key + 1]) if key + 1 < len(tracks) else None)
+    try:
+        generation = player.generation
+        track = player.start_track(0, tracks[0])
+        chunks = []
+        while True:
+            chunk = player.next_chunk(track, generation)
+            if chunk is None:
+                break
+            chunks.append((chunk.key, chunk.start, chunk.frames))
+        rate = player.rate
+        assert chunks == [(0, 0, rate), (0, rate, rate // 2), (1, 0, rate // 2)]
+        # the next track was decoded ahead of the handover
+        assert (1, tracks[1]) in player.streams
+    finally:
+        player.shutdown()
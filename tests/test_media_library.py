@@ -0,0 +1,144 @@
+# Copyright 2025 the FranchukOS project authors.
+# Contributed under the Apache License, Version 2.0.
+
+import os
+import struct
+from io import BytesIO
+
+from PIL import Image
+
+from Applications.media_info import id3_header, read_tags
+from Applications.media_library import LibraryView, MediaLibrary
+
+
+def png(color):
+    out = BytesIO()
+    Image.new("RGB", (400, 400), color).save(out, "PNG")
+    return out.getvalue()
+
+
+def id3_frame(frame_id, data):
+    return frame_id.encode() + struct.pack(">I", len(data)) + b"\x00\x00" + data
+
+
+def write_mp3(path, title, artist, art=None):
+    frames = id3_frame("TIT2", b"\x03" + title.encode()) + id3_frame("TPE1", b"\x03" + artist.encode())
+    frames += id3_frame("TRCK", b"\x003/12")
+    if art:
+        frames += id3_frame("APIC", b"\x00image/png\x00\x03\x00" + art)
+    size = len(frames)
+    syncsafe = bytes([(size >> 21) & 0x7F, (size >> 14) & 0x7F, (size >> 7) & 0x7F, size & 0x7F])
+    audio = b"\xff\xfb\x90\x00" + bytes(16000 - 4)  # 128 kbps CBR: one second
+    path.write_bytes(b"ID3\x03\x00\x00" + syncsafe + frames + audio)
+
+
+def write_flac(path, comments, art=None):
+    streaminfo = bytes(10) + ((44100 << 44) | (1 << 41) | (15 << 36) | 44100 * 3).to_bytes(8, "big") + bytes(16)
+    vendor = b"test"
+    entries = [c.encode() for c in comments]
+    block = struct.pack("<I", len(vendor)) + vendor + struct.pack("<I", len(entries))
+    block += b"".join(struct.pack("<I", len(e)) + e for e in entries)
+    blocks = [(0, streaminfo), (4, block)]
+    if art:
+        mime = b"image/png"
+        blocks.append((6, struct.pack(">II", 3, len(mime)) + mime + struct.pack(">I", 0) + bytes(16)
+                       + struct.pack(">I", len(art)) + art))
+    data = b"fLaC"
+    for i, (kind, body) in enumerate(blocks):
+        data += bytes([kind | (0x80 if i == len(blocks) - 1 else 0)]) + len(body).to_bytes(3, "big") + body
+    path.write_bytes(data)
+
+
+def test_tags_and_art_are_read(tmp_path):
+    art = png("red")
+    write_mp3(tmp_path / "a.mp3", "Song A", "Band", art)
+    write_flac(tmp_path / "b.flac", ["TITLE=Song B", "ARTIST=Other", "DATE=1999-01-01"], art)
+
+    mp3 = read_tags(str(tmp_path / "a.mp3"))
+    assert (mp3["title"], mp3["artist"], mp3["track"], mp3["art"]) == ("Song A", "Band", 3, art)
+    assert round(mp3["duration"], 2) == 1.0
+    flac = read_tags(str(tmp_path / "b.flac"))
+    assert (flac["title"], flac["year"], flac["art"], flac["duration"]) == ("Song B", "1999", art, 3.0)
+
+
+def test_id3_header_size_is_synchsafe():
+    assert id3_header(b"ID3\x04\x00\x00\x00\x00\x02\x01") == (4, 0, 257, 267)
+    assert id3_header(b"ID3\x04\x00\x10\x00\x00\x02\x01") == (4, 0x10, 257, 277)  # footer
+    assert id3_header(b"ID3\x03\x00") is None
+    assert id3_header(b"\xff\xfb\x90\x00" + bytes(6)) is None
+
+
+def test_scan_is_incremental(tmp_path):
+    music = tmp_path / "music"
+    (music / "album").mkdir(parents=True)
+    write_mp3(music / "album" / "1.mp3", "One", "Band", png("blue"))
+    write_mp3(music / "album" / "2.mp3", "Two", "Band", png("blue"))
+    write_flac(music / "3.flac", ["TITLE=Three", "ARTIST=Solo"])
+    (music / "album" / "notes.txt").write_text("not audio")
+
+    library = MediaLibrary(str(tmp_path / "cache"))
+    library.add_folder(str(music))
+    assert library.scan() == (3, 0)
+    tracks = {t.title: t for t in library.tracks()}
+    assert tracks["One"].art == tracks["Two"].art  # one thumbnail per album
+    with Image.open(library.art_path(tracks["One"].art)) as thumb:
+        assert thumb.size == (150, 150)
+    assert tracks["Three"].art is None
+
+    assert library.scan() == (0, 0)
+
+    ids = {t.path: t.id for t in library.tracks()}
+    write_mp3(music / "album" / "1.mp3", "One (Remix)", "Band")
+    stat = os.stat(music / "album" / "1.mp3")
+    os.utime(music / "album" / "1.mp3", ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    os.remove(music / "3.flac")
+    assert library.scan() == (1, 1)
+    titles = {t.path: t.title for t in library.tracks()}
+    assert sorted(titles.values()) == ["One (Remix)", "Two"]
+    assert all(ids[t.path] == t.id for t in library.tracks())  # ids survive a rescan
+    library.close()
+
+
+def test_damaged_file_does_not_stop_the_scan(tmp_path, monkeypatch):
+    music = tmp_path / "music"
+    music.mkdir()
+    write_mp3(music / "good.mp3", "Good", "Band")
+    (music / "short.mp3").write_bytes(b"ID3\x03\x00")
+    (music / "bad.flac").write_bytes(b"fLaC")
+
+    import Applications.media_library as media_library
+    real_read_tags = media_library.read_tags
+
+    def read_tags(path):
+        if path.endswith(".flac"):
+            raise IndexError("damaged")
+        return real_read_tags(path)
+
+    monkeypatch.setattr(media_library, "read_tags", read_tags)
+    library = MediaLibrary(str(tmp_path / "cache"))
+    assert library.scan([str(music)]) == (3, 0)
+    tracks = {os.path.basename(t.path): t for t in library.tracks()}
+    library.close()
+    assert tracks["good.mp3"].title == "Good"
+    assert (tracks["short.mp3"].title, tracks["short.mp3"].duration) == (None, None)
+    assert tracks["bad.flac"].label == "bad.flac"
+
+
+def test_view_filters_and_sorts(tmp_path):
+    music = tmp_path / "music"
+    music.mkdir()
+    write_mp3(music / "a.mp3", "Zebra", "Alpha")
+    write_mp3(music / "b.mp3", "Apple", "Beta")
+    write_flac(music / "c.flac", ["TITLE=Mango", "ARTIST=Alpha Band"])
+    (music / "untagged.wav").write_bytes(b"RIFF")
+
+    library = MediaLibrary(str(tmp_path / "cache"))
+    library.scan([str(music)])
+    view = LibraryView(library.tracks())
+    library.close()
+
+    assert [t.title for t in view.query(key="title")] == ["Apple", "Mango", "Zebra", None]
+    assert [t.title for t in view.query("alpha", key="title")] == ["Mango", "Zebra"]
+    assert [t.title for t in view.query("alpha band")] == ["Mango"]
+    assert [t.title for t in view.query(key="title", reverse=True)] == ["Zebra", "Mango", "Apple", None]
+    assert [t.label for t in view.query("untagged")] == ["untagged.wav"]
@@ -0,0 +1,56 @@
+# Copyright 2025 the FranchukOS project authors.
+# Contributed under the Apache License, Version 2.0.
+
+import os
+
+from Applications.note_history import KEYFRAME_EVERY, RevisionStore, apply_delta, atomic_write, make_delta
+
+
+def test_delta_round_trips():
+    old = "one\ntwo\nthree\nfour"
+    new = "zero\none\nthree\nfour!\nfive"
+    assert apply_delta(old, make_delta(old, new)) == new
+    assert apply_delta("", make_delta("", "only\n")) == "only\n"
+
+
+def test_revisions_restore_exactly_and_stay_small(tmp_path):
+    store = RevisionStore(str(tmp_path / "history"))
+    note = str(tmp_path / "note.txt")
+    lines = [f"line {i} of a long note" for i in range(1000)]
+    versions = []
+    for i in range(KEYFRAME_EVERY + 10):
+        lines[i * 7 % 1000] += " edited"
+        versions.append("\n".join(lines))
+        assert store.add(note, versions[-1], timestamp=float(i))
+    assert not store.add(note, versions[-1], timestamp=100.0)
+
+    reopened = RevisionStore(str(tmp_path / "history"))
+    revisions = reopened.revisions(note)
+    assert len(revisions) == len(versions)
+    assert [r.kind for r in revisions].count(b"F") == 2
+    for number in (0, 5, KEYFRAME_EVERY - 1, KEYFRAME_EVERY, len(versions) - 1):
+        assert reopened.load(note, number, revisions) == versions[number]
+    # two compressed keyframes plus small deltas, far below one full copy per revision
+    assert os.path.getsize(reopened.log_path(note)) < 3 * len(versions[-1])
+
+
+def test_min_gap_and_torn_records(tmp_path):
+    store = RevisionStore(str(tmp_path / "history"))
+    note = str(tmp_path / "note.txt")
+    assert store.add(note, "a", min_gap=60, timestamp=0.0)
+    assert not store.add(note, "ab", min_gap=60, timestamp=30.0)
+    assert store.add(note, "abc", min_gap=60, timestamp=61.0)
+    with open(store.log_path(note), "ab") as f:
+        f.write(b"\x00\x00\x01\x00partial")
+    fresh = RevisionStore(str(tmp_path / "history"))
+    assert len(fresh.revisions(note)) == 2
+    assert fresh.add(note, "abcd", timestamp=200.0)
+    assert [fresh.load(note, n) for n in range(3)] == ["a", "abc", "abcd"]
+
+
+def test_atomic_write_replaces_the_file(tmp_path):
+    path = str(tmp_path / "note.txt")
+    atomic_write(path, "first")
+    atomic_write(path, "second")
+    assert open(path, encoding="utf-8").read() == "second"
+    assert os.listdir(tmp_path) == ["note.txt"]
@@ -0,0 +1,61 @@
+# Copyright 2025 the FranchukOS project authors.
+# Contributed under the Apache License, Version 2.0.
+
+import os
+
+from Applications.note_index import NoteIndex, fts_query
+
+
+def write(folder, name, text, mtime_ns=None):
+    path = folder / name
+    path.write_text(text, encoding="utf-8")
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_sync_only_rereads_changed_notes(tmp_path):
+    notes = tmp_path / "notes"
+    notes.mkdir()
+    write(notes, "a.txt", "apples and pears")
+    write(notes, "b.txt", "bananas")
+    write(notes, "ignored.md", "not a note")
+    index = NoteIndex(str(notes), str(tmp_path / "index.db"))
+    assert index.sync() == 2
+    assert index.names() == ["a.txt", "b.txt"]
+    assert index.sync() == 0
+
+    write(notes, "b.txt", "bananas and cherries", mtime_ns=os.stat(notes / "b.txt").st_mtime_ns + 10**9)
+    (notes / "a.txt").unlink()
+    assert index.sync() == 2
+    assert index.names() == ["b.txt"]
+    assert [name for name, _ in index.search("cherr")] == ["b.txt"]
+    assert index.search("apples") == []
+    index.close()
+
+    # the index survives a restart
+    reopened = NoteIndex(str(notes), str(tmp_path / "index.db"))
+    assert reopened.sync() == 0
+    assert reopened.names() == ["b.txt"]
+
+
+def test_search_ranks_and_snippets_matches(tmp_path):
+    notes = tmp_path / "notes"
+    notes.mkdir()
+    write(notes, "groceries.txt", "milk, eggs, bread")
+    write(notes, "recipes.txt", "Bread recipe: flour, water, salt. Knead the bread dough and bake the bread.")
+    index = NoteIndex(str(notes), str(tmp_path / "index.db"))
+    index.sync()
+    results = index.search("bread")
+    assert [name for name, _ in results] == ["recipes.txt", "groceries.txt"]
+    assert "[bread]" in results[1][1]
+
+    write(notes, "groceries.txt", "nothing left")
+    index.update("groceries.txt")
+    assert [name for name, _ in index.search("bread")] == ["recipes.txt"]
+    assert index.substring_search("EGGS") == []
+    assert index.substring_search("flour")[0][0] == "recipes.txt"
+
+
+def test_fts_query_quotes_words_and_prefixes_the_last():
+    assert fts_query('say "hi" OR me') == '"say" "hi" "OR" "me"*'
+    assert fts_query("  ...  ") is None
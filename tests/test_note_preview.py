@@ -0,0 +1,79 @@
+# Copyright 2025 the FranchukOS project authors.
+# Contributed under the Apache License, Version 2.0.
+
+from Applications.note_preview import MarkdownPreview, changed_range, inline_runs, render_block, split_blocks
+
+NOTE = """# Title
+Intro with **bold** and `code`.
+- one
+- two
+  wrapped
+
+```
+x = 1
+
+y = 2
+```
+> quoted
+---
+last paragraph"""
+
+
+class FakeText:
+    """Just enough of tk.Text for line-based edits."""
+
+    def __init__(self):
+        self.content = ""
+        self.inserts = 0
+
+    def tag_configure(self, *args, **kwargs):
+        pass
+
+    def config(self, **kwargs):
+        pass
+
+    def offset(self, index):
+        line = int(index.split(".")[0])
+        lines = self.content.split("\n")
+        return sum(len(text) + 1 for text in lines[:line - 1])
+
+    def delete(self, start, end):
+        self.content = self.content[:self.offset(start)] + self.content[self.offset(end):]
+
+    def insert(self, index, *args):
+        self.inserts += 1
+        at = self.offset(index)
+        self.content = self.content[:at] + "".join(args[::2]) + self.content[at:]
+
+
+def test_split_blocks_keeps_fences_and_lists_together():
+    blocks = split_blocks(NOTE)
+    assert blocks[0] == ("# Title",)
+    assert blocks[1] == ("Intro with **bold** and `code`.",)
+    assert blocks[2] == ("- one", "- two", "  wrapped")
+    assert blocks[3] == ("```", "x = 1", "", "y = 2", "```")
+    assert blocks[4:] == [("> quoted",), ("---",), ("last paragraph",)]
+
+
+def test_render_block_tags_inline_styles():
+    assert inline_runs("a **b** [c](http://x) *d*") == [
+        ("a ", ()), ("b", ("bold",)), (" ", ()), ("c", ("link",)), (" ", ()), ("d", ("italic",))]
+    runs = render_block(("- one", "- two", "  wrapped"))
+    assert "".join(text for text, _ in runs) == "• one\n• two wrapped\n\n"
+    assert render_block(("## Sub",))[0] == ("Sub", ("h2",))
+
+
+def test_preview_redraws_only_changed_blocks():
+    assert changed_range([1, 2, 3, 4], [1, 9, 9, 4]) == (1, 3, 3)
+    long_note = "\n\n".join(f"Paragraph {i}" for i in range(2000))
+    text = FakeText()
+    preview = MarkdownPreview(text)
+    assert preview.update(long_note) == 2000
+    edited = long_note.replace("Paragraph 1000", "Paragraph **1000**\n\n# New heading")
+    assert preview.update(edited) == 2
+    fresh = FakeText()
+    MarkdownPreview(fresh).update(edited)
+    assert text.content == fresh.content
+    assert preview.update(edited) == 0
+    preview.update("")
+    assert text.content == "" and preview.heights == []
@@ -0,0 +1,85 @@
+from core.scheduler import Scheduler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeRoot:
+    """Stands in for Tk: records after() calls and fires them on demand."""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.pending = {}
+        self.ids = 0
+
+    def after(self, ms, callback):
+        self.ids += 1
+        self.pending[self.ids] = (self.clock.now + ms / 1000, callback)
+        return self.ids
+
+    def after_cancel(self, after_id):
+        self.pending.pop(after_id, None)
+
+    def advance(self, seconds):
+        end = self.clock.now + seconds
+        while True:
+            due = [(t, i) for i, (t, _) in self.pending.items() if t <= end]
+            if not due:
+                break
+            t, i = min(due)
+            self.clock.now = max(self.clock.now, t)
+            _, callback = self.pending.pop(i)
+            callback()
+        self.clock.now = end
+
+
+def make_scheduler():
+    clock = FakeClock()
+    root = FakeRoot(clock)
+    return Scheduler(root, clock=clock), root
+
+
+def test_only_one_after_is_pending():
+    scheduler, root = make_scheduler()
+    scheduler.call_every(1, lambda: None, name="a")
+    scheduler.call_every(2, lambda: None, name="b")
+    scheduler.call_later(0.5, lambda: None, name="c")
+    assert len(root.pending) == 1
+
+
+def test_periodic_jobs_coalesce_into_shared_wakeups():
+    scheduler, root = make_scheduler()
+    runs = []
+    scheduler.call_every(1, runs.append, "a", name="a")
+    scheduler.call_every(2, runs.append, "b", name="b")
+    root.advance(4)
+    assert runs.count("a") == 4
+    assert runs.count("b") == 2
+    # the jobs line up at t=2 and t=4, so six runs need only four wakeups
+    assert scheduler.wakeups == 4
+
+
+def test_cancel_and_stats():
+    scheduler, root = make_scheduler()
+    runs = []
+    job = scheduler.call_every(1, runs.append, 1, name="tick")
+    root.advance(2)
+    scheduler.cancel(job)
+    root.advance(3)
+    assert runs == [1, 1]
+    stats = scheduler.stats()
+    assert stats["scheduled"] == 0
+    assert "tick" not in stats["jobs"]
+
+
+def test_call_soon_threadsafe_from_owner_thread():
+    scheduler, root = make_scheduler()
+    seen = []
+    scheduler.call_soon_threadsafe(seen.append, "x")
+    root.advance(0)
+    assert seen == ["x"]
@@ -0,0 +1,114 @@
+# Copyright 2025 the FranchukOS project authors.
+# Contributed under the Apache License, Version 2.0.
+
+import random
+
+from Graphics.taskbar import TaskbarButtons, WindowManager
+
+
+class FakeWindow:
+    calls = 0
+
+    def __init__(self):
+        self.visible = True
+        self.exists = True
+
+    def grab_set(self):
+        pass
+
+    def withdraw(self):
+        FakeWindow.calls += 1
+        self.visible = False
+
+    def deiconify(self):
+        FakeWindow.calls += 1
+        self.visible = True
+
+    def destroy(self):
+        self.exists = False
+
+    def winfo_exists(self):
+        return self.exists
+
+
+class FakeButton:
+    def __init__(self, name):
+        self.name = name
+        self.active = False
+        self.destroyed = False
+
+    def destroy(self):
+        self.destroyed = True
+
+
+class Tick:
+    """Collects scheduled callbacks and runs them when flushed, like one Tk tick."""
+
+    def __init__(self):
+        self.pending = []
+
+    def __call__(self, callback):
+        self.pending.append(callback)
+
+    def flush(self):
+        pending, self.pending = self.pending, []
+        for callback in pending:
+            callback()
+
+
+def make_taskbar():
+    tick = Tick()
+    styled = []
+
+    def style(button, active):
+        styled.append(button.name)
+        button.active = active
+
+    manager = WindowManager(taskbar=None, schedule=tick)
+    buttons = TaskbarButtons(FakeButton, style, tick)
+    manager.bus.subscribe("opened", buttons.add)
+    manager.bus.subscribe("closed", buttons.remove)
+    manager.bus.subscribe("focus", buttons.focus)
+    return manager, buttons, tick, styled
+
+
+def test_open_and_switch_200_windows():
+    manager, buttons, tick, styled = make_taskbar()
+    names = [f"Window {i}" for i in range(200)]
+    for name in names:
+        manager.open_window(name, FakeWindow)
+    tick.flush()
+    tick.flush()
+    assert list(buttons.buttons) == names
+    assert manager.shown_name == names[-1]
+
+    rng = random.Random(200)
+    for _ in range(10):
+        FakeWindow.calls = 0
+        del styled[:]
+        # A burst of switches within one tick only touches the windows involved in the last one
+        for name in rng.sample(names, 50):
+            manager.switch_to_window(name)
+        tick.flush()
+        tick.flush()
+        assert FakeWindow.calls <= 2
+        assert len(styled) <= 2
+        active = manager.active_name
+        assert manager.open_windows[active].visible
+        assert [b.name for b in buttons.buttons.values() if b.active] == [active]
+
+    for name in names[:150]:
+        manager.close_window(name)
+    tick.flush()
+    assert list(buttons.buttons) == names[150:]
+
+
+def test_closing_active_window_clears_focus():
+    manager, buttons, tick, _ = make_taskbar()
+    manager.open_window("Clock", FakeWindow)
+    tick.flush()
+    tick.flush()
+    manager.close_window("Clock")
+    tick.flush()
+    assert manager.active_window is None
+    assert buttons.buttons == {} and buttons.active is None
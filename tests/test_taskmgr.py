@@ -0,0 +1,49 @@
+# Copyright 2025 the FranchukOS project authors.
+# Contributed under the Apache License, Version 2.0.
+
+from Applications.taskmgr import SORT_KEYS, MetricSeries, RateCounter, RingBuffer, diff_snapshots
+
+
+def test_diff_snapshots_keys_changes_by_pid():
+    old = {1: (1, "init", 0.0, 0.1), 2: (2, "bash", 1.5, 0.4), 3: (3, "gone", 0.0, 0.0)}
+    new = {1: (1, "init", 0.0, 0.1), 2: (2, "bash", 3.0, 0.4), 4: (4, "python", 9.9, 2.0)}
+    inserts, updates, removes = diff_snapshots(old, new)
+    assert inserts == {4: (4, "python", 9.9, 2.0)}
+    assert updates == {2: (2, "bash", 3.0, 0.4)}
+    assert removes == [3]
+    assert diff_snapshots(new, new) == ({}, {}, [])
+
+
+def test_sort_keys_are_stable_on_ties():
+    rows = [(3, "b", 1.0, 0.5), (1, "B", 1.0, 0.2), (2, "a", 5.0, 0.2)]
+    assert [r[0] for r in sorted(rows, key=SORT_KEYS["CPU"], reverse=True)] == [2, 3, 1]
+    assert [r[0] for r in sorted(rows, key=SORT_KEYS["Name"])] == [2, 1, 3]
+    assert [r[0] for r in sorted(rows, key=SORT_KEYS["Memory"])] == [1, 2, 3]
+
+
+def test_ring_buffer_wraps_in_chronological_order():
+    buffer = RingBuffer(4, 1)
+    for t in range(6):
+        buffer.append(t, [t * 10])
+    times, values = buffer.snapshot()
+    assert times.tolist() == [2, 3, 4, 5]
+    assert values[:, 0].tolist() == [20, 30, 40, 50]
+
+
+def test_metric_series_downsamples_coarser_levels():
+    series = MetricSeries(2, resolutions=(("fine", 1, 100), ("coarse", 10, 10)))
+    for t in range(35):
+        series.append(t, [t, 1])
+    times, values = series.window("fine")
+    assert len(times) == 35
+    times, values = series.window("coarse")
+    # three closed 10 s buckets, each the mean of its samples
+    assert times.tolist() == [10, 20, 30]
+    assert values[:, 0].tolist() == [4.5, 14.5, 24.5]
+    assert values[:, 1].tolist() == [1, 1, 1]
+
+
+def test_rate_counter_never_goes_negative():
+    rates = RateCounter()
+    assert rates.update(0, [100, 100]).tolist() == [0, 0]
+    assert rates.update(2, [300, 50]).tolist() == [100, 0]
@@ -0,0 +1,112 @@
+# Copyright 2025 the FranchukOS project authors.
+# Contributed under the Apache License, Version 2.0.
+
+import json
+
+import numpy as np
+
+from Applications.tempo_engine import (AudioScheduler, Pattern, Song, SongPlayer, XorUndo, load_pattern_file,
+                                       parse_volumes, render_pattern, render_song, song_patterns, step_offsets)
+
+
+class FakeBank:
+    rate = 1000
+    channels = 1
+
+    def __init__(self):
+        self.samples = {"Kick": np.ones((30, 1), dtype=np.float32)}
+
+    def get(self, name):
+        return self.samples.get(name)
+
+
+def test_step_offsets_apply_swing_in_pairs():
+    offsets, loop_frames = step_offsets(4, 0.1, 0.25, 1000)
+    assert offsets == [0, 125, 200, 325]
+    assert loop_frames == 400
+
+
+def test_steps_land_on_exact_frames_across_blocks():
+    pattern = Pattern.from_grid([[1, 0, 1, 0]], ["Kick"], 0.1, gains={"Kick": 0.5})
+    scheduler = AudioScheduler(FakeBank(), lambda: pattern, block_frames=64)
+    scheduler.looping = True
+    out = np.concatenate([scheduler.render_block() for _ in range(13)])[:, 0]
+    hits = np.flatnonzero(np.diff(np.concatenate(([0], out))) > 0)
+    assert hits.tolist() == [0, 200, 400, 600, 800]
+    assert out[:30].tolist() == [0.5] * 30 and out[30] == 0
+
+
+def test_play_once_stops_after_one_loop():
+    pattern = Pattern.from_grid([[1, 1]], ["Kick"], 0.05)
+    scheduler = AudioScheduler(FakeBank(), lambda: pattern, block_frames=64)
+    out = np.concatenate([scheduler.render_block() for _ in range(4)])[:, 0]
+    assert scheduler.finished
+    assert out[:30].all() and not out[30:50].any()
+    assert out[50:80].all() and not out[80:].any()
+
+
+def test_offline_render_matches_live_mixer():
+    pattern = Pattern.from_grid([[1, 0, 1, 1], [0, 1, 0, 0]], ["Kick", "Snare"], 0.1, swing=0.2,
+                                gains={"Kick": 0.8, "Snare": 0.3})
+    bank = FakeBank()
+    bank.samples["Snare"] = np.linspace(1, 0, 50, dtype=np.float32)[:, None]
+    offline = render_pattern(bank, pattern, bars=3)
+    live = AudioScheduler(bank, lambda: pattern, block_frames=100)
+    live.looping = True
+    stream = np.concatenate([live.render_block() for _ in range(13)])
+    assert len(offline) == 3 * 400  # the last hit ends inside the loop
+    assert np.allclose(offline[:1200], stream[:1200], atol=1e-5)
+
+
+def test_load_pattern_file_applies_volumes(tmp_path):
+    path = tmp_path / "pattern.json"
+    path.write_text(json.dumps([[1, 0], [0, 1]]))
+    pattern = load_pattern_file(str(path), ["Kick", "Snare", "HiHat"], tempo=2.0,
+                                volumes=parse_volumes(["Kick=0.5"]), master=0.5)
+    assert pattern.rows == ["Kick", "Snare"]
+    assert pattern.step_time == 0.25
+    assert pattern.gains["Kick"] == 0.25 and pattern.gains["Snare"] == 0.5
+
+
+def test_song_edits_undo_as_xor_deltas():
+    song = Song(["Kick", "Snare"], steps=8)
+    history = XorUndo()
+    history.record(song.toggle(0, 0, 1))
+    history.record(song.toggle(0, 1, 7))
+    history.record(song.resize(0, 4))
+    assert song.patterns[0].steps == 4 and song.patterns[0].masks == [0b10, 0]
+    history.undo(song)
+    assert song.patterns[0].steps == 8 and song.patterns[0].masks == [0b10, 1 << 7]
+    history.undo(song)
+    history.redo(song)
+    history.redo(song)
+    assert song.patterns[0].steps == 4 and song.patterns[0].masks == [0b10, 0]
+    assert history.redo(song) is None
+
+
+def test_song_round_trips_through_json():
+    song = Song(["Kick", "Snare"], steps=4)
+    second = song.add_pattern(100)
+    song.toggle(second, 1, 99)
+    song.order = [0, second, second]
+    loaded = Song.from_json(json.loads(json.dumps(song.to_json())), ["Snare", "Kick", "HiHat"])
+    assert loaded.order == [0, 1, 1]
+    assert loaded.patterns[1].steps == 100
+    assert loaded.patterns[1].masks == [1 << 99, 0, 0]
+
+
+def test_song_player_chains_patterns_and_stops_after_the_last():
+    song = Song(["Kick"], steps=2)
+    song.add_pattern(3)
+    song.toggle(0, 0, 0)
+    song.toggle(1, 0, 2)
+    song.order = [0, 1]
+    patterns = song_patterns(song, tempo=10.0)  # 0.05 s steps
+    scheduler = AudioScheduler(FakeBank(), SongPlayer(song, lambda index: patterns[index]), block_frames=64)
+    out = np.concatenate([scheduler.render_block() for _ in range(8)])[:, 0]
+    hits = np.flatnonzero(np.diff(np.concatenate(([0], out))) > 0)
+    assert hits.tolist() == [0, 200]
+    assert scheduler.finished
+    offline = render_song(FakeBank(), patterns)
+    assert np.allclose(offline[:, 0], out[:len(offline)])
+    assert len(offline) == 250 and not out[250:].any()
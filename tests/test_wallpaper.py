@@ -0,0 +1,97 @@
+# Copyright 2025 the FranchukOS project authors.
+# Contributed under the Apache License, Version 2.0.
+
+import os
+import queue
+import threading
+
+from PIL import Image
+
+from Graphics.wallpaper import AnimationPlayer, WallpaperCache
+
+
+def touch(path, mtime_ns):
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_key_follows_the_file_and_the_screen(tmp_path):
+    path = tmp_path / "wall.png"
+    Image.new("RGB", (40, 30), "red").save(path)
+    touch(path, 10 ** 18)
+    cache = WallpaperCache(str(tmp_path / "cache"))
+    key = cache.key(str(path), (20, 15))
+
+    assert cache.key(str(path), (20, 15)) == key
+    assert cache.key(str(path), (40, 30)) != key
+    touch(path, 10 ** 18 + 1)
+    assert cache.key(str(path), (20, 15)) != key
+    with open(path, "ab") as f:
+        f.write(b"\0")  # same mtime, different size
+    touch(path, 10 ** 18)
+    assert cache.key(str(path), (20, 15)) != key
+
+
+def test_second_load_is_served_from_the_cache(tmp_path, monkeypatch):
+    path = tmp_path / "wall.png"
+    Image.new("RGB", (40, 30), "blue").save(path)
+    cache = WallpaperCache(str(tmp_path / "cache"))
+    first = cache.load(str(path), (20, 15))
+    assert first.size == (20, 15)
+    assert os.listdir(cache.cache_dir) == [cache.key(str(path), (20, 15)) + ".jpg"]
+
+    opened = []
+    real_open = Image.open
+    monkeypatch.setattr(Image, "open", lambda p, *a: opened.append(str(p)) or real_open(p, *a))
+    second = cache.load(str(path), (20, 15))
+    assert second.size == (20, 15)
+    assert opened == [os.path.join(cache.cache_dir, cache.key(str(path), (20, 15)) + ".jpg")]
+
+
+def test_prune_keeps_the_newest_entries(tmp_path):
+    cache = WallpaperCache(str(tmp_path), max_entries=2)
+    for i in range(4):
+        entry = tmp_path / f"{i}.jpg"
+        entry.write_bytes(b"x")
+        touch(entry, (i + 1) * 10 ** 18)
+    (tmp_path / "notes.txt").write_text("not an entry")
+    cache.prune()
+    assert sorted(os.listdir(tmp_path)) == ["2.jpg", "3.jpg", "notes.txt"]
+
+
+def write_gif(path, frames):
+    images = [Image.new("RGB", (8, 8), (i * 40 % 256, 0, 0)) for i in range(frames)]
+    images[0].save(path, save_all=True, append_images=images[1:], duration=50, loop=0)
+
+
+def drain(player, passes):
+    """Run the decoder for ``passes`` passes; returns what it produced and whether it then stopped."""
+    stop = threading.Event()
+    buffer = queue.Queue(maxsize=4)
+    thread = threading.Thread(target=player._decode, args=(stop, buffer), daemon=True)
+    thread.start()
+    items = []
+    while items.count((None, 0)) < passes:
+        item = buffer.get(timeout=5)
+        items.append(item if item[0] is None else (item[0].size, item[1]))
+    thread.join(timeout=0.5)
+    finished = not thread.is_alive()
+    stop.set()
+    thread.join(timeout=5)
+    return items, finished
+
+
+def test_small_animations_are_kept_and_large_ones_streamed(tmp_path):
+    path = tmp_path / "anim.gif"
+    write_gif(path, 3)
+
+    kept = AnimationPlayer(None, str(path), (16, 16), memory_budget=3 * 16 * 16 * 3)
+    assert kept.frame_count == 3 and kept.keep_frames
+    items, finished = drain(kept, 1)
+    assert items == [((16, 16), 50)] * 3 + [(None, 0)]
+    assert finished  # one pass, then the kept frames replay without decoding
+
+    streamed = AnimationPlayer(None, str(path), (16, 16), memory_budget=3 * 16 * 16 * 3 - 1)
+    assert not streamed.keep_frames
+    items, finished = drain(streamed, 2)
+    assert items == ([((16, 16), 50)] * 3 + [(None, 0)]) * 2
+    assert not finished  # streaming decodes the file again for every loop
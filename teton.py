@@ -3,97 +3,23 @@
 
 import tkinter as tk
 import threading
-from Graphics.login import LoginApp  
-from desktop import Desktop
-from Graphics.taskbar import Taskbar
 import pygame
 from PIL import Image, ImageTk, ImageOps, ImageDraw
 import time
 from colorama import init, Fore
-import os
+from core.boot import BootPipeline, default_stages
+from core.scheduler import get_scheduler
 
 init()
 print(Fore.RED + 'BM: STABLE BUILD, 37.5 REV190')
-time.sleep(0.25)
-print(Fore.RESET + '[    2.8351] I/QTTranslations: Loaded translation file for language EN.')
-time.sleep(0.05)
-print("[    2.8451] I/QTTranslations: Loaded translation file for language FR.")
-time.sleep(0.05)
-print("[    2.8451] I/QTTranslations: Loaded translation file for language ES.")
-time.sleep(0.05)
-print("[    8.4575] V/Bus: RAM is mapped at 0x149f65e0000.")
-time.sleep(0.05)
-
-print("[  427.9675] V/Bus: BIOS is mapped at 0x149f2280000.")
-time.sleep(0.05)
-
-print("[  427.9676] V/Bus: LUTs are mapped at 0x149f88b0000.")
-time.sleep(0.05)
-
-print("[  427.9976] I/Bus: Fastmem base: 00000149FE8B0000")
-time.sleep(0.05)
-
-print("[  428.2207] I/Host: Trying to create a D3D11 GPU device...")
-time.sleep(0.05)
-
-print("[  429.3501] I/GPUDevice: Render window is 800x500.")
-time.sleep(0.05)
-
-print("[  429.5671] I/GPUDevice: Graphics Driver Info:")
-time.sleep(0.05)
-
-print("[  429.5675] D3D_FEATURE_LEVEL_11_0 (sm50)")
-time.sleep(0.05)
-
-print("[  429.5765] I/GPU_HW: Resolution Scale: 1 (800x500), maximum 16")
-time.sleep(0.05)
-
-print("[  429.5767] I/GPU_HW: Multisampling: 1x")
-time.sleep(0.05)
-
-print("[  429.5768] I/GPU_HW: Dithering: Disabled")
-time.sleep(0.05)
-
-print("[  429.5768] I/GPU_HW: Texture Filtering: Nearest-Neighbor")
-time.sleep(0.05)
-
-print("[  429.5769] I/GPU_HW: Dual-source blending: Supported")
-time.sleep(0.05)
-print("[  429.5770] I/GPU_HW: Clamping UVs: NO")
-time.sleep(0.05)
-print("[  429.5770] I/GPU_HW: Depth buffer: NO")
-time.sleep(0.05)
-
-print("[  429.5771] I/GPU_HW: Downsampling: Disabled")
-time.sleep(0.05)
-
-print("[  429.5772] I/GPU_HW: Wireframe rendering: Disabled")
-time.sleep(0.05)
-print(Fore.GREEN + 'Process all done! :)')
-time.sleep(0.10)
-
-def show_loading_files():
-    """Display flickering file listing from key directories"""
-    directories = ["Graphics", "assets", "Desktop", "Applications", "service", "crypto", "core"]
-    files_to_show = []
-    
-    for directory in directories:
-        if os.path.exists(directory):
-            for file in os.listdir(directory):
-                if os.path.isfile(os.path.join(directory, file)):
-                    files_to_show.append(f"{directory}/{file}")
-    
-    for file in files_to_show:
-        print(Fore.BLUE + 'Loading files: %s' % file)
-        time.sleep(0.1)
-
-show_loading_files()
-print(Fore.GREEN + 'Process all done! :)')
-time.sleep(0.10)
 print(Fore.RESET + 'Please wait....')
-time.sleep(3)
 
-SPLASH_DURATION = 7  # seconds
+# The splash stays up while the boot stages run, but never shorter than this
+# so the logo and startup sound aren't cut off on a warm cache.
+MIN_SPLASH_DURATION = 1.5  # seconds
+MAX_SPLASH_DURATION = 15  # seconds
+
+boot = None
 
 def show_splash(next_step_callback):
     class SplashScreen(tk.Tk):
@@ -157,21 +83,44 @@ def show_splash(next_step_callback):
         daemon=True
     ).start()
 
+    global boot
+    shown_at = time.perf_counter()
+    scheduler = get_scheduler(splash)
+    boot = BootPipeline(default_stages((splash.winfo_screenwidth(), splash.winfo_screenheight())))
+
+    closing = []
+
     def close_splash():
+        if closing:
+            return
+        closing.append(True)
+        if not boot.done.is_set():
+            print(Fore.YELLOW + "Boot stages are still running; continuing without them" + Fore.RESET)
+        print(Fore.GREEN + boot.report.report() + Fore.RESET)
+        boot.report.log()
+        remaining = MIN_SPLASH_DURATION - (time.perf_counter() - shown_at)
+        scheduler.call_later(max(0, remaining), finish)
+
+    def finish():
+        scheduler.shutdown()
         splash.destroy()
-        next_step_callback()
 
-    splash.after(SPLASH_DURATION * 1000, close_splash)
+    boot.start(on_done=lambda: scheduler.call_soon_threadsafe(close_splash))
+    # A stuck stage must not keep the splash up forever
+    scheduler.call_later(MAX_SPLASH_DURATION, close_splash)
     splash.mainloop()
+    next_step_callback()
 
 def start_login():
-    login = LoginApp()
+    # Both modules were imported by the boot pipeline while the splash was up
+    from Graphics.login import LoginApp
+    from desktop import Desktop
+
+    login = LoginApp(profiles=boot.results.get("profiles"))
     login.run()  # Wait for login to complete
     desktop = Desktop()
-    taskbar = Taskbar()
-    threading.Thread(target=desktop.run, daemon=True).start()
-    threading.Thread(target=taskbar.run, daemon=True).start()
-    
+    desktop.mainloop()
+
 def main():
     show_splash(start_login)
 